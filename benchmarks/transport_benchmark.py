@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Transport Benchmark
+===================
+Compare XML-RPC and JSON-RPC payload size and decode time for a
+search_read-shaped result set (sale.order.line rows).
+
+Runs offline: payloads are marshalled locally exactly as Odoo would send
+them, so no server is needed.
+
+Usage:
+    python benchmarks/transport_benchmark.py [rows ...]
+"""
+
+import json
+import os
+import sys
+import time
+import xmlrpc.client
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'odoo_ai_tools'))
+
+from tools.odoo_transports import json_dumps, json_loads, orjson  # noqa: E402
+
+
+def make_rows(count):
+    """Build ``count`` rows shaped like sale.order.line search_read results."""
+    return [
+        {
+            'id': i,
+            'order_id': [i // 10 + 1, f'S{i // 10 + 1:05d}'],
+            'product_id': [i % 500 + 1, f'[SKU-{i % 500 + 1:04d}] Producto de prueba {i % 500 + 1}'],
+            'name': f'Producto de prueba {i % 500 + 1} - línea {i}',
+            'product_uom_qty': float(i % 17 + 1),
+            'price_unit': 19.99 + i % 100,
+            'price_subtotal': (19.99 + i % 100) * (i % 17 + 1),
+            'tax_id': [1, 2],
+            'discount': 0.0,
+        }
+        for i in range(count)
+    ]
+
+
+def timed(func, payload, repeat=5):
+    """Best-of-``repeat`` wall time of ``func(payload)`` in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(payload)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(count):
+    rows = make_rows(count)
+
+    xml_payload = xmlrpc.client.dumps((rows,), methodresponse=True, allow_none=True).encode('utf-8')
+    json_payload = json_dumps({'jsonrpc': '2.0', 'id': 1, 'result': rows})
+
+    results = [
+        ('xmlrpc', len(xml_payload), timed(xmlrpc.client.loads, xml_payload)),
+        ('jsonrpc (json)', len(json_payload), timed(json.loads, json_payload)),
+    ]
+    if orjson:
+        results.append(('jsonrpc (orjson)', len(json_payload), timed(json_loads, json_payload)))
+
+    print(f'\n{count} rows')
+    print(f"{'transport':<18} {'payload KiB':>12} {'decode ms':>10}")
+    for name, size, decode_ms in results:
+        print(f'{name:<18} {size / 1024:>12.1f} {decode_ms:>10.2f}')
+
+
+if __name__ == '__main__':
+    for count in [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000]:
+        run(count)
@@ -40,12 +40,19 @@
         'stock',
     ],
     'external_dependencies': {
-        'python': ['anthropic'],
+        'python': ['anthropic', 'httpx'],
     },
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron.xml',
         'views/ai_assistant_views.xml',
     ],
+    'assets': {
+        'web.assets_backend': [
+            'odoo_ai_tools/static/src/js/ai_assistant_stream.js',
+            'odoo_ai_tools/static/src/xml/ai_assistant_stream.xml',
+        ],
+    },
     'demo': [],
     'installable': True,
     'application': True,
@@ -5,9 +5,24 @@ AI Assistant Controllers
 HTTP controllers for AI Assistant (future use for webhooks, API endpoints, etc.)
 """
 
-from odoo import http
-from odoo.http import request
+from odoo import SUPERUSER_ID, api, fields, http
+from odoo.exceptions import AccessError, MissingError, UserError
+from odoo.http import request, Response
 import json
+import logging
+
+from ..models.ai_assistant import _save_result
+
+_logger = logging.getLogger(__name__)
+
+# Keys of the final 'done' event sent to the browser (tools_used holds the
+# full tool inputs and results, which stay server side)
+DONE_EVENT_KEYS = ('type', 'response', 'usage', 'success', 'error')
+
+
+def _sse(event):
+    """Format an event as a Server-Sent Events message."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
 
 
 class AIAssistantController(http.Controller):
@@ -22,7 +37,113 @@ class AIAssistantController(http.Controller):
             'version': '18.2.1.0.0'
         })
 
+    @http.route('/ai_assistant/chat', type='http', auth='user', methods=['POST'])
+    def chat(self, assistant_id, password=None, message=None, **kwargs):
+        """
+        Send a conversation's message to Claude, streaming the answer.
+
+        Responds with Server-Sent Events (text/event-stream): 'text_delta'
+        events as Claude writes, 'tool_start'/'tool_end' around tool calls
+        and a final 'done' event (or a single 'error' event). The response
+        is also stored on the conversation, as with "Send to Claude".
+        Used by the "Stream Answer" button of the conversation form.
+
+        Args:
+            assistant_id (str): ai.assistant record ID
+            password (str, optional): Password of the current user, for Odoo
+                API access (default: a short-lived API key, revoked when
+                the stream ends)
+            message (str, optional): Follow-up question (default: the
+                conversation's message)
+
+        Returns:
+            Response: Event stream
+        """
+        assistant = request.env['ai.assistant']
+        issued_key = False
+        try:
+            assistant = assistant.browse(int(assistant_id))
+            assistant.check_access('write')
+            if assistant.state in ('queued', 'running'):
+                raise UserError('This message is already being processed')
+            if not password:
+                password = assistant._issue_job_key()
+                issued_key = True
+            orchestrator = assistant._prepare_orchestrator(password)
+            user_message = message or assistant.user_message
+            assistant.write({'state': 'running', 'job_date': fields.Datetime.now()})
+        except ImportError:
+            if issued_key:
+                assistant._revoke_job_key()
+            return self._event_response([{
+                'type': 'error',
+                'error': 'Anthropic package not installed. Install with: pip install anthropic'
+            }])
+        except (ValueError, AccessError, MissingError, UserError) as e:
+            if issued_key:
+                assistant._revoke_job_key()
+            return self._event_response([{'type': 'error', 'error': str(e)}])
+
+        # The request cursor is closed once this method returns, so the
+        # result is stored with a new cursor when the stream ends
+        registry = request.env.registry
+        uid = request.env.uid
+        context = dict(request.env.context)
+        record_id = assistant.id
+
+        def events():
+            # Stored on every exit: the final result, or what was streamed
+            # before the client disconnected or the stream failed
+            result = None
+            streamed = []
+            stream = orchestrator.stream_message(user_message)
+            try:
+                for event in stream:
+                    if event['type'] == 'done':
+                        result = event
+                        event = {key: event[key] for key in DONE_EVENT_KEYS}
+                    elif event['type'] == 'text_delta':
+                        streamed.append(event['text'])
+                    yield _sse(event)
+            finally:
+                stream.close()
+                if result is None:
+                    result = {
+                        'response': ''.join(streamed),
+                        'success': False,
+                        'error': 'The answer was interrupted before it completed'
+                    }
+                if _save_result(registry, uid, context, record_id, orchestrator, result):
+                    _logger.info(f"AI Assistant streamed message for user {uid}")
+                if issued_key:
+                    with registry.cursor() as cr:
+                        api.Environment(cr, SUPERUSER_ID, {})['ai.assistant'].browse(record_id).exists()._revoke_job_key()
+
+        return self._event_response(events())
+
+    def _event_response(self, events):
+        """
+        Build an unbuffered Server-Sent Events response.
+
+        Args:
+            events: Iterable of events (dicts) or of formatted SSE strings
+
+        Returns:
+            Response: text/event-stream response
+        """
+        if isinstance(events, list):
+            events = [_sse(event) for event in events]
+
+        return Response(
+            events,
+            mimetype='text/event-stream',
+            headers=[
+                ('Cache-Control', 'no-cache'),
+                ('X-Accel-Buffering', 'no'),
+            ],
+            direct_passthrough=True
+        )
+
     # Future endpoints:
-    # - /ai_assistant/chat (for real-time chat interface)
     # - /ai_assistant/webhook (for Claude streaming responses)
     # - /ai_assistant/tools (list available tools)
@@ -1,2 +1,3 @@
 # -*- coding: utf-8 -*-
 from . import ai_assistant
+from . import ai_assistant_message
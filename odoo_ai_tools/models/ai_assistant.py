@@ -5,12 +5,35 @@ AI Assistant Model
 Odoo model for interacting with Claude AI assistant.
 """
 
-from odoo import models, fields, api, _
+from odoo import models, fields, api, _, Command, SUPERUSER_ID
 from odoo.exceptions import UserError, ValidationError
+from odoo.modules.registry import Registry
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+import json
 import logging
+import time
 
 _logger = logging.getLogger(__name__)
 
+# System parameter: conversations run at once by the job runner, across
+# all Odoo processes (0 = run them in the HTTP request)
+JOB_WORKERS_PARAM = 'odoo_ai_tools.job_workers'
+DEFAULT_JOB_WORKERS = 2
+
+# Seconds the runner keeps claiming new jobs before handing over to its next
+# run (keep it, plus the longest conversation, under limit_time_real_cron)
+JOB_RUNNER_SECONDS = 60
+
+# Seconds between checks for new jobs while the runner's jobs are running
+JOB_POLL_SECONDS = 2
+
+# Lifetime of the API key a queued job reaches Odoo with
+JOB_KEY_LIFETIME = timedelta(days=1)
+
+# Conversations running for longer than this are marked as failed
+STALE_JOB_MINUTES = 30
+
 
 class AIAssistant(models.Model):
     """AI Assistant powered by Claude for Odoo operations."""
@@ -60,6 +83,55 @@ class AIAssistant(models.Model):
         string='Date',
         readonly=True
     )
+    state = fields.Selection(
+        [
+            ('draft', 'Draft'),
+            ('queued', 'Queued'),
+            ('running', 'Running'),
+            ('done', 'Done'),
+            ('failed', 'Failed'),
+        ],
+        string='Status',
+        default='draft',
+        required=True,
+        readonly=True,
+        copy=False
+    )
+    follow_up_message = fields.Text(
+        string='Follow-up',
+        help='Next question, answered with the conversation so far'
+    )
+    message_ids = fields.One2many(
+        'ai.assistant.message',
+        'assistant_id',
+        string='Messages',
+        readonly=True,
+        copy=False
+    )
+    job_date = fields.Datetime(
+        string='Queued On',
+        readonly=True,
+        copy=False,
+        help='When the message was last queued or started'
+    )
+    job_message = fields.Text(
+        string='Queued Message',
+        readonly=True,
+        copy=False
+    )
+    job_user_id = fields.Many2one(
+        'res.users',
+        string='Queued By',
+        readonly=True,
+        copy=False
+    )
+    job_api_key = fields.Char(
+        string='Job API Key',
+        groups='base.group_system',
+        copy=False,
+        help='Short-lived Odoo API key of the sender, used by the queued job '
+             'and revoked when it ends'
+    )
 
     @api.depends('user_message')
     def _compute_name(self):
@@ -78,52 +150,51 @@ class AIAssistant(models.Model):
         if not self.user_message:
             raise UserError(_('Please enter a message'))
 
+        return self._send_message(self.user_message)
+
+    def action_send_follow_up(self):
+        """Send a follow-up question, with the conversation so far."""
+        self.ensure_one()
+
+        if not self.follow_up_message:
+            raise UserError(_('Please enter a follow-up question'))
+
+        return self._send_message(self.follow_up_message)
+
+    def _send_message(self, user_message):
+        """
+        Send a message of this conversation to Claude.
+
+        Args:
+            user_message (str): Message to send
+
+        Returns:
+            dict: Notification action
+        """
         if not self.anthropic_api_key:
             raise UserError(_(
                 'Please configure your Anthropic API key.\n'
                 'Get one at: https://console.anthropic.com/'
             ))
 
-        try:
-            # Import orchestrator
-            from ..tools.claude_orchestrator import create_orchestrator
+        if self.state in ('queued', 'running'):
+            raise UserError(_('This message is already being processed'))
 
-            # Get Odoo credentials (current user)
-            odoo_url = self.env['ir.config_parameter'].sudo().get_param(
-                'web.base.url',
-                default='http://localhost:8069'
-            )
-            odoo_db = self.env.cr.dbname
-            odoo_user = self.env.user.login
+        if self._job_workers() > 0:
+            return self._enqueue(user_message)
 
+        try:
             # Note: For security, password should be entered by user
             # In production, use API keys or OAuth instead
-            odoo_password = self.env.context.get('user_password')
-            if not odoo_password:
-                raise UserError(_(
-                    'Password required for Odoo API access.\n'
-                    'Please provide your password in the context.'
-                ))
-
-            # Create orchestrator
-            orchestrator = create_orchestrator(
-                api_key=self.anthropic_api_key,
-                odoo_url=odoo_url,
-                odoo_db=odoo_db,
-                odoo_username=odoo_user,
-                odoo_password=odoo_password
+            orchestrator = self._prepare_orchestrator(
+                self.env.context.get('user_password')
             )
 
             # Process message
-            result = orchestrator.process_message(self.user_message)
+            result = orchestrator.process_message(user_message)
 
             # Update record with response
-            self.write({
-                'assistant_response': result.get('response', ''),
-                'tools_used': str(result.get('tools_used', [])),
-                'success': result.get('success', False),
-                'error_message': result.get('error')
-            })
+            self._store_result(orchestrator, result)
 
             _logger.info(f"AI Assistant processed message for user {self.env.user.login}")
 
@@ -157,6 +228,346 @@ class AIAssistant(models.Model):
             }
         }
 
+    def _prepare_orchestrator(self, odoo_password):
+        """
+        Create the Claude orchestrator of this conversation.
+
+        Args:
+            odoo_password (str): Password (or API key) of the current user, for
+                Odoo API access
+
+        Returns:
+            ClaudeOrchestrator: Orchestrator acting as the current user, shared
+                by all messages of this conversation
+        """
+        self.ensure_one()
+
+        if not self.user_message:
+            raise UserError(_('Please enter a message'))
+
+        if not self.anthropic_api_key:
+            raise UserError(_(
+                'Please configure your Anthropic API key.\n'
+                'Get one at: https://console.anthropic.com/'
+            ))
+
+        if not odoo_password:
+            raise UserError(_(
+                'Password required for Odoo API access.\n'
+                'Please provide your password in the context.'
+            ))
+
+        # Import orchestrator registry
+        from ..tools.orchestrator_registry import get_orchestrator
+
+        # Get Odoo credentials (current user)
+        odoo_url = self.env['ir.config_parameter'].sudo().get_param(
+            'web.base.url',
+            default='http://localhost:8069'
+        )
+
+        # Reused across messages of this conversation (warm connections)
+        orchestrator = get_orchestrator(
+            api_key=self.anthropic_api_key,
+            odoo_url=odoo_url,
+            odoo_db=self.env.cr.dbname,
+            odoo_username=self.env.user.login,
+            odoo_password=odoo_password,
+            conversation_key=(self._name, self.id)
+        )
+
+        # Stored messages are the reference (the orchestrator may be new, or
+        # have been used by another process)
+        if len(orchestrator.conversation_history) != len(self.message_ids):
+            orchestrator.load_history([
+                {'role': message.role, 'content': message._content()}
+                for message in self.message_ids
+            ])
+
+        return orchestrator
+
+    @api.model
+    def _job_workers(self):
+        """Conversations the job runner runs at once (0 = run them in the request)."""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            JOB_WORKERS_PARAM,
+            default=DEFAULT_JOB_WORKERS
+        ))
+
+    def _enqueue(self, user_message):
+        """
+        Queue the message for the job runner.
+
+        The job is stored on the record, so it survives a restart; the
+        "AI Assistant: Run Queued Jobs" scheduled action claims and runs
+        it. The sender's password is not stored: the job reaches Odoo with
+        a short-lived API key of the sender, revoked when the job ends.
+
+        Args:
+            user_message (str): Message to send
+
+        Returns:
+            dict: Notification action
+        """
+        self.ensure_one()
+        self._issue_job_key()
+
+        self.write({
+            'state': 'queued',
+            'job_date': fields.Datetime.now(),
+            'job_message': user_message,
+            'assistant_response': False,
+            'error_message': False,
+            'success': False,
+        })
+        self.env.ref('odoo_ai_tools.ir_cron_ai_assistant_run_jobs').sudo()._trigger()
+
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Message Queued'),
+                'message': _('The response will appear here when it is ready'),
+                'type': 'info',
+                'sticky': False,
+            }
+        }
+
+    def _issue_job_key(self):
+        """
+        Issue a short-lived, rpc-scoped API key of the current user, for the
+        next job of this conversation (queued or streamed) to reach Odoo
+        with. Revoked by _revoke_job_key.
+
+        Returns:
+            str: API key
+        """
+        self.ensure_one()
+        self._revoke_job_key()
+
+        api_key = self.env['res.users.apikeys']._generate(
+            'rpc',
+            self._job_key_name(),
+            fields.Datetime.now() + JOB_KEY_LIFETIME
+        )
+        self.sudo().write({'job_api_key': api_key, 'job_user_id': self.env.uid})
+        return api_key
+
+    def _job_key_name(self):
+        self.ensure_one()
+        return f'AI Assistant job {self.id}'
+
+    def _revoke_job_key(self):
+        """Delete the job API keys of these conversations."""
+        for record in self.sudo().filtered('job_api_key'):
+            self.env['res.users.apikeys'].sudo().search([
+                ('user_id', '=', record.job_user_id.id),
+                ('name', '=', record._job_key_name()),
+            ]).unlink()
+            record.job_api_key = False
+
+    @api.model
+    def _cron_run_queued_jobs(self):
+        """
+        Run queued conversations (the job runner).
+
+        Odoo runs one instance of a scheduled action at a time, so every
+        queued conversation goes through this loop, which runs at most
+        ``odoo_ai_tools.job_workers`` of them at once. Jobs are claimed with
+        SELECT ... FOR UPDATE SKIP LOCKED and committed as running before
+        they start. New jobs are claimed for JOB_RUNNER_SECONDS; the action
+        is then triggered again for those left.
+        """
+        workers = max(1, self._job_workers())
+        deadline = time.monotonic() + JOB_RUNNER_SECONDS
+        dbname = self.env.cr.dbname
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='odoo_ai_job') as executor:
+            running = set()
+            while True:
+                if len(running) < workers and time.monotonic() < deadline:
+                    for record_id in self._claim_jobs(workers - len(running)):
+                        running.add(executor.submit(_run_job, dbname, record_id))
+                if not running:
+                    break
+                done, running = wait(running, timeout=JOB_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception():
+                        _logger.error("AI Assistant job failed", exc_info=future.exception())
+
+        if self.search_count([('state', '=', 'queued')], limit=1):
+            self.env.ref('odoo_ai_tools.ir_cron_ai_assistant_run_jobs')._trigger()
+
+    @api.model
+    def _claim_jobs(self, limit):
+        """
+        Mark the oldest queued conversations as running, in a committed
+        transaction of their own.
+
+        Args:
+            limit (int): Max conversations to claim
+
+        Returns:
+            list[int]: Claimed ai.assistant IDs
+        """
+        with self.pool.cursor() as cr:
+            cr.execute("""
+                SELECT id FROM ai_assistant
+                WHERE state = 'queued'
+                ORDER BY job_date, id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            """, [limit])
+            ids = [row[0] for row in cr.fetchall()]
+            if ids:
+                self.with_env(self.env(cr=cr)).browse(ids).write({
+                    'state': 'running',
+                    'job_date': fields.Datetime.now(),
+                })
+        return ids
+
+    @api.model
+    def _cron_fail_stale_jobs(self):
+        """
+        Mark conversations running for too long as failed.
+
+        job_date is reset when a job starts, so this is the time since it
+        started; queued conversations waiting behind others are left alone.
+        """
+        limit = fields.Datetime.now() - timedelta(minutes=STALE_JOB_MINUTES)
+        stale = self.search([
+            ('state', '=', 'running'),
+            ('job_date', '<', limit),
+        ])
+        stale.write({
+            'state': 'failed',
+            'success': False,
+            'error_message': _('The message was not processed in time (server restarted or overloaded). Please send it again.'),
+        })
+        stale._revoke_job_key()
+
+    def _store_result(self, orchestrator, result):
+        """
+        Store an orchestrator result and the new messages of the conversation.
+
+        Args:
+            orchestrator (ClaudeOrchestrator): Orchestrator that produced it
+                (None if it could not be created)
+            result (dict): process_message result (or stream_message 'done' event)
+        """
+        self.ensure_one()
+        stored = len(self.message_ids)
+
+        values = self._result_values(result)
+        values['message_ids'] = [
+            Command.create({
+                'sequence': sequence,
+                'role': message['role'],
+                'content_json': json.dumps(message['content'], ensure_ascii=False, default=str),
+            })
+            for sequence, message in enumerate(
+                orchestrator.export_history(stored) if orchestrator else [],
+                start=stored
+            )
+        ]
+        if result.get('success'):
+            values['follow_up_message'] = False
+
+        self.write(values)
+
+    @api.model
+    def _result_values(self, result):
+        """
+        Field values storing an orchestrator result.
+
+        Args:
+            result (dict): process_message result (or stream_message 'done' event)
+
+        Returns:
+            dict: Values to write on the conversation
+        """
+        return {
+            'assistant_response': result.get('response', ''),
+            'tools_used': str(result.get('tools_used', [])),
+            'success': result.get('success', False),
+            'error_message': result.get('error'),
+            'state': 'done' if result.get('success') else 'failed'
+        }
+
+
+def _run_job(dbname, record_id):
+    """
+    Process a claimed conversation (runs on the job runner's threads).
+
+    No cursor is held while Claude and the tools run: the job is read, then
+    the record is updated with the result, each in its own transaction. The
+    job acts as its sender, through the sender's job API key.
+
+    Args:
+        dbname (str): Database name
+        record_id (int): ai.assistant record ID, already marked running
+    """
+    registry = Registry(dbname)
+    uid, context, orchestrator = SUPERUSER_ID, {}, None
+
+    try:
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            record = env['ai.assistant'].browse(record_id)
+            uid = record.job_user_id.id or record.user_id.id
+            context = env['res.users'].with_user(uid).context_get()
+            api_key = record.job_api_key
+            user_message = record.job_message
+
+            record = record.with_user(uid).with_context(context)
+            orchestrator = record._prepare_orchestrator(api_key)
+
+        result = orchestrator.process_message(user_message)
+    except Exception as e:
+        result = {'success': False, 'error': str(e)}
+
+    if _save_result(registry, uid, context, record_id, orchestrator, result):
+        _logger.info(f"AI Assistant processed queued message {record_id} for user {uid}")
+
+    with registry.cursor() as cr:
+        api.Environment(cr, SUPERUSER_ID, {})['ai.assistant'].browse(record_id).exists()._revoke_job_key()
+
+
+def _save_result(registry, uid, context, record_id, orchestrator, result):
+    """
+    Store a result with a new cursor, or mark the conversation as failed if
+    it cannot be stored (e.g. a concurrent update of the record), so it is
+    never left running.
+
+    Args:
+        registry: Registry of the database
+        uid (int): User who sent the message
+        context (dict): Context of the request
+        record_id (int): ai.assistant record ID
+        orchestrator (ClaudeOrchestrator): Orchestrator that produced it
+        result (dict): process_message result (or stream_message 'done' event)
+
+    Returns:
+        bool: Whether the result was stored
+    """
+    try:
+        with registry.cursor() as cr:
+            env = api.Environment(cr, uid, context)
+            record = env['ai.assistant'].browse(record_id).exists()
+            if record:
+                record._store_result(orchestrator, result)
+        return True
+    except Exception as e:
+        _logger.exception("AI Assistant could not store the result of message %s", record_id)
+        with registry.cursor() as cr:
+            env = api.Environment(cr, uid, context)
+            env['ai.assistant'].browse(record_id).exists().write({
+                'state': 'failed',
+                'success': False,
+                'error_message': f"Could not store the answer: {str(e)}"
+            })
+        return False
+
 
 class AIAssistantConfig(models.TransientModel):
     """Configuration wizard for AI Assistant."""
@@ -184,14 +595,15 @@ class AIAssistantConfig(models.TransientModel):
         self.ensure_one()
 
         try:
-            from ..tools.claude_orchestrator import create_orchestrator
+            from ..tools.orchestrator_registry import get_orchestrator
 
             odoo_url = self.env['ir.config_parameter'].sudo().get_param(
                 'web.base.url',
                 default='http://localhost:8069'
             )
 
-            orchestrator = create_orchestrator(
+            # New conversation on the shared Anthropic client of the key
+            orchestrator = get_orchestrator(
                 api_key=self.anthropic_api_key,
                 odoo_url=odoo_url,
                 odoo_db=self.env.cr.dbname,
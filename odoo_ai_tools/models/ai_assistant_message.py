@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+AI Assistant Message Model
+==========================
+Messages of a Claude conversation, stored to restore its history.
+"""
+
+from odoo import models, fields, api
+import json
+
+
+class AIAssistantMessage(models.Model):
+    """One message of a conversation, as sent to or received from Claude."""
+
+    _name = 'ai.assistant.message'
+    _description = 'AI Assistant Message'
+    _order = 'assistant_id, sequence, id'
+
+    assistant_id = fields.Many2one(
+        'ai.assistant',
+        string='Conversation',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    sequence = fields.Integer(
+        string='Sequence',
+        required=True,
+        help='Position of the message in the conversation'
+    )
+    role = fields.Selection(
+        [('user', 'User'), ('assistant', 'Assistant')],
+        string='Role',
+        required=True
+    )
+    content_json = fields.Text(
+        string='Content',
+        required=True,
+        help='Message content as sent to Claude (text or JSON content blocks)'
+    )
+    preview = fields.Char(
+        string='Preview',
+        compute='_compute_preview'
+    )
+
+    @api.depends('content_json')
+    def _compute_preview(self):
+        """Summarize content: text, tool calls and tool results."""
+        for message in self:
+            parts = []
+            for block in message._content_blocks():
+                if block.get('type') == 'text':
+                    parts.append(block.get('text', ''))
+                elif block.get('type') == 'tool_use':
+                    parts.append(f"[{block.get('name')}]")
+                elif block.get('type') == 'tool_result':
+                    parts.append('[tool result]')
+            preview = ' '.join(parts).strip()
+            message.preview = preview[:120] + ('...' if len(preview) > 120 else '')
+
+    def _content(self):
+        """Stored content: a string or a list of content block dicts."""
+        self.ensure_one()
+        return json.loads(self.content_json)
+
+    def _content_blocks(self):
+        content = self._content() if self.content_json else []
+        if isinstance(content, str):
+            return [{'type': 'text', 'text': content}]
+        return content
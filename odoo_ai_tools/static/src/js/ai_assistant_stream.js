@@ -0,0 +1,124 @@
+/** @odoo-module **/
+
+import { Component, useState } from "@odoo/owl";
+import { registry } from "@web/core/registry";
+import { useService } from "@web/core/utils/hooks";
+import { standardWidgetProps } from "@web/views/widgets/standard_widget_props";
+
+/**
+ * "Stream Answer" button of the conversation form.
+ *
+ * POSTs the conversation's message (or its follow-up) to /ai_assistant/chat
+ * and renders the Server-Sent Events as they arrive: Claude's text
+ * ('text_delta') and the tools it runs ('tool_start'/'tool_end'). The
+ * record is reloaded once the answer has been stored ('done' or 'error').
+ */
+export class AIAssistantStream extends Component {
+    static template = "odoo_ai_tools.AIAssistantStream";
+    static props = { ...standardWidgetProps };
+
+    setup() {
+        this.notification = useService("notification");
+        this.state = useState({ streaming: false, text: "", tools: [], error: "" });
+    }
+
+    get isFollowUp() {
+        return this.props.record.data.message_ids.count > 0;
+    }
+
+    get message() {
+        const data = this.props.record.data;
+        return (this.isFollowUp ? data.follow_up_message : data.user_message) || "";
+    }
+
+    async onStream() {
+        if (!this.message.trim()) {
+            this.notification.add(
+                this.isFollowUp ? "Please enter a follow-up question" : "Please enter a message",
+                { type: "warning" }
+            );
+            return;
+        }
+        // The endpoint reads the message from the record unless one is given
+        if (!(await this.props.record.save())) {
+            return;
+        }
+
+        Object.assign(this.state, { streaming: true, text: "", tools: [], error: "" });
+        const body = new URLSearchParams({
+            assistant_id: this.props.record.resId,
+            csrf_token: odoo.csrf_token,
+        });
+        if (this.isFollowUp) {
+            body.append("message", this.message);
+        }
+
+        try {
+            const response = await fetch("/ai_assistant/chat", { method: "POST", body });
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            await this._readEvents(response.body.getReader());
+        } catch (error) {
+            this.state.error = error.message || String(error);
+        } finally {
+            this.state.streaming = false;
+            await this.props.record.load();
+        }
+    }
+
+    /**
+     * Read a Server-Sent Events stream, handling each complete event.
+     *
+     * @param {ReadableStreamDefaultReader} reader
+     */
+    async _readEvents(reader) {
+        const decoder = new TextDecoder();
+        let buffer = "";
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) {
+                return;
+            }
+            buffer += decoder.decode(value, { stream: true });
+            const messages = buffer.split("\n\n");
+            buffer = messages.pop();
+            for (const message of messages) {
+                const data = message
+                    .split("\n")
+                    .filter((line) => line.startsWith("data: "))
+                    .map((line) => line.slice(6))
+                    .join("\n");
+                if (data) {
+                    this._onEvent(JSON.parse(data));
+                }
+            }
+        }
+    }
+
+    /**
+     * @param {Object} event Event sent by /ai_assistant/chat
+     */
+    _onEvent(event) {
+        if (event.type === "text_delta") {
+            this.state.text += event.text;
+        } else if (event.type === "tool_start") {
+            this.state.tools.push({ id: event.id, name: event.tool, running: true, success: false });
+        } else if (event.type === "tool_end") {
+            const tool = this.state.tools.find((tool) => tool.id === event.id);
+            if (tool) {
+                Object.assign(tool, { running: false, success: event.success });
+            }
+        } else if (event.type === "done" && !event.success) {
+            this.state.error = event.error || "";
+        } else if (event.type === "error") {
+            this.state.error = event.error;
+        }
+    }
+}
+
+export const aiAssistantStream = {
+    component: AIAssistantStream,
+};
+
+registry.category("view_widgets").add("ai_assistant_stream", aiAssistantStream);
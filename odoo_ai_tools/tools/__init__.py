@@ -1,8 +1,16 @@
 # -*- coding: utf-8 -*-
+from . import odoo_transports
 from . import odoo_api_client
+from . import sales_rollup
 from . import sales_reports
 from . import invoice_creation
 from . import tax_deductions
 from . import quotation_summary
 from . import inventory_restock
+from . import async_odoo_api_client
+from . import async_tools
+from . import tool_cache
+from . import context_window
+from . import result_compaction
 from . import claude_orchestrator
+from . import orchestrator_registry
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+Async Odoo Web API Client
+=========================
+asyncio counterpart of OdooAPIClient, speaking JSON-RPC over httpx.
+Lets independent RPCs (and independent tools) overlap on one event loop.
+"""
+
+import asyncio
+import itertools
+import xmlrpc.client
+from typing import Dict, List, Any, Optional
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from .odoo_api_client import DEFAULT_BATCH_SIZE, MAX_PARALLEL_RPC, OdooRPCError
+from .odoo_transports import JSONRPC_TIMEOUT, RPC_FAULT_CODE_ACCESS_ERROR, json_dumps, json_loads, jsonrpc_fault
+
+
+class AsyncOdooAPIClient:
+    """Async client for the Odoo JSON-RPC Web API with authentication."""
+
+    def __init__(
+        self,
+        url: str,
+        db: str,
+        username: str,
+        password: str,
+        max_concurrency: int = MAX_PARALLEL_RPC,
+        timeout: float = JSONRPC_TIMEOUT
+    ):
+        """
+        Initialize async Odoo API client.
+
+        Args:
+            url (str): Odoo server URL (e.g., 'http://localhost:8069')
+            db (str): Database name
+            username (str): User login
+            password (str): User password
+            max_concurrency (int): Max RPCs in flight at once
+            timeout (float): HTTP timeout in seconds
+        """
+        if not httpx:
+            raise ImportError(
+                "httpx package not installed. "
+                "Install with: pip install httpx"
+            )
+
+        self.url = url
+        self.db = db
+        self.username = username
+        self.password = password
+        self.uid = None
+        self._http = httpx.AsyncClient(
+            base_url=url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency)
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._auth_lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+
+    async def __aenter__(self) -> 'AsyncOdooAPIClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying HTTP connections."""
+        await self._http.aclose()
+
+    async def _call(self, service: str, method: str, args: List) -> Any:
+        payload = {
+            'jsonrpc': '2.0',
+            'method': 'call',
+            'params': {'service': service, 'method': method, 'args': args},
+            'id': next(self._ids),
+        }
+
+        async with self._semaphore:
+            response = await self._http.post(
+                '/jsonrpc',
+                content=json_dumps(payload),
+                headers={'Content-Type': 'application/json'}
+            )
+        response.raise_for_status()
+        reply = json_loads(response.content)
+
+        error = reply.get('error')
+        if error:
+            raise jsonrpc_fault(error)
+
+        return reply.get('result')
+
+    async def authenticate(self) -> bool:
+        """
+        Authenticate user and get UID.
+
+        Returns:
+            bool: True if authentication successful
+
+        Raises:
+            Exception: If authentication fails
+        """
+        try:
+            self.uid = await self._call(
+                'common',
+                'authenticate',
+                [self.db, self.username, self.password, {}]
+            )
+
+            if not self.uid:
+                raise Exception(f"Authentication failed for user: {self.username}")
+
+            return True
+
+        except Exception as e:
+            raise Exception(f"Odoo API authentication error: {str(e)}")
+
+    async def execute_kw(self, model: str, method: str, args: List = None, kwargs: Dict = None) -> Any:
+        """
+        Execute Odoo model method via API.
+
+        Args:
+            model (str): Odoo model name (e.g., 'sale.order')
+            method (str): Method name (e.g., 'search_read')
+            args (list): Positional arguments
+            kwargs (dict): Keyword arguments
+
+        Returns:
+            Any: Method result
+
+        Raises:
+            PermissionError: If the user lacks permissions
+            OdooRPCError: If Odoo raised an error
+        """
+        if not self.uid:
+            async with self._auth_lock:
+                if not self.uid:
+                    await self.authenticate()
+
+        try:
+            return await self._call(
+                'object',
+                'execute_kw',
+                [self.db, self.uid, self.password, model, method, args or [], kwargs or {}]
+            )
+
+        except xmlrpc.client.Fault as e:
+            # Permission error handling
+            if e.faultCode == RPC_FAULT_CODE_ACCESS_ERROR:
+                raise PermissionError(
+                    f"User '{self.username}' lacks permission to {method} on {model}"
+                )
+            raise OdooRPCError(e) from e
+
+    async def search(self, model: str, domain: List, limit: Optional[int] = None) -> List[int]:
+        """Search for record IDs. See OdooAPIClient.search."""
+        kwargs = {}
+        if limit:
+            kwargs['limit'] = limit
+
+        return await self.execute_kw(model, 'search', [domain], kwargs)
+
+    async def read(self, model: str, ids: List[int], fields: List[str]) -> List[Dict]:
+        """Read record data. See OdooAPIClient.read."""
+        return await self.execute_kw(model, 'read', [ids], {'fields': fields})
+
+    async def search_read(
+        self,
+        model: str,
+        domain: List,
+        fields: List[str],
+        limit: Optional[int] = None,
+        order: Optional[str] = None
+    ) -> List[Dict]:
+        """Search and read records in one call. See OdooAPIClient.search_read."""
+        kwargs = {'fields': fields}
+        if limit:
+            kwargs['limit'] = limit
+        if order:
+            kwargs['order'] = order
+
+        return await self.execute_kw(model, 'search_read', [domain], kwargs)
+
+    async def search_read_paged(
+        self,
+        model: str,
+        domain: List,
+        fields: List[str],
+        page_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """Iterate over all matching records page by page. See OdooAPIClient.search_read_paged."""
+        last_id = 0
+
+        while True:
+            page = await self.search_read(
+                model,
+                list(domain) + [('id', '>', last_id)],
+                fields,
+                limit=page_size,
+                order='id asc'
+            )
+
+            if not page:
+                return
+
+            yield page
+
+            if len(page) < page_size:
+                return
+            last_id = page[-1]['id']
+
+    async def read_group(
+        self,
+        model: str,
+        domain: List,
+        fields: List[str],
+        groupby: List[str],
+        lazy: bool = False
+    ) -> List[Dict]:
+        """Aggregate records server-side. See OdooAPIClient.read_group."""
+        return await self.execute_kw(
+            model,
+            'read_group',
+            [domain, fields, groupby],
+            {'lazy': lazy}
+        )
+
+    async def create(self, model: str, values: Dict) -> int:
+        """Create a new record. See OdooAPIClient.create."""
+        return await self.execute_kw(model, 'create', [values])
+
+    async def create_many(self, model: str, values_list: List[Dict]) -> List[int]:
+        """Create several records in one call. See OdooAPIClient.create_many."""
+        return await self.execute_kw(model, 'create', [values_list])
+
+    async def write(self, model: str, ids: List[int], values: Dict) -> bool:
+        """Update records. See OdooAPIClient.write."""
+        return await self.execute_kw(model, 'write', [ids, values])
+
+    async def unlink(self, model: str, ids: List[int]) -> bool:
+        """Delete records. See OdooAPIClient.unlink."""
+        return await self.execute_kw(model, 'unlink', [ids])
+
+    async def fields_get(self, model: str, fields: Optional[List[str]] = None) -> Dict:
+        """Get model field definitions. See OdooAPIClient.fields_get."""
+        args = []
+        if fields:
+            args = [fields]
+
+        return await self.execute_kw(model, 'fields_get', args)
+
+    async def check_access_rights(self, model: str, operation: str) -> bool:
+        """Check if user has access rights for operation. See OdooAPIClient.check_access_rights."""
+        try:
+            return await self.execute_kw(
+                model,
+                'check_access_rights',
+                [operation],
+                {'raise_exception': False}
+            )
+        except Exception:
+            return False
@@ -0,0 +1,675 @@
+# -*- coding: utf-8 -*-
+"""
+Async Tools
+===========
+asyncio versions of the five Claude tools, built on AsyncOdooAPIClient.
+
+Each coroutine takes the same arguments and returns the same result shape
+as its synchronous counterpart, and reuses that module's call builders
+(``_*_calls``), result indexing, analysis and summary helpers: only the
+awaiting of the RPCs is written here. Independent RPCs inside a tool are awaited together,
+and independent tools can run concurrently on one event loop.
+
+These are a library surface for callers running their own event loop: the
+orchestrator and the ai.assistant model run the synchronous tools (with the
+client pool, result cache and compaction), not these coroutines.
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+from .async_odoo_api_client import AsyncOdooAPIClient
+from .odoo_api_client import OdooRPCError
+from . import sales_reports
+from . import invoice_creation
+from . import tax_deductions
+from . import quotation_summary
+from . import inventory_restock
+
+
+async def generate_sales_report_async(
+    url: str,
+    db: str,
+    username: str,
+    password: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    group_by: str = 'product',
+    product_ids: Optional[List[int]] = None,
+    partner_ids: Optional[List[int]] = None,
+    aggregation: str = 'server'
+) -> Dict:
+    """Async version of sales_reports.generate_sales_report."""
+    if aggregation == 'rollup':
+        # The rollup store is SQLite refreshed through the synchronous
+        # client: run the synchronous tool off the event loop
+        return await asyncio.to_thread(
+            sales_reports.generate_sales_report,
+            url, db, username, password,
+            date_from=date_from,
+            date_to=date_to,
+            group_by=group_by,
+            product_ids=product_ids,
+            partner_ids=partner_ids,
+            aggregation=aggregation
+        )
+
+    try:
+        async with AsyncOdooAPIClient(url, db, username, password) as client:
+            await client.authenticate()
+
+            if aggregation == 'server':
+                calls = sales_reports._server_report_calls(group_by, date_from, date_to, product_ids, partner_ids)
+                has_access, *results = await asyncio.gather(
+                    client.check_access_rights('sale.order', 'read'),
+                    *(client.execute_kw(*call) for call in calls),
+                    return_exceptions=True
+                )
+
+                if has_access is not True:
+                    return {
+                        'success': False,
+                        'data': None,
+                        'summary': None,
+                        'error': f"User '{username}' lacks permission to read sales orders"
+                    }
+
+                errors = [result for result in results if isinstance(result, Exception)]
+                for error in errors:
+                    if isinstance(error, PermissionError):
+                        raise error
+
+                if not errors:
+                    return sales_reports._build_server_report(
+                        *results,
+                        group_by=group_by,
+                        date_from=date_from,
+                        date_to=date_to
+                    )
+                # Grouped query not supported here: aggregate client-side
+
+            # Permission check and order fetch are independent
+            has_access, orders = await asyncio.gather(
+                client.check_access_rights('sale.order', 'read'),
+                client.search_read(
+                    'sale.order',
+                    sales_reports._build_order_domain(date_from, date_to, partner_ids),
+                    sales_reports.ORDER_FIELDS
+                ),
+                return_exceptions=True
+            )
+
+            if has_access is not True:
+                return {
+                    'success': False,
+                    'data': None,
+                    'summary': None,
+                    'error': f"User '{username}' lacks permission to read sales orders"
+                }
+            if isinstance(orders, Exception):
+                raise orders
+
+            if not orders:
+                return {
+                    'success': True,
+                    'data': [],
+                    'summary': {'total_sales': 0, 'order_count': 0},
+                    'error': None
+                }
+
+            lines = await client.search_read(
+                'sale.order.line',
+                sales_reports._build_line_domain(orders, product_ids),
+                sales_reports.LINE_FIELDS
+            )
+
+        report_data, summary = sales_reports._build_report(orders, lines, group_by, date_from, date_to)
+
+        return {
+            'success': True,
+            'data': report_data,
+            'summary': summary,
+            'error': None
+        }
+
+    except PermissionError as e:
+        return {
+            'success': False,
+            'data': None,
+            'summary': None,
+            'error': str(e)
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'data': None,
+            'summary': None,
+            'error': f"Error generating report: {str(e)}"
+        }
+
+
+async def create_invoice_from_sales_async(
+    url: str,
+    db: str,
+    username: str,
+    password: str,
+    sale_order_ids: Optional[List[int]] = None,
+    last_n_orders: Optional[int] = None,
+    partner_id: Optional[int] = None,
+    invoice_date: Optional[str] = None,
+    engine: str = 'lines',
+    bulk: bool = True
+) -> Dict:
+    """Async version of invoice_creation.create_invoice_from_sales."""
+    try:
+        async with AsyncOdooAPIClient(url, db, username, password) as client:
+            await client.authenticate()
+
+            if not await client.check_access_rights('account.move', 'create'):
+                return {
+                    'success': False,
+                    'invoices_created': None,
+                    'summary': None,
+                    'error': f"User '{username}' lacks permission to create invoices"
+                }
+
+            orders = await client.search_read(
+                'sale.order',
+                invoice_creation._build_order_domain(sale_order_ids, partner_id),
+                invoice_creation.ORDER_FIELDS,
+                limit=last_n_orders,
+                order='date_order desc'
+            )
+
+            if not orders:
+                return {
+                    'success': True,
+                    'invoices_created': [],
+                    'summary': {'total_invoices': 0, 'total_amount': 0},
+                    'error': 'No sales orders found matching criteria'
+                }
+
+            created = None
+
+            if engine == 'native':
+                try:
+                    created, failed_orders = await _create_invoices_native(client, orders, invoice_date)
+
+                except invoice_creation.WizardUnavailableError:
+                    # Nothing was invoiced: build the invoices here
+                    pass
+                except OdooRPCError as e:
+                    if not e.is_user_error:
+                        raise
+                    # Odoo refused (e.g. nothing to invoice yet)
+                    created = []
+                    failed_orders = [{'sale_order': order['name'], 'error': e.fault_string} for order in orders]
+
+            if created is None:
+                created, failed_orders = await _create_invoices(client, orders, invoice_date, bulk)
+
+            invoice_data = {}
+            if created:
+                invoice_data = {
+                    invoice['id']: invoice
+                    for invoice in await client.read(
+                        'account.move',
+                        [invoice_id for _order, invoice_id in created],
+                        invoice_creation.INVOICE_FIELDS
+                    )
+                }
+
+        invoices_created = []
+        for order, invoice_id in created:
+            if invoice_id not in invoice_data:
+                failed_orders.append({'sale_order': order['name'], 'error': f'Invoice {invoice_id} could not be read'})
+                continue
+
+            invoices_created.append(invoice_creation._format_invoice(order, invoice_id, invoice_data[invoice_id]))
+
+        summary = {
+            'total_invoices': len(invoices_created),
+            'total_amount': sum(invoice['amount'] for invoice in invoices_created),
+            'source_orders': len(orders),
+            'failed_orders': failed_orders
+        }
+
+        return {
+            'success': True,
+            'invoices_created': invoices_created,
+            'summary': summary,
+            'error': None
+        }
+
+    except PermissionError as e:
+        return {
+            'success': False,
+            'invoices_created': None,
+            'summary': None,
+            'error': str(e)
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'invoices_created': None,
+            'summary': None,
+            'error': f"Error creating invoices: {str(e)}"
+        }
+
+
+async def suggest_tax_deductions_async(
+    url: str,
+    db: str,
+    username: str,
+    password: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    include_categories: Optional[List[str]] = None,
+    max_detailed_rows: Optional[int] = tax_deductions.MAX_DETAILED_ROWS
+) -> Dict:
+    """Async version of tax_deductions.suggest_tax_deductions."""
+    try:
+        date_from, date_to = tax_deductions._default_period(date_from, date_to)
+
+        async with AsyncOdooAPIClient(url, db, username, password) as client:
+            await client.authenticate()
+
+            if not await client.check_access_rights('account.move.line', 'read'):
+                return {
+                    'success': False,
+                    'deductible_expenses': None,
+                    'summary': None,
+                    'error': f"User '{username}' lacks permission to read accounting entries"
+                }
+
+            # Stream all move lines of the period through the categorizer
+            totals = tax_deductions.DeductionTotals(include_categories, max_detailed_rows)
+            async for page in client.search_read_paged(
+                'account.move.line',
+                tax_deductions._build_expense_domain(date_from, date_to, min_amount),
+                tax_deductions.MOVE_LINE_FIELDS,
+                page_size=tax_deductions.MOVE_LINE_PAGE_SIZE
+            ):
+                totals.add(page)
+
+        tax_deductions.CATEGORY_CACHE.save()
+
+        return totals.result(date_from, date_to)
+
+    except PermissionError as e:
+        return {
+            'success': False,
+            'deductible_expenses': None,
+            'summary': None,
+            'error': str(e)
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'deductible_expenses': None,
+            'summary': None,
+            'error': f"Error analyzing deductions: {str(e)}"
+        }
+
+
+async def summarize_quotations_async(
+    url: str,
+    db: str,
+    username: str,
+    password: str,
+    days_ahead: Optional[int] = 7,
+    min_amount: Optional[float] = None,
+    salesperson_id: Optional[int] = None,
+    include_activities: bool = True,
+    mode: str = 'detailed',
+    top_n: int = quotation_summary.BUCKET_TOP_N
+) -> Dict:
+    """Async version of quotation_summary.summarize_quotations."""
+    try:
+        async with AsyncOdooAPIClient(url, db, username, password) as client:
+            await client.authenticate()
+
+            if not await client.check_access_rights('sale.order', 'read'):
+                return {
+                    'success': False,
+                    'quotations': None,
+                    'summary': None,
+                    'error': f"User '{username}' lacks permission to read quotations"
+                }
+
+            if mode == 'buckets':
+                level_calls = quotation_summary._bucket_calls(min_amount, salesperson_id, top_n)
+                results = await asyncio.gather(*(
+                    client.execute_kw(*call)
+                    for _level, group_call, rows_call in level_calls
+                    for call in (group_call, rows_call)
+                ), return_exceptions=True)
+
+                errors = [result for result in results if isinstance(result, Exception)]
+                for error in errors:
+                    if isinstance(error, PermissionError):
+                        raise error
+
+                if not errors:
+                    levels = [level for level, _group_call, _rows_call in level_calls]
+                    groups_by_level = dict(zip(levels, results[0::2]))
+                    rows_by_level = dict(zip(levels, results[1::2]))
+
+                    activities_by_quote = {}
+                    if include_activities:
+                        activities_by_quote = await _load_activities(
+                            client,
+                            [quote['id'] for rows in rows_by_level.values() for quote in rows],
+                            days_ahead
+                        )
+
+                    return quotation_summary._build_bucket_summary(
+                        groups_by_level, rows_by_level, activities_by_quote, days_ahead
+                    )
+                # Grouped query not supported here: analyze every quotation
+
+            quotations = await client.search_read(
+                'sale.order',
+                quotation_summary._build_quotation_domain(min_amount, salesperson_id),
+                quotation_summary.QUOTATION_FIELDS,
+                order='validity_date asc'
+            )
+
+            if not quotations:
+                return {
+                    'success': True,
+                    'quotations': [],
+                    'summary': {'total_quotations': 0, 'total_amount': 0},
+                    'error': 'No quotations found'
+                }
+
+            # Activities due within the window, for all quotations at once
+            activities_by_quote = {}
+            if include_activities:
+                activities_by_quote = await _load_activities(client, [quote['id'] for quote in quotations], days_ahead)
+
+        analyzed_quotations = [
+            quotation_summary._analyze_quotation(quote, activities_by_quote.get(quote['id'], []), days_ahead)
+            for quote in quotations
+        ]
+        total_amount = sum(quote['amount_total'] for quote in quotations)
+
+        summary = quotation_summary._summarize_quotations(analyzed_quotations, total_amount, days_ahead)
+
+        return {
+            'success': True,
+            'quotations': analyzed_quotations,
+            'summary': summary,
+            'error': None
+        }
+
+    except PermissionError as e:
+        return {
+            'success': False,
+            'quotations': None,
+            'summary': None,
+            'error': str(e)
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'quotations': None,
+            'summary': None,
+            'error': f"Error analyzing quotations: {str(e)}"
+        }
+
+
+async def detect_restock_needs_async(
+    url: str,
+    db: str,
+    username: str,
+    password: str,
+    warehouse_id: Optional[int] = None,
+    category_ids: Optional[List[int]] = None,
+    days_for_velocity: int = 30,
+    include_forecasted: bool = True
+) -> Dict:
+    """Async version of inventory_restock.detect_restock_needs."""
+    try:
+        async with AsyncOdooAPIClient(url, db, username, password) as client:
+            await client.authenticate()
+
+            if not await client.check_access_rights('product.product', 'read'):
+                return {
+                    'success': False,
+                    'products_to_restock': None,
+                    'summary': None,
+                    'error': f"User '{username}' lacks permission to read products"
+                }
+
+            products_to_restock = []
+            total_products = 0
+
+            async for products in client.search_read_paged(
+                'product.product',
+                inventory_restock._build_product_domain(category_ids),
+                inventory_restock.PRODUCT_FIELDS,
+                page_size=inventory_restock.PRODUCT_PAGE_SIZE
+            ):
+                product_ids = [p['id'] for p in products]
+
+                # Stock, reordering rules, velocity and suppliers are independent
+                stock_levels, orderpoints, velocity, suppliers = await asyncio.gather(
+                    _load_stock_quantities(client, product_ids),
+                    _load_orderpoints(client, product_ids, warehouse_id),
+                    _load_sales_velocity(client, product_ids, days_for_velocity),
+                    _load_supplier_info(client, products)
+                )
+
+                prefetched = {
+                    'orderpoints': orderpoints,
+                    'velocity': velocity,
+                    'suppliers': suppliers,
+                }
+
+                total_products += len(products)
+                products_to_restock.extend(inventory_restock._analyze_page(
+                    products, stock_levels, prefetched, include_forecasted
+                ))
+
+        if not total_products:
+            return {
+                'success': True,
+                'products_to_restock': [],
+                'summary': {'total_products': 0},
+                'error': 'No products found'
+            }
+
+        summary = inventory_restock._summarize_restock(products_to_restock, total_products, warehouse_id)
+
+        return {
+            'success': True,
+            'data': {
+                'products': products_to_restock,
+                'summary': summary
+            },
+            'summary': summary,
+            'error': None
+        }
+
+    except PermissionError as e:
+        return {
+            'success': False,
+            'data': None,
+            'summary': None,
+            'error': str(e)
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'data': None,
+            'summary': None,
+            'error': f"Error detecting restock needs: {str(e)}"
+        }
+
+
+async def _create_invoices_native(
+    client: AsyncOdooAPIClient,
+    orders: List[Dict],
+    invoice_date: Optional[str] = None
+) -> tuple:
+    """Async version of invoice_creation._create_invoices_native."""
+    context = invoice_creation._native_context(orders)
+
+    try:
+        wizard_id = await client.execute_kw(*invoice_creation._wizard_create_call(context))
+    except PermissionError:
+        raise
+    except Exception as e:
+        if invoice_creation._is_user_error(e):
+            raise
+        raise invoice_creation.WizardUnavailableError(str(e)) from e
+
+    try:
+        await client.execute_kw(invoice_creation.INVOICE_WIZARD, 'create_invoices', [[wizard_id]], {'context': context})
+    except PermissionError:
+        raise
+    except Exception as e:
+        if invoice_creation._is_user_error(e):
+            raise
+        raise invoice_creation.NativeInvoicingError(invoice_creation._interrupted_message(e)) from e
+
+    try:
+        invoiced = await client.read('sale.order', context['active_ids'], ['invoice_ids'])
+        created, failed_orders = invoice_creation._match_native_invoices(
+            orders,
+            {order['id']: order['invoice_ids'] for order in invoiced}
+        )
+
+        if invoice_date and created:
+            await client.write(
+                'account.move',
+                [invoice_id for _order, invoice_id in created],
+                {'invoice_date': invoice_date}
+            )
+    except Exception as e:
+        raise invoice_creation.NativeInvoicingError(invoice_creation._interrupted_message(e)) from e
+
+    return created, failed_orders
+
+
+async def _create_invoices(
+    client: AsyncOdooAPIClient,
+    orders: List[Dict],
+    invoice_date: Optional[str] = None,
+    bulk: bool = True
+) -> tuple:
+    """Async version of invoice_creation._load_order_lines + _create_invoices."""
+    # Lines of all orders, in chunks read concurrently
+    lines_by_order = invoice_creation._index_order_lines(
+        await _gather_calls(client, invoice_creation._order_line_calls(orders))
+    )
+    pending = invoice_creation._pending_invoices(orders, lines_by_order, invoice_date)
+
+    if bulk and len(pending) > 1:
+        try:
+            invoice_ids = await client.create_many(
+                'account.move',
+                [invoice_vals for _order, invoice_vals in pending]
+            )
+            return [(order, invoice_id) for (order, _vals), invoice_id in zip(pending, invoice_ids)], []
+        except PermissionError:
+            raise
+        except Exception:
+            # Nothing was created: retry order by order
+            pass
+
+    failed_orders = []
+
+    async def create_one(order, invoice_vals):
+        try:
+            return order, await client.create('account.move', invoice_vals)
+        except Exception as e:
+            failed_orders.append({'sale_order': order['name'], 'error': str(e)})
+            return order, None
+
+    results = await asyncio.gather(*(create_one(order, vals) for order, vals in pending))
+    created = [(order, invoice_id) for order, invoice_id in results if invoice_id]
+
+    return created, failed_orders
+
+
+async def _load_activities(
+    client: AsyncOdooAPIClient,
+    quotation_ids: List[int],
+    days_ahead: int
+) -> Dict[int, List[Dict]]:
+    """Async version of quotation_summary._load_activities."""
+    chunks = await _gather_calls(client, quotation_summary._activity_calls(quotation_ids, days_ahead))
+
+    return quotation_summary._index_activities(activity for activities in chunks for activity in activities)
+
+
+async def _load_stock_quantities(client: AsyncOdooAPIClient, product_ids: List[int]) -> Dict[int, float]:
+    """Async version of inventory_restock._load_stock_quantities."""
+    return inventory_restock._index_stock_quantities(
+        await _gather_calls(client, inventory_restock._stock_quantity_calls(product_ids))
+    )
+
+
+async def _load_orderpoints(
+    client: AsyncOdooAPIClient,
+    product_ids: List[int],
+    warehouse_id: Optional[int]
+) -> Dict[int, Dict]:
+    """Async version of inventory_restock._load_orderpoints."""
+    try:
+        results = await _gather_calls(client, inventory_restock._orderpoint_calls(product_ids, warehouse_id))
+    except Exception:
+        # Model might not be accessible
+        return {}
+
+    return inventory_restock._index_orderpoints(results)
+
+
+async def _load_sales_velocity(
+    client: AsyncOdooAPIClient,
+    product_ids: List[int],
+    days: int
+) -> Dict[int, float]:
+    """Async version of inventory_restock._load_sales_velocity."""
+    if days <= 0:
+        return {}
+
+    try:
+        results = await _gather_calls(client, inventory_restock._sales_velocity_calls(product_ids, days))
+    except Exception:
+        return {}
+
+    return inventory_restock._index_sales_velocity(results, days)
+
+
+async def _load_supplier_info(client: AsyncOdooAPIClient, products: List[Dict]) -> Dict[int, Dict]:
+    """Async version of inventory_restock._load_supplier_info."""
+    first_seller = inventory_restock._first_sellers(products)
+
+    if not first_seller:
+        return {}
+
+    try:
+        results = await _gather_calls(client, inventory_restock._supplier_calls(first_seller))
+    except Exception:
+        return {}
+
+    return inventory_restock._index_supplier_info(first_seller, results)
+
+
+async def _gather_calls(client: AsyncOdooAPIClient, calls: List[tuple]) -> List:
+    """Run independent execute_kw calls concurrently, results in call order."""
+    return await asyncio.gather(*(client.execute_kw(*call) for call in calls))
+
+
+# Async tool function mapping (same keys as TOOL_FUNCTIONS)
+ASYNC_TOOL_FUNCTIONS = {
+    'generate_sales_report': generate_sales_report_async,
+    'create_invoice_from_sales': create_invoice_from_sales_async,
+    'suggest_tax_deductions': suggest_tax_deductions_async,
+    'summarize_quotations': summarize_quotations_async,
+    'detect_restock_needs': detect_restock_needs_async,
+}
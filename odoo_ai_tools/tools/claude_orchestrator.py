@@ -5,9 +5,9 @@ Claude Orchestrator
 Orchestrates Claude AI with Odoo tools using Anthropic's tool calling API.
 """
 
-import json
 import os
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Any
 
 try:
     import anthropic
@@ -19,6 +19,12 @@ from .invoice_creation import create_invoice_from_sales, INVOICE_CREATION_TOOL
 from .tax_deductions import suggest_tax_deductions, TAX_DEDUCTIONS_TOOL
 from .quotation_summary import summarize_quotations, QUOTATION_SUMMARY_TOOL
 from .inventory_restock import detect_restock_needs, INVENTORY_RESTOCK_TOOL
+from .tool_cache import ToolResultCache, TOOL_RESULT_CACHE, CREDENTIAL_KEYS
+from .context_window import ConversationWindow, CONVERSATION_WINDOW
+from .result_compaction import (
+    ResultStore, compact_result, fetch_tool_result,
+    FETCH_TOOL_NAME, FETCH_TOOL_RESULT_TOOL, RESULT_BUDGET_BYTES,
+)
 
 
 # Tool function mapping
@@ -30,6 +36,9 @@ TOOL_FUNCTIONS = {
     'detect_restock_needs': detect_restock_needs,
 }
 
+# Max tool calls of a single Claude turn executed at once
+MAX_PARALLEL_TOOLS = 4
+
 # All tools for Claude
 ALL_TOOLS = [
     SALES_REPORT_TOOL,
@@ -39,6 +48,26 @@ ALL_TOOLS = [
     INVENTORY_RESTOCK_TOOL,
 ]
 
+# Tools offered to Claude: the Odoo tools plus paging of truncated results
+ORCHESTRATOR_TOOLS = ALL_TOOLS + [FETCH_TOOL_RESULT_TOOL]
+
+# Prompt cache breakpoint (cached prefixes live ~5 minutes)
+CACHE_CONTROL = {'type': 'ephemeral'}
+
+# Same tools with a breakpoint on the last one, so the tool definitions
+# are cached as a prefix of every request
+CACHED_TOOLS = ORCHESTRATOR_TOOLS[:-1] + [
+    dict(ORCHESTRATOR_TOOLS[-1], cache_control=CACHE_CONTROL)
+]
+
+# Token counters reported by the Messages API usage
+USAGE_FIELDS = (
+    'input_tokens',
+    'output_tokens',
+    'cache_creation_input_tokens',
+    'cache_read_input_tokens',
+)
+
 
 class ClaudeOrchestrator:
     """
@@ -55,7 +84,14 @@ class ClaudeOrchestrator:
         odoo_db: str,
         odoo_username: str,
         odoo_password: str,
-        model: str = "claude-sonnet-4-20250514"
+        model: str = "claude-sonnet-4-20250514",
+        max_parallel_tools: int = MAX_PARALLEL_TOOLS,
+        cache: Optional[ToolResultCache] = TOOL_RESULT_CACHE,
+        result_budget: Optional[int] = None,
+        result_format: str = 'columnar',
+        prompt_caching: bool = True,
+        client: Optional[Any] = None,
+        context_window: Optional[ConversationWindow] = CONVERSATION_WINDOW
     ):
         """
         Initialize Claude orchestrator.
@@ -67,15 +103,36 @@ class ClaudeOrchestrator:
             odoo_username (str): Odoo user login
             odoo_password (str): Odoo user password
             model (str): Claude model to use
+            max_parallel_tools (int): Max tool calls of one turn run concurrently
+            cache (ToolResultCache, optional): Tool result cache (None disables caching)
+            result_budget (int, optional): Max bytes of a tool result sent to
+                Claude (default: per-tool budgets of result_compaction)
+            result_format (str): Encoding of truncated result rows,
+                'columnar' or 'csv'
+            prompt_caching (bool): Cache the tool definitions and the
+                conversation prefix between requests
+            client (anthropic.Anthropic, optional): Client to use instead of
+                creating one (see orchestrator_registry)
+            context_window (ConversationWindow, optional): Bounds the history
+                sent per request (None sends the whole history)
         """
-        if not anthropic:
+        if not anthropic and client is None:
             raise ImportError(
                 "anthropic package not installed. "
                 "Install with: pip install anthropic"
             )
 
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = client or anthropic.Anthropic(api_key=api_key)
         self.model = model
+        self.max_parallel_tools = max(1, max_parallel_tools)
+        self.cache = cache
+        self.result_budget = result_budget
+        self.result_format = result_format
+        self.prompt_caching = prompt_caching
+        self.context_window = context_window
+
+        # Full results of tool calls that were truncated for Claude
+        self.result_store = ResultStore()
 
         # Odoo credentials (will be passed to tools)
         self.odoo_credentials = {
@@ -103,10 +160,60 @@ class ClaudeOrchestrator:
             dict: {
                 'response': str,  # Claude's final response
                 'tools_used': list[dict],  # Tools that were called
+                'usage': dict,  # Token usage, per turn and total
                 'success': bool,
                 'error': str or None
             }
         """
+        for event in self._run(user_message, max_turns, stream=False):
+            if event['type'] == 'done':
+                return {key: value for key, value in event.items() if key != 'type'}
+
+    def stream_message(
+        self,
+        user_message: str,
+        max_turns: int = 5
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Process a user message through Claude, yielding progress events.
+
+        Claude's text is yielded as it is generated, so the first words show
+        up about a second after the request instead of after the last tool.
+
+        Args:
+            user_message (str): User's natural language query
+            max_turns (int): Maximum conversation turns (prevents infinite loops)
+
+        Yields:
+            dict: One of
+                {'type': 'text_delta', 'text': str}
+                {'type': 'tool_start', 'id': str, 'tool': str, 'input': dict}
+                {'type': 'tool_end', 'id': str, 'tool': str, 'success': bool, 'error': str or None}
+                {'type': 'done', ...}  # last event, same keys as process_message
+        """
+        return self._run(user_message, max_turns, stream=True)
+
+    def _run(
+        self,
+        user_message: str,
+        max_turns: int,
+        stream: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Conversation loop shared by process_message and stream_message.
+
+        Args:
+            user_message (str): User's natural language query
+            max_turns (int): Maximum conversation turns
+            stream (bool): Use the streaming Messages API and yield text deltas
+
+        Yields:
+            dict: Events documented in stream_message, ending with 'done'
+        """
+        usage_turns = []
+        history_length = len(self.conversation_history)
+        answered = False
+
         try:
             # Add user message to history
             self.conversation_history.append({
@@ -121,12 +228,21 @@ class ClaudeOrchestrator:
                 turn_count += 1
 
                 # Call Claude with tools
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=4096,
-                    tools=ALL_TOOLS,
-                    messages=self.conversation_history
-                )
+                request = {
+                    'model': self.model,
+                    'max_tokens': 4096,
+                    'tools': CACHED_TOOLS if self.prompt_caching else ORCHESTRATOR_TOOLS,
+                    'messages': self._request_messages(),
+                }
+                if stream:
+                    with self.client.messages.stream(**request) as message_stream:
+                        for event in message_stream:
+                            if event.type == 'text':
+                                yield {'type': 'text_delta', 'text': event.text}
+                        response = message_stream.get_final_message()
+                else:
+                    response = self.client.messages.create(**request)
+                usage_turns.append(self._turn_usage(response))
 
                 # Add assistant response to history
                 self.conversation_history.append({
@@ -143,26 +259,47 @@ class ClaudeOrchestrator:
                 if not tool_use_blocks:
                     # Claude provided final answer
                     final_text = self._extract_text_response(response.content)
+                    answered = True
 
-                    return {
+                    yield {
+                        'type': 'done',
                         'response': final_text,
                         'tools_used': tools_used,
+                        'usage': self._total_usage(usage_turns),
                         'success': True,
                         'error': None
                     }
+                    return
 
                 # Process tool calls
                 tool_results = []
 
                 for tool_block in tool_use_blocks:
+                    yield {
+                        'type': 'tool_start',
+                        'id': tool_block.id,
+                        'tool': tool_block.name,
+                        'input': dict(tool_block.input)
+                    }
+
+                    # Add Odoo credentials to Odoo tool input
+                    if tool_block.name in TOOL_FUNCTIONS:
+                        tool_block.input.update(self.odoo_credentials)
+
+                # Execute tools (independent calls run concurrently)
+                results = self._execute_tools(tool_use_blocks)
+
+                for tool_block, tool_result in zip(tool_use_blocks, results):
                     tool_name = tool_block.name
                     tool_input = tool_block.input
 
-                    # Add Odoo credentials to tool input
-                    tool_input.update(self.odoo_credentials)
-
-                    # Execute tool
-                    tool_result = self._execute_tool(tool_name, tool_input)
+                    yield {
+                        'type': 'tool_end',
+                        'id': tool_block.id,
+                        'tool': tool_name,
+                        'success': bool(tool_result.get('success')),
+                        'error': tool_result.get('error')
+                    }
 
                     # Record tool usage
                     tools_used.append({
@@ -171,11 +308,18 @@ class ClaudeOrchestrator:
                         'result': tool_result
                     })
 
-                    # Prepare result for Claude
+                    # Prepare result for Claude (large results are truncated
+                    # to the tool's budget, the full result stays in the store)
                     tool_results.append({
                         "type": "tool_result",
                         "tool_use_id": tool_block.id,
-                        "content": json.dumps(tool_result, ensure_ascii=False)
+                        "content": compact_result(
+                            tool_name,
+                            tool_result,
+                            store=self.result_store,
+                            budget=self.result_budget,
+                            fmt=self.result_format
+                        )
                     })
 
                 # Add tool results to conversation
@@ -185,21 +329,135 @@ class ClaudeOrchestrator:
                 })
 
             # Max turns reached
-            return {
+            answered = True
+            yield {
+                'type': 'done',
                 'response': "I've reached the maximum number of conversation turns. Please try rephrasing your question.",
                 'tools_used': tools_used,
+                'usage': self._total_usage(usage_turns),
                 'success': False,
                 'error': 'Max conversation turns reached'
             }
 
+        except GeneratorExit:
+            # Stream closed before the answer (e.g. client disconnected):
+            # drop the unfinished exchange as well
+            if not answered:
+                del self.conversation_history[history_length:]
+            raise
+
         except Exception as e:
-            return {
+            # Drop the failed exchange, so the history stays valid for the
+            # next message (e.g. no tool_use left without its tool_result)
+            del self.conversation_history[history_length:]
+
+            yield {
+                'type': 'done',
                 'response': f"Error processing message: {str(e)}",
                 'tools_used': [],
+                'usage': self._total_usage(usage_turns),
                 'success': False,
                 'error': str(e)
             }
 
+    def _request_messages(self) -> List[Dict]:
+        """
+        Messages of the next request.
+
+        With prompt caching, the last content block gets a cache breakpoint:
+        the whole conversation so far is written to the cache and the next
+        request (which only appends to it) reads it back. The history itself
+        is left untouched, so earlier breakpoints do not pile up.
+
+        The context window (if any) first trims older exchanges, so the size
+        of a request stays bounded over long conversations.
+
+        Returns:
+            list[dict]: Conversation history to send
+        """
+        messages = self.conversation_history
+        if self.context_window:
+            messages = self.context_window.apply(messages)
+
+        if not self.prompt_caching or not messages:
+            return messages
+
+        last = messages[-1]
+        content = last['content']
+        if isinstance(content, str):
+            content = [{'type': 'text', 'text': content}]
+        if not content:
+            return messages
+
+        blocks = list(content)
+        block = blocks[-1]
+        if hasattr(block, 'model_dump'):
+            block = block.model_dump(exclude_none=True)
+        blocks[-1] = dict(block, cache_control=CACHE_CONTROL)
+
+        return messages[:-1] + [dict(last, content=blocks)]
+
+    def _turn_usage(self, response) -> Dict[str, int]:
+        """
+        Token usage of one Claude response.
+
+        Args:
+            response: Messages API response
+
+        Returns:
+            dict: USAGE_FIELDS counters (0 when not reported)
+        """
+        usage = getattr(response, 'usage', None)
+        return {
+            field: getattr(usage, field, None) or 0
+            for field in USAGE_FIELDS
+        }
+
+    def _total_usage(self, usage_turns: List[Dict]) -> Dict[str, Any]:
+        """
+        Token usage of a process_message call.
+
+        Args:
+            usage_turns (list[dict]): Usage of each Claude response
+
+        Returns:
+            dict: USAGE_FIELDS totals, plus 'turns' with the per-turn usage
+        """
+        totals = {
+            field: sum(turn[field] for turn in usage_turns)
+            for field in USAGE_FIELDS
+        }
+        totals['turns'] = usage_turns
+        return totals
+
+    def _execute_tools(self, tool_use_blocks: List) -> List[Dict]:
+        """
+        Execute the tool calls of one Claude turn.
+
+        Calls run on a thread pool bounded by ``max_parallel_tools``, so a
+        turn takes about as long as its slowest tool. Results are returned
+        in the order of ``tool_use_blocks``; a failing tool only affects
+        its own result.
+
+        Args:
+            tool_use_blocks (list): tool_use content blocks
+
+        Returns:
+            list[dict]: Tool execution results
+        """
+        if len(tool_use_blocks) <= 1 or self.max_parallel_tools == 1:
+            return [
+                self._execute_tool(block.name, block.input)
+                for block in tool_use_blocks
+            ]
+
+        workers = min(self.max_parallel_tools, len(tool_use_blocks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda block: self._execute_tool(block.name, block.input),
+                tool_use_blocks
+            ))
+
     def _execute_tool(self, tool_name: str, tool_input: Dict) -> Dict:
         """
         Execute a tool function.
@@ -212,15 +470,34 @@ class ClaudeOrchestrator:
             dict: Tool execution result
         """
         try:
+            if tool_name == FETCH_TOOL_NAME:
+                return fetch_tool_result(
+                    self.result_store,
+                    budget=self.result_budget or RESULT_BUDGET_BYTES,
+                    fmt=self.result_format,
+                    **tool_input
+                )
+
             if tool_name not in TOOL_FUNCTIONS:
                 return {
                     'success': False,
                     'error': f"Unknown tool: {tool_name}"
                 }
 
+            if self.cache:
+                cached = self.cache.get(tool_name, tool_input)
+                if cached is not None:
+                    return cached
+                # Taken before the call: concurrent tools may invalidate it
+                generation = self.cache.generation(tool_input)
+
             tool_function = TOOL_FUNCTIONS[tool_name]
             result = tool_function(**tool_input)
 
+            if self.cache:
+                self.cache.put(tool_name, tool_input, result, generation=generation)
+                self.cache.invalidate_after(tool_name, tool_input)
+
             return result
 
         except Exception as e:
@@ -250,6 +527,56 @@ class ClaudeOrchestrator:
     def reset_conversation(self):
         """Reset conversation history."""
         self.conversation_history = []
+        self.result_store.clear()
+
+    def export_history(self, start: int = 0) -> List[Dict]:
+        """
+        Conversation history as JSON-serializable messages.
+
+        Content blocks are plain dicts, tool results are the compacted
+        content Claude saw, and Odoo credentials are removed from tool inputs.
+
+        Args:
+            start (int): Index of the first message to export
+
+        Returns:
+            list[dict]: Messages ({'role': str, 'content': str or list[dict]})
+        """
+        messages = []
+
+        for message in self.conversation_history[start:]:
+            content = message['content']
+            if not isinstance(content, str):
+                content = [self._export_block(block) for block in content]
+            messages.append({'role': message['role'], 'content': content})
+
+        return messages
+
+    def load_history(self, messages: List[Dict]):
+        """
+        Replace the conversation history (e.g. with stored messages).
+
+        Args:
+            messages (list[dict]): Messages as returned by export_history
+        """
+        self.conversation_history = [
+            {'role': message['role'], 'content': message['content']}
+            for message in messages
+        ]
+
+    def _export_block(self, block) -> Dict:
+        if hasattr(block, 'model_dump'):
+            block = block.model_dump(exclude_none=True)
+        else:
+            block = dict(block)
+
+        if block.get('type') == 'tool_use':
+            block['input'] = {
+                key: value for key, value in block.get('input', {}).items()
+                if key not in CREDENTIAL_KEYS
+            }
+
+        return block
 
 
 def create_orchestrator(
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Conversation Window
+===================
+Bound the conversation history sent to Claude on each request.
+
+The history is split into exchanges (a user question and the tool calls and
+answers that follow it). The last exchanges are sent as is; in older ones
+tool results are replaced by their summary and a note, and when the
+estimated size still exceeds the token ceiling the oldest exchanges are
+dropped. Whole exchanges are kept or dropped, so every tool_use keeps its
+tool_result and the window starts with a user question.
+
+Token counts are estimated locally (~4 characters per token); the stored
+history itself is never modified.
+"""
+
+import json
+from typing import Any, Dict, List
+
+
+# Estimated tokens of history sent per request
+CONTEXT_TOKEN_LIMIT = 50000
+
+# Most recent exchanges sent with their full tool results
+RECENT_EXCHANGES = 2
+
+# Characters per token of the local estimator
+CHARS_PER_TOKEN = 4
+
+# Max characters of an elided tool result (larger summaries are dropped)
+ELIDED_RESULT_MAX_CHARS = 1500
+
+ELIDED_NOTE = 'Earlier tool result omitted to save context; call the tool again if its rows are needed.'
+
+
+def estimate_tokens(value: Any) -> int:
+    """
+    Estimate the tokens of a message, content or content block.
+
+    Args:
+        value: String, SDK content block, or JSON-serializable value
+
+    Returns:
+        int: Estimated tokens
+    """
+    if isinstance(value, str):
+        return len(value) // CHARS_PER_TOKEN + 1
+    if hasattr(value, 'model_dump_json'):
+        return len(value.model_dump_json(exclude_none=True)) // CHARS_PER_TOKEN + 1
+    if isinstance(value, dict):
+        return sum(estimate_tokens(item) for item in value.values()) + len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_tokens(item) for item in value) + 1
+    return 1
+
+
+class ConversationWindow:
+    """Sliding window over a conversation history, under a token ceiling."""
+
+    def __init__(
+        self,
+        max_tokens: int = CONTEXT_TOKEN_LIMIT,
+        recent_exchanges: int = RECENT_EXCHANGES
+    ):
+        """
+        Initialize window.
+
+        Args:
+            max_tokens (int): Estimated tokens of history sent per request
+            recent_exchanges (int): Last exchanges sent with full tool results
+        """
+        self.max_tokens = max_tokens
+        self.recent_exchanges = max(1, recent_exchanges)
+
+    def apply(self, messages: List[Dict]) -> List[Dict]:
+        """
+        Messages of ``messages`` to send to Claude.
+
+        Args:
+            messages (list[dict]): Conversation history (not modified)
+
+        Returns:
+            list[dict]: Windowed messages (``messages`` itself when it fits
+                unchanged)
+        """
+        exchanges = _split_exchanges(messages)
+        recent_start = max(0, len(exchanges) - self.recent_exchanges)
+
+        window = [
+            [_elide_message(message) for message in exchange] if index < recent_start else exchange
+            for index, exchange in enumerate(exchanges)
+        ]
+        tokens = [estimate_tokens(exchange) for exchange in window]
+
+        # Drop the oldest exchanges until the rest fits (keeping the last)
+        dropped = 0
+        total = sum(tokens)
+        while total > self.max_tokens and dropped < len(window) - 1:
+            total -= tokens[dropped]
+            dropped += 1
+        window = window[dropped:]
+
+        # The last exchange alone is too large: elide all but its latest results
+        if total > self.max_tokens:
+            last = window[-1]
+            window[-1] = [_elide_message(message) for message in last[:-1]] + last[-1:]
+
+        if dropped:
+            window[0] = [_with_omitted_note(window[0][0], dropped)] + window[0][1:]
+
+        result = [message for exchange in window for message in exchange]
+        if len(result) == len(messages) and all(a is b for a, b in zip(result, messages)):
+            return messages
+        return result
+
+
+def _split_exchanges(messages: List[Dict]) -> List[List[Dict]]:
+    """Split messages at each user question (user message without tool results)."""
+    exchanges = []
+
+    for message in messages:
+        if not exchanges or _is_question(message):
+            exchanges.append([])
+        exchanges[-1].append(message)
+
+    return exchanges
+
+
+def _is_question(message: Dict) -> bool:
+    if message['role'] != 'user':
+        return False
+    content = message['content']
+    return isinstance(content, str) or not any(
+        _block_type(block) == 'tool_result' for block in content
+    )
+
+
+def _block_type(block) -> str:
+    return block.get('type') if isinstance(block, dict) else getattr(block, 'type', None)
+
+
+def _elide_message(message: Dict) -> Dict:
+    """Replace the tool results of a message by their summaries."""
+    content = message['content']
+    if message['role'] != 'user' or isinstance(content, str):
+        return message
+
+    blocks = [
+        _elide_result(block) if _block_type(block) == 'tool_result' else block
+        for block in content
+    ]
+    if all(a is b for a, b in zip(blocks, content)):
+        return message
+    return dict(message, content=blocks)
+
+
+def _elide_result(block: Dict) -> Dict:
+    """Tool result block with its content reduced to status, summary and reference."""
+    content = block.get('content')
+    if not isinstance(content, str) or len(content) <= ELIDED_RESULT_MAX_CHARS:
+        return block
+
+    try:
+        data = json.loads(content)
+    except ValueError:
+        data = None
+
+    elided = {'elided': True, 'note': ELIDED_NOTE}
+    if isinstance(data, dict):
+        for key in ('success', 'error'):
+            if key in data:
+                elided[key] = data[key]
+
+        nested = data.get('data') if isinstance(data.get('data'), dict) else {}
+        summary = data.get('summary') or nested.get('summary')
+        if summary:
+            elided['summary'] = summary
+
+        truncated = data.get('_truncated') or {}
+        if truncated.get('result_ref'):
+            elided['result_ref'] = truncated['result_ref']
+
+    text = json.dumps(elided, ensure_ascii=False, separators=(',', ':'), default=str)
+    if len(text) > ELIDED_RESULT_MAX_CHARS:
+        elided.pop('summary', None)
+        text = json.dumps(elided, ensure_ascii=False, separators=(',', ':'), default=str)
+
+    return dict(block, content=text)
+
+
+def _with_omitted_note(message: Dict, dropped: int) -> Dict:
+    """First question of the window, noting that earlier exchanges were dropped."""
+    note = f"[{dropped} earlier exchange(s) of this conversation omitted]"
+    content = message['content']
+
+    if isinstance(content, str):
+        return dict(message, content=f"{note}\n\n{content}")
+    return dict(message, content=[{'type': 'text', 'text': note}] + list(content))
+
+
+# Default window of orchestrators (stateless, shared)
+CONVERSATION_WINDOW = ConversationWindow()
@@ -8,9 +8,16 @@ Detect products that need restocking based on inventory levels and sales velocit
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from .odoo_api_client import OdooAPIClient
+from .odoo_api_client import OdooAPIClient, CLIENT_POOL, chunked
 
 
+# Products analyzed per page; bounds memory regardless of catalogue size
+PRODUCT_PAGE_SIZE = 500
+
+PRODUCT_FIELDS = ['name', 'default_code', 'categ_id', 'seller_ids']
+ORDERPOINT_FIELDS = ['product_id', 'product_min_qty', 'product_max_qty', 'qty_multiple']
+SUPPLIER_FIELDS = ['partner_id', 'price', 'min_qty', 'delay']
+
 # Restock urgency levels
 RESTOCK_URGENCY = {
     'critical': {
@@ -73,10 +80,11 @@ def detect_restock_needs(
         "What products should I order before Friday?"
         → analyze with urgency levels
     """
+    client = None
+
     try:
-        # Initialize API client
-        client = OdooAPIClient(url, db, username, password)
-        client.authenticate()
+        # Get a pooled, authenticated API client
+        client = CLIENT_POOL.acquire(url, db, username, password)
 
         # Check permissions
         if not client.check_access_rights('product.product', 'read'):
@@ -87,42 +95,20 @@ def detect_restock_needs(
                 'error': f"User '{username}' lacks permission to read products"
             }
 
-        # Build domain for storable products
-        domain = [
-            ('type', '=', 'product'),  # Storable products only
-            ('active', '=', True)
-        ]
-
-        if category_ids:
-            domain.append(('categ_id', 'in', category_ids))
-
-        # Get products (without computed fields first)
-        products = client.search_read(
-            'product.product',
-            domain,
-            ['name', 'default_code', 'categ_id', 'seller_ids'],
-            limit=500
-        )
-
-        # Get stock quantities separately using stock.quant
-        for product in products:
-            product_id = product['id']
-
-            # Get stock quants for this product
-            quants = client.search_read(
-                'stock.quant',
-                [('product_id', '=', product_id)],
-                ['quantity', 'reserved_quantity']
-            )
-
-            # Calculate available quantity
-            qty_available = sum(q.get('quantity', 0) - q.get('reserved_quantity', 0) for q in quants)
-            total_qty = sum(q.get('quantity', 0) for q in quants)
-
-            product['qty_available'] = qty_available
-            product['virtual_available'] = qty_available  # Simplified for now
-
-        if not products:
+        products_to_restock = []
+        total_products = 0
+
+        for page_count, page_restock in iter_restock_needs(
+            client,
+            warehouse_id=warehouse_id,
+            category_ids=category_ids,
+            days_for_velocity=days_for_velocity,
+            include_forecasted=include_forecasted
+        ):
+            total_products += page_count
+            products_to_restock.extend(page_restock)
+
+        if not total_products:
             return {
                 'success': True,
                 'products_to_restock': [],
@@ -130,44 +116,7 @@ def detect_restock_needs(
                 'error': 'No products found'
             }
 
-        # Analyze each product
-        products_to_restock = []
-
-        for product in products:
-            analysis = _analyze_product_stock(
-                client,
-                product,
-                warehouse_id,
-                days_for_velocity,
-                include_forecasted
-            )
-
-            # Only include if needs restock
-            if analysis and analysis['urgency_level'] != 'normal':
-                products_to_restock.append(analysis)
-
-        # Sort by urgency
-        products_to_restock.sort(key=lambda x: x['urgency_priority'])
-
-        # Calculate summary
-        by_urgency = {}
-        for prod in products_to_restock:
-            urgency = prod['urgency_level']
-            if urgency not in by_urgency:
-                by_urgency[urgency] = {
-                    'count': 0,
-                    'total_qty_needed': 0
-                }
-            by_urgency[urgency]['count'] += 1
-            by_urgency[urgency]['total_qty_needed'] += prod.get('suggested_order_qty', 0)
-
-        summary = {
-            'total_products': len(products),
-            'need_restock': len(products_to_restock),
-            'critical': len([p for p in products_to_restock if p['urgency_level'] == 'critical']),
-            'by_urgency': by_urgency,
-            'warehouse_id': warehouse_id or 'All'
-        }
+        summary = _summarize_restock(products_to_restock, total_products, warehouse_id)
 
         return {
             'success': True,
@@ -193,23 +142,239 @@ def detect_restock_needs(
             'summary': None,
             'error': f"Error detecting restock needs: {str(e)}"
         }
+    finally:
+        CLIENT_POOL.release(client)
 
 
-def _analyze_product_stock(
+def _summarize_restock(
+    products_to_restock: List[Dict],
+    total_products: int,
+    warehouse_id: Optional[int]
+) -> Dict:
+    """
+    Sort restock analyses by urgency (in place) and build the summary.
+
+    Args:
+        products_to_restock (list[dict]): Analyses needing restock
+        total_products (int): Number of products scanned
+        warehouse_id (int, optional): Warehouse ID
+
+    Returns:
+        dict: Summary
+    """
+    # Sort by urgency
+    products_to_restock.sort(key=lambda x: x['urgency_priority'])
+
+    # Calculate summary
+    by_urgency = {}
+    for prod in products_to_restock:
+        urgency = prod['urgency_level']
+        if urgency not in by_urgency:
+            by_urgency[urgency] = {
+                'count': 0,
+                'total_qty_needed': 0
+            }
+        by_urgency[urgency]['count'] += 1
+        by_urgency[urgency]['total_qty_needed'] += prod.get('suggested_order_qty', 0)
+
+    summary = {
+        'total_products': total_products,
+        'need_restock': len(products_to_restock),
+        'critical': len([p for p in products_to_restock if p['urgency_level'] == 'critical']),
+        'by_urgency': by_urgency,
+        'warehouse_id': warehouse_id or 'All'
+    }
+
+    return summary
+
+
+def iter_restock_needs(
     client: OdooAPIClient,
-    product: Dict,
+    warehouse_id: Optional[int] = None,
+    category_ids: Optional[List[int]] = None,
+    days_for_velocity: int = 30,
+    include_forecasted: bool = True,
+    page_size: int = PRODUCT_PAGE_SIZE
+):
+    """
+    Scan all storable products page by page and analyze restock needs.
+
+    Only one page of products (plus its prefetched data) is held in memory
+    at a time, so callers can stream partial results on any catalogue size.
+
+    Args:
+        client (OdooAPIClient): Authenticated API client
+        warehouse_id (int, optional): Filter by warehouse
+        category_ids (list[int], optional): Filter by product categories
+        days_for_velocity (int): Days to calculate sales velocity
+        include_forecasted (bool): Use forecasted quantities
+        page_size (int): Products per page
+
+    Yields:
+        tuple: (number of products scanned in the page,
+                list of analyses for products needing restock)
+    """
+    for products in client.search_read_paged(
+        'product.product',
+        _build_product_domain(category_ids),
+        PRODUCT_FIELDS,
+        page_size=page_size
+    ):
+        # Get stock quantities for the page in bulk
+        stock_levels = _load_stock_quantities(client, [p['id'] for p in products])
+
+        # Prefetch reordering rules, sales velocity and suppliers in bulk
+        prefetched = _prefetch_restock_data(
+            client,
+            products,
+            warehouse_id,
+            days_for_velocity
+        )
+
+        yield len(products), _analyze_page(products, stock_levels, prefetched, include_forecasted)
+
+
+def _build_product_domain(category_ids: Optional[List[int]]) -> List:
+    """Build the product.product domain for active storable products."""
+    domain = [
+        ('type', '=', 'product'),  # Storable products only
+        ('active', '=', True)
+    ]
+
+    if category_ids:
+        domain.append(('categ_id', 'in', category_ids))
+
+    return domain
+
+
+def _analyze_page(
+    products: List[Dict],
+    stock_levels: Dict[int, float],
+    prefetched: Dict[str, Dict],
+    include_forecasted: bool
+) -> List[Dict]:
+    """
+    Analyze one page of products from prefetched data.
+
+    Args:
+        products (list[dict]): Product data
+        stock_levels (dict): {product_id: available quantity}
+        prefetched (dict): Lookups from _prefetch_restock_data
+        include_forecasted (bool): Use forecasted quantities
+
+    Returns:
+        list[dict]: Analyses of products needing restock
+    """
+    page_restock = []
+
+    for product in products:
+        qty_available = stock_levels.get(product['id'], 0)
+
+        product['qty_available'] = qty_available
+        product['virtual_available'] = qty_available  # Simplified for now
+
+        analysis = _analyze_product_stock(
+            product,
+            prefetched,
+            include_forecasted
+        )
+
+        # Only include if needs restock
+        if analysis and analysis['urgency_level'] != 'normal':
+            page_restock.append(analysis)
+
+    return page_restock
+
+
+def _load_stock_quantities(client: OdooAPIClient, product_ids: List[int]) -> Dict[int, float]:
+    """
+    Load available stock (on hand minus reserved) for many products at once.
+
+    Quants are aggregated server-side with read_group, one call per chunk
+    of product IDs, instead of one search_read per product.
+
+    Args:
+        client (OdooAPIClient): Authenticated API client
+        product_ids (list[int]): Product IDs
+
+    Returns:
+        dict: {product_id: available quantity}; products without quants are omitted
+    """
+    return _index_stock_quantities([
+        client.execute_kw(*call) for call in _stock_quantity_calls(product_ids)
+    ])
+
+
+def _stock_quantity_calls(product_ids: List[int]) -> List[tuple]:
+    """Build the execute_kw calls (model, method, args, kwargs) of _load_stock_quantities."""
+    return [
+        (
+            'stock.quant',
+            'read_group',
+            [[('product_id', 'in', ids)], ['quantity:sum', 'reserved_quantity:sum'], ['product_id']],
+            {'lazy': False}
+        )
+        for ids in chunked(product_ids)
+    ]
+
+
+def _index_stock_quantities(results: List[List[Dict]]) -> Dict[int, float]:
+    """Sum available quantities per product from the stock.quant groups of each chunk."""
+    stock_levels = {}
+
+    for groups in results:
+        for group in groups:
+            if not group.get('product_id'):
+                continue
+            product_id = group['product_id'][0]
+            available = (group.get('quantity') or 0) - (group.get('reserved_quantity') or 0)
+            stock_levels[product_id] = stock_levels.get(product_id, 0) + available
+
+    return stock_levels
+
+
+def _prefetch_restock_data(
+    client: OdooAPIClient,
+    products: List[Dict],
     warehouse_id: Optional[int],
-    days_for_velocity: int,
+    days_for_velocity: int
+) -> Dict[str, Dict]:
+    """
+    Load everything the per-product analysis needs in batched calls.
+
+    Args:
+        client (OdooAPIClient): Authenticated API client
+        products (list[dict]): Product data
+        warehouse_id (int, optional): Warehouse ID
+        days_for_velocity (int): Days for velocity calculation
+
+    Returns:
+        dict: {
+            'orderpoints': {product_id: dict},
+            'velocity': {product_id: float},
+            'suppliers': {product_id: dict}
+        }
+    """
+    product_ids = [p['id'] for p in products]
+
+    return {
+        'orderpoints': _load_orderpoints(client, product_ids, warehouse_id),
+        'velocity': _load_sales_velocity(client, product_ids, days_for_velocity),
+        'suppliers': _load_supplier_info(client, products),
+    }
+
+
+def _analyze_product_stock(
+    product: Dict,
+    prefetched: Dict[str, Dict],
     include_forecasted: bool
 ) -> Optional[Dict]:
     """
     Analyze a product's stock level and determine restock needs.
 
     Args:
-        client (OdooAPIClient): Authenticated API client
         product (dict): Product data
-        warehouse_id (int, optional): Warehouse ID
-        days_for_velocity (int): Days for velocity calculation
+        prefetched (dict): Lookups from _prefetch_restock_data
         include_forecasted (bool): Use forecasted quantities
 
     Returns:
@@ -221,38 +386,19 @@ def _analyze_product_stock(
 
     current_qty = virtual_available if include_forecasted else qty_available
 
-    # Get reordering rules (minimum stock levels)
-    reorder_domain = [('product_id', '=', product_id)]
-    if warehouse_id:
-        reorder_domain.append(('warehouse_id', '=', warehouse_id))
-
-    try:
-        reorder_rules = client.search_read(
-            'stock.warehouse.orderpoint',
-            reorder_domain,
-            ['product_min_qty', 'product_max_qty', 'qty_multiple']
-        )
-    except:
-        # Model might not be accessible
-        reorder_rules = []
-
-    # Determine minimum quantity
+    # Determine minimum quantity from the reordering rule, if any
     min_qty = 0
     max_qty = 0
     qty_multiple = 1
 
-    if reorder_rules:
-        rule = reorder_rules[0]
+    rule = prefetched['orderpoints'].get(product_id)
+    if rule:
         min_qty = rule.get('product_min_qty', 0)
         max_qty = rule.get('product_max_qty', 0)
         qty_multiple = rule.get('qty_multiple', 1)
 
-    # Calculate sales velocity (last N days)
-    sales_velocity = _calculate_sales_velocity(
-        client,
-        product_id,
-        days_for_velocity
-    )
+    # Sales velocity (last N days)
+    sales_velocity = prefetched['velocity'].get(product_id, 0.0)
 
     # Determine urgency
     urgency_level = 'normal'
@@ -283,8 +429,8 @@ def _analyze_product_stock(
         if qty_multiple > 1:
             suggested_order_qty = ((suggested_order_qty // qty_multiple) + 1) * qty_multiple
 
-    # Get supplier info
-    supplier_info = _get_supplier_info(client, product)
+    # Supplier info
+    supplier_info = prefetched['suppliers'].get(product_id)
 
     # Build analysis
     analysis = {
@@ -309,81 +455,178 @@ def _analyze_product_stock(
     return analysis
 
 
-def _calculate_sales_velocity(
+def _load_orderpoints(
+    client: OdooAPIClient,
+    product_ids: List[int],
+    warehouse_id: Optional[int]
+) -> Dict[int, Dict]:
+    """
+    Load the first reordering rule of each product.
+
+    Args:
+        client (OdooAPIClient): Authenticated API client
+        product_ids (list[int]): Product IDs
+        warehouse_id (int, optional): Warehouse ID
+
+    Returns:
+        dict: {product_id: orderpoint data}
+    """
+    try:
+        results = [client.execute_kw(*call) for call in _orderpoint_calls(product_ids, warehouse_id)]
+    except:
+        # Model might not be accessible
+        return {}
+
+    return _index_orderpoints(results)
+
+
+def _orderpoint_calls(product_ids: List[int], warehouse_id: Optional[int]) -> List[tuple]:
+    """Build the execute_kw calls (model, method, args, kwargs) of _load_orderpoints."""
+    calls = []
+
+    for ids in chunked(product_ids):
+        domain = [('product_id', 'in', ids)]
+        if warehouse_id:
+            domain.append(('warehouse_id', '=', warehouse_id))
+
+        calls.append(('stock.warehouse.orderpoint', 'search_read', [domain], {'fields': ORDERPOINT_FIELDS}))
+
+    return calls
+
+
+def _index_orderpoints(results: List[List[Dict]]) -> Dict[int, Dict]:
+    """Keep the first reordering rule of each product from the rules of each chunk."""
+    orderpoints = {}
+
+    for rules in results:
+        for rule in rules:
+            if rule.get('product_id'):
+                orderpoints.setdefault(rule['product_id'][0], rule)
+
+    return orderpoints
+
+
+def _load_sales_velocity(
     client: OdooAPIClient,
-    product_id: int,
+    product_ids: List[int],
     days: int
-) -> float:
+) -> Dict[int, float]:
     """
-    Calculate average daily sales velocity.
+    Calculate average daily sales velocity for many products.
 
     Args:
         client (OdooAPIClient): Authenticated API client
-        product_id (int): Product ID
+        product_ids (list[int]): Product IDs
         days (int): Number of days to analyze
 
     Returns:
-        float: Average units sold per day
+        dict: {product_id: average units sold per day}
     """
-    date_from = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    if days <= 0:
+        return {}
 
     try:
-        # Get sold quantities from confirmed sales orders
-        lines = client.search_read(
+        results = [client.execute_kw(*call) for call in _sales_velocity_calls(product_ids, days)]
+    except:
+        return {}
+
+    return _index_sales_velocity(results, days)
+
+
+def _sales_velocity_calls(product_ids: List[int], days: int) -> List[tuple]:
+    """Build the execute_kw calls (model, method, args, kwargs) of _load_sales_velocity."""
+    date_from = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+
+    # Sold quantities from confirmed sales orders, summed per product
+    return [
+        (
             'sale.order.line',
+            'read_group',
             [
-                ('product_id', '=', product_id),
-                ('order_id.state', 'in', ['sale', 'done']),
-                ('order_id.date_order', '>=', date_from)
+                [
+                    ('product_id', 'in', ids),
+                    ('order_id.state', 'in', ['sale', 'done']),
+                    ('order_id.date_order', '>=', date_from)
+                ],
+                ['product_uom_qty:sum'],
+                ['product_id']
             ],
-            ['product_uom_qty']
+            {'lazy': False}
         )
+        for ids in chunked(product_ids)
+    ]
 
-        total_qty = sum(line.get('product_uom_qty', 0) for line in lines)
-        velocity = total_qty / days if days > 0 else 0
-
-        return velocity
 
-    except:
-        return 0.0
+def _index_sales_velocity(results: List[List[Dict]], days: int) -> Dict[int, float]:
+    """Average units sold per day and product from the sale.order.line groups of each chunk."""
+    return {
+        group['product_id'][0]: (group.get('product_uom_qty') or 0) / days
+        for groups in results
+        for group in groups
+        if group.get('product_id')
+    }
 
 
-def _get_supplier_info(client: OdooAPIClient, product: Dict) -> Optional[Dict]:
+def _load_supplier_info(client: OdooAPIClient, products: List[Dict]) -> Dict[int, Dict]:
     """
-    Get supplier information for a product.
+    Get first-supplier information for many products.
 
     Args:
         client (OdooAPIClient): Authenticated API client
-        product (dict): Product data
+        products (list[dict]): Product data
 
     Returns:
-        dict or None: Supplier info
+        dict: {product_id: supplier info}
     """
-    seller_ids = product.get('seller_ids', [])
+    first_seller = _first_sellers(products)
 
-    if not seller_ids:
-        return None
+    if not first_seller:
+        return {}
 
     try:
-        sellers = client.read(
-            'product.supplierinfo',
-            seller_ids[:1],  # First supplier only
-            ['partner_id', 'price', 'min_qty', 'delay']
-        )
+        results = [client.execute_kw(*call) for call in _supplier_calls(first_seller)]
+    except:
+        return {}
 
-        if sellers:
-            seller = sellers[0]
-            return {
-                'supplier_name': seller['partner_id'][1] if seller.get('partner_id') else 'N/A',
-                'price': seller.get('price', 0),
-                'min_order_qty': seller.get('min_qty', 0),
-                'lead_time_days': seller.get('delay', 0)
-            }
+    return _index_supplier_info(first_seller, results)
 
-    except:
-        pass
 
-    return None
+def _first_sellers(products: List[Dict]) -> Dict[int, int]:
+    """Map each product to its first supplier (product.supplierinfo ID)."""
+    # First supplier only
+    return {
+        p['id']: p['seller_ids'][0]
+        for p in products
+        if p.get('seller_ids')
+    }
+
+
+def _supplier_calls(first_seller: Dict[int, int]) -> List[tuple]:
+    """Build the execute_kw calls (model, method, args, kwargs) of _load_supplier_info."""
+    return [
+        ('product.supplierinfo', 'read', [ids], {'fields': SUPPLIER_FIELDS})
+        for ids in chunked(list(set(first_seller.values())))
+    ]
+
+
+def _index_supplier_info(first_seller: Dict[int, int], results: List[List[Dict]]) -> Dict[int, Dict]:
+    """Supplier info per product from the product.supplierinfo records of each chunk."""
+    sellers_by_id = {
+        seller['id']: {
+            'supplier_name': seller['partner_id'][1] if seller.get('partner_id') else 'N/A',
+            'price': seller.get('price', 0),
+            'min_order_qty': seller.get('min_qty', 0),
+            'lead_time_days': seller.get('delay', 0)
+        }
+        for sellers in results
+        for seller in sellers
+    }
+
+    return {
+        product_id: sellers_by_id[seller_id]
+        for product_id, seller_id in first_seller.items()
+        if seller_id in sellers_by_id
+    }
 
 
 def _get_restock_action(urgency_level: str, qty: float, supplier: Optional[Dict]) -> str:
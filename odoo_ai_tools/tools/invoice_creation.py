@@ -8,7 +8,24 @@ Create draft invoices automatically from natural language using Claude + Odoo AP
 import json
 from datetime import datetime
 from typing import Dict, List, Optional
-from .odoo_api_client import OdooAPIClient
+from .odoo_api_client import OdooAPIClient, OdooRPCError, CLIENT_POOL, chunked
+
+
+# Fields read for sales orders, their lines and the created invoices
+ORDER_FIELDS = ['name', 'partner_id', 'amount_total', 'order_line', 'invoice_ids']
+LINE_FIELDS = ['order_id', 'product_id', 'name', 'product_uom_qty', 'price_unit', 'tax_id']
+INVOICE_FIELDS = ['name', 'partner_id', 'amount_total', 'state', 'invoice_date']
+
+# Odoo's "Create invoices" wizard on sales orders
+INVOICE_WIZARD = 'sale.advance.payment.inv'
+
+
+class WizardUnavailableError(Exception):
+    """The invoicing wizard cannot be used; nothing was invoiced."""
+
+
+class NativeInvoicingError(Exception):
+    """The invoicing wizard failed after it may have created invoices."""
 
 
 def create_invoice_from_sales(
@@ -19,7 +36,9 @@ def create_invoice_from_sales(
     sale_order_ids: Optional[List[int]] = None,
     last_n_orders: Optional[int] = None,
     partner_id: Optional[int] = None,
-    invoice_date: Optional[str] = None
+    invoice_date: Optional[str] = None,
+    engine: str = 'lines',
+    bulk: bool = True
 ) -> Dict:
     """
     Create draft invoices from sales orders.
@@ -35,12 +54,21 @@ def create_invoice_from_sales(
         last_n_orders (int, optional): Create invoices for last N orders
         partner_id (int, optional): Filter by customer
         invoice_date (str, optional): Invoice date (YYYY-MM-DD)
+        engine (str): 'lines' (default) to build the invoice lines here
+            from the ordered quantities, or 'native' to let Odoo invoice
+            the orders with its own invoicing wizard (delivered quantities,
+            invoice lines linked to the order lines so invoice_status is
+            updated). 'native' falls back to 'lines' only if the wizard is
+            not available, before anything is invoiced.
+        bulk (bool): With engine 'lines', create all invoices with one
+            multi-record create. If that fails, invoices are created order
+            by order so the failing orders can be reported.
 
     Returns:
         dict: {
             'success': bool,
             'invoices_created': list[dict] or None,
-            'summary': dict or None,
+            'summary': dict or None,  # includes 'failed_orders'
             'error': str or None
         }
 
@@ -48,10 +76,11 @@ def create_invoice_from_sales(
         "Generate invoices for the last 3 sales"
         → last_n_orders=3
     """
+    client = None
+
     try:
-        # Initialize API client
-        client = OdooAPIClient(url, db, username, password)
-        client.authenticate()
+        # Get a pooled, authenticated API client
+        client = CLIENT_POOL.acquire(url, db, username, password)
 
         # Check permissions
         if not client.check_access_rights('account.move', 'create'):
@@ -62,22 +91,11 @@ def create_invoice_from_sales(
                 'error': f"User '{username}' lacks permission to create invoices"
             }
 
-        # Build domain for sales orders
-        domain = [
-            ('state', '=', 'sale'),  # Only confirmed sales
-            ('invoice_status', 'in', ['to invoice', 'no'])  # Not fully invoiced
-        ]
-
-        if sale_order_ids:
-            domain.append(('id', 'in', sale_order_ids))
-        if partner_id:
-            domain.append(('partner_id', '=', partner_id))
-
         # Get sales orders
         orders = client.search_read(
             'sale.order',
-            domain,
-            ['name', 'partner_id', 'amount_total', 'order_line'],
+            _build_order_domain(sale_order_ids, partner_id),
+            ORDER_FIELDS,
             limit=last_n_orders,
             order='date_order desc'
         )
@@ -90,47 +108,51 @@ def create_invoice_from_sales(
                 'error': 'No sales orders found matching criteria'
             }
 
+        created = None
+
+        if engine == 'native':
+            try:
+                created, failed_orders = _create_invoices_native(client, orders, invoice_date)
+
+            except WizardUnavailableError:
+                # Nothing was invoiced: build the invoices here
+                pass
+            except OdooRPCError as e:
+                if not e.is_user_error:
+                    raise
+                # Odoo refused, e.g. nothing to invoice yet
+                created = []
+                failed_orders = [{'sale_order': order['name'], 'error': e.fault_string} for order in orders]
+
+        if created is None:
+            # Read the lines of all orders, then create all invoices
+            lines_by_order = _load_order_lines(client, orders)
+            created, failed_orders = _create_invoices(client, orders, lines_by_order, invoice_date, bulk)
+
+        invoice_data = {}
+        if created:
+            invoice_data = {
+                invoice['id']: invoice
+                for invoice in client.read('account.move', [invoice_id for _order, invoice_id in created], INVOICE_FIELDS)
+            }
+
         invoices_created = []
         total_amount = 0
 
-        for order in orders:
-            try:
-                # Create invoice from sale order
-                invoice_id = _create_invoice_from_order(
-                    client,
-                    order,
-                    invoice_date
-                )
-
-                if invoice_id:
-                    # Read created invoice
-                    invoice_data = client.read(
-                        'account.move',
-                        [invoice_id],
-                        ['name', 'partner_id', 'amount_total', 'state', 'invoice_date']
-                    )[0]
-
-                    invoices_created.append({
-                        'invoice_id': invoice_id,
-                        'invoice_number': invoice_data['name'],
-                        'sale_order': order['name'],
-                        'customer': order['partner_id'][1],
-                        'amount': invoice_data['amount_total'],
-                        'state': invoice_data['state'],
-                        'invoice_date': invoice_data.get('invoice_date')
-                    })
-
-                    total_amount += invoice_data['amount_total']
-
-            except Exception as e:
-                # Log error but continue with other orders
-                print(f"Error creating invoice for order {order['name']}: {str(e)}")
+        for order, invoice_id in created:
+            if invoice_id not in invoice_data:
+                failed_orders.append({'sale_order': order['name'], 'error': f'Invoice {invoice_id} could not be read'})
                 continue
 
+            invoices_created.append(_format_invoice(order, invoice_id, invoice_data[invoice_id]))
+
+            total_amount += invoice_data[invoice_id]['amount_total']
+
         summary = {
             'total_invoices': len(invoices_created),
             'total_amount': total_amount,
-            'source_orders': len(orders)
+            'source_orders': len(orders),
+            'failed_orders': failed_orders
         }
 
         return {
@@ -154,35 +176,289 @@ def create_invoice_from_sales(
             'summary': None,
             'error': f"Error creating invoices: {str(e)}"
         }
+    finally:
+        CLIENT_POOL.release(client)
+
+
+def _build_order_domain(sale_order_ids: Optional[List[int]], partner_id: Optional[int]) -> List:
+    """Build the sale.order domain for confirmed, not fully invoiced orders."""
+    domain = [
+        ('state', '=', 'sale'),  # Only confirmed sales
+        ('invoice_status', 'in', ['to invoice', 'no'])  # Not fully invoiced
+    ]
+
+    if sale_order_ids:
+        domain.append(('id', 'in', sale_order_ids))
+    if partner_id:
+        domain.append(('partner_id', '=', partner_id))
+
+    return domain
+
+
+def _format_invoice(order: Dict, invoice_id: int, invoice_data: Dict) -> Dict:
+    """Build the result entry for an invoice created from ``order``."""
+    return {
+        'invoice_id': invoice_id,
+        'invoice_number': invoice_data['name'],
+        'sale_order': order['name'],
+        'customer': order['partner_id'][1],
+        'amount': invoice_data['amount_total'],
+        'state': invoice_data['state'],
+        'invoice_date': invoice_data.get('invoice_date')
+    }
 
 
-def _create_invoice_from_order(
+def _create_invoices_native(
     client: OdooAPIClient,
-    order: Dict,
+    orders: List[Dict],
     invoice_date: Optional[str] = None
-) -> Optional[int]:
+) -> tuple:
     """
-    Create a draft invoice from a sale order.
+    Invoice ``orders`` with Odoo's own invoicing wizard.
+
+    The wizard invoices every order in one server call, with Odoo's
+    invoicing rules (delivered quantities, down payments, grouping by
+    customer). The private ``sale.order._create_invoices`` cannot be
+    called over the external API, so the wizard is used.
+
+    Only a failure to create the wizard raises WizardUnavailableError
+    (safe to invoice another way). Once create_invoices has been called,
+    errors other than Odoo's UserError raise NativeInvoicingError: the
+    invoices may exist, so they must not be created again.
 
     Args:
         client (OdooAPIClient): Authenticated API client
-        order (dict): Sale order data
+        orders (list[dict]): Sale order data, with 'invoice_ids'
         invoice_date (str, optional): Invoice date
 
     Returns:
-        int: Invoice ID or None
+        tuple: (created, failed_orders), as _create_invoices
     """
-    # Get order lines
-    line_ids = order.get('order_line', [])
-    if not line_ids:
-        return None
+    context = _native_context(orders)
+
+    try:
+        wizard_id = client.execute_kw(*_wizard_create_call(context))
+    except PermissionError:
+        raise
+    except Exception as e:
+        if _is_user_error(e):
+            raise
+        raise WizardUnavailableError(str(e)) from e
+
+    try:
+        client.execute_kw(INVOICE_WIZARD, 'create_invoices', [[wizard_id]], {'context': context})
+    except PermissionError:
+        raise
+    except Exception as e:
+        if _is_user_error(e):
+            raise
+        raise NativeInvoicingError(_interrupted_message(e)) from e
+
+    try:
+        # New invoices are the ones not linked to the orders before
+        invoiced = client.read('sale.order', context['active_ids'], ['invoice_ids'])
+        created, failed_orders = _match_native_invoices(
+            orders,
+            {order['id']: order['invoice_ids'] for order in invoiced}
+        )
+
+        if invoice_date and created:
+            client.write('account.move', [invoice_id for _order, invoice_id in created], {'invoice_date': invoice_date})
+    except Exception as e:
+        raise NativeInvoicingError(_interrupted_message(e)) from e
+
+    return created, failed_orders
 
-    lines = client.search_read(
-        'sale.order.line',
-        [('id', 'in', line_ids)],
-        ['product_id', 'name', 'product_uom_qty', 'price_unit', 'tax_id']
+
+def _is_user_error(error: Exception) -> bool:
+    """Odoo refused the call with a UserError (e.g. nothing to invoice)."""
+    return isinstance(error, OdooRPCError) and error.is_user_error
+
+
+def _wizard_create_call(context: Dict) -> tuple:
+    """Build the execute_kw call (model, method, args, kwargs) creating the invoicing wizard."""
+    return (INVOICE_WIZARD, 'create', [{'advance_payment_method': 'delivered'}], {'context': context})
+
+
+def _interrupted_message(error: Exception) -> str:
+    return (
+        f"Odoo's invoicing wizard may already have created the invoices ({error}). "
+        "Check the orders' invoices before invoicing them again."
     )
 
+
+def _native_context(orders: List[Dict]) -> Dict:
+    """Build the context the invoicing wizard reads its orders from."""
+    return {'active_model': 'sale.order', 'active_ids': [order['id'] for order in orders]}
+
+
+def _match_native_invoices(orders: List[Dict], invoice_ids: Dict[int, List[int]]) -> tuple:
+    """
+    Pair the invoices created by the wizard with their orders.
+
+    Odoo may group several orders of a customer into one invoice; such an
+    invoice is reported once, under all its orders' names.
+
+    Args:
+        orders (list[dict]): Sale order data as read before invoicing
+        invoice_ids (dict): order ID -> invoice IDs after invoicing
+
+    Returns:
+        tuple: (created, failed_orders), as _create_invoices
+    """
+    orders_by_invoice = {}
+    failed_orders = []
+
+    for order in orders:
+        new_ids = [
+            invoice_id for invoice_id in invoice_ids.get(order['id'], [])
+            if invoice_id not in order.get('invoice_ids', [])
+        ]
+        if not new_ids:
+            failed_orders.append({'sale_order': order['name'], 'error': 'Nothing to invoice'})
+        for invoice_id in new_ids:
+            orders_by_invoice.setdefault(invoice_id, []).append(order)
+
+    created = []
+    for invoice_id, invoice_orders in orders_by_invoice.items():
+        order = invoice_orders[0]
+        if len(invoice_orders) > 1:
+            order = dict(order, name=', '.join(o['name'] for o in invoice_orders))
+        created.append((order, invoice_id))
+
+    return created, failed_orders
+
+
+def _load_order_lines(client: OdooAPIClient, orders: List[Dict]) -> Dict[int, List[Dict]]:
+    """
+    Read the lines of all ``orders`` in as few calls as possible.
+
+    Args:
+        client (OdooAPIClient): Authenticated API client
+        orders (list[dict]): Sale order data, with 'order_line'
+
+    Returns:
+        dict: order ID -> list of its sale.order.line data
+    """
+    with client.batch() as batch:
+        futures = [batch.execute_kw(*call) for call in _order_line_calls(orders)]
+
+    return _index_order_lines(future.result() for future in futures)
+
+
+def _order_line_calls(orders: List[Dict]) -> List[tuple]:
+    """Build the execute_kw calls (model, method, args, kwargs) of _load_order_lines."""
+    line_ids = [line_id for order in orders for line_id in order.get('order_line', [])]
+
+    return [
+        ('sale.order.line', 'search_read', [[('id', 'in', ids)]], {'fields': LINE_FIELDS})
+        for ids in chunked(line_ids)
+    ]
+
+
+def _index_order_lines(results) -> Dict[int, List[Dict]]:
+    """Group the sale.order.line records of each chunk by order ID."""
+    lines_by_order = {}
+    for lines in results:
+        for line in lines:
+            lines_by_order.setdefault(line['order_id'][0], []).append(line)
+
+    return lines_by_order
+
+
+def _create_invoices(
+    client: OdooAPIClient,
+    orders: List[Dict],
+    lines_by_order: Dict[int, List[Dict]],
+    invoice_date: Optional[str] = None,
+    bulk: bool = True
+) -> tuple:
+    """
+    Create a draft invoice for each order that has lines.
+
+    In bulk mode all invoices are created with one multi-record create.
+    That create is all-or-nothing, so on failure the invoices are created
+    order by order to find out (and report) which orders fail.
+
+    Args:
+        client (OdooAPIClient): Authenticated API client
+        orders (list[dict]): Sale order data
+        lines_by_order (dict): order ID -> sale.order.line data
+        invoice_date (str, optional): Invoice date
+        bulk (bool): Try a single multi-record create first
+
+    Returns:
+        tuple: (created, failed_orders) where created is a list of
+               (order, invoice_id) and failed_orders a list of
+               {'sale_order': str, 'error': str}
+    """
+    pending = _pending_invoices(orders, lines_by_order, invoice_date)
+
+    if bulk and len(pending) > 1:
+        try:
+            invoice_ids = client.create_many('account.move', [invoice_vals for _order, invoice_vals in pending])
+            return [(order, invoice_id) for (order, _vals), invoice_id in zip(pending, invoice_ids)], []
+
+        except PermissionError:
+            raise
+        except Exception:
+            # Nothing was created: retry order by order
+            pass
+
+    created = []
+    failed_orders = []
+
+    for order, invoice_vals in pending:
+        try:
+            created.append((order, client.create('account.move', invoice_vals)))
+
+        except Exception as e:
+            # Log error but continue with other orders
+            print(f"Error creating invoice for order {order['name']}: {str(e)}")
+            failed_orders.append({'sale_order': order['name'], 'error': str(e)})
+
+    return created, failed_orders
+
+
+def _pending_invoices(
+    orders: List[Dict],
+    lines_by_order: Dict[int, List[Dict]],
+    invoice_date: Optional[str] = None
+) -> List[tuple]:
+    """
+    Invoice values of each order that has lines.
+
+    Returns:
+        list[tuple]: (order, account.move values)
+    """
+    pending = []
+    for order in orders:
+        invoice_vals = _prepare_invoice_vals(order, lines_by_order.get(order['id'], []), invoice_date)
+        if invoice_vals:
+            pending.append((order, invoice_vals))
+
+    return pending
+
+
+def _prepare_invoice_vals(
+    order: Dict,
+    lines: List[Dict],
+    invoice_date: Optional[str] = None
+) -> Optional[Dict]:
+    """
+    Build account.move values for a draft invoice of a sale order.
+
+    Args:
+        order (dict): Sale order data
+        lines (list[dict]): The order's sale.order.line data
+        invoice_date (str, optional): Invoice date
+
+    Returns:
+        dict or None: Invoice values, None if the order has no lines
+    """
+    if not lines:
+        return None
+
     # Prepare invoice lines
     invoice_lines = []
     for line in lines:
@@ -208,10 +484,7 @@ def _create_invoice_from_order(
     if invoice_date:
         invoice_vals['invoice_date'] = invoice_date
 
-    # Create invoice
-    invoice_id = client.create('account.move', invoice_vals)
-
-    return invoice_id
+    return invoice_vals
 
 
 # Tool definition for Claude API
@@ -253,6 +526,15 @@ INVOICE_CREATION_TOOL = {
             "invoice_date": {
                 "type": "string",
                 "description": "Invoice date in YYYY-MM-DD format (optional, defaults to today)"
+            },
+            "engine": {
+                "type": "string",
+                "enum": ["native", "lines"],
+                "description": "'lines' (default) copies the ordered quantities into new invoices; 'native' uses Odoo's own invoicing of delivered quantities, keeping orders' invoice status up to date"
+            },
+            "bulk": {
+                "type": "boolean",
+                "description": "With engine 'lines': create all invoices in one call (default true); set false to create them one order at a time"
             }
         },
         "required": ["url", "db", "username", "password"]
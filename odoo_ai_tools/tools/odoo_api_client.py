@@ -2,20 +2,86 @@
 """
 Odoo Web API Client
 ===================
-Secure client for interacting with Odoo using JSON-RPC API.
+Secure client for interacting with Odoo using the XML-RPC or JSON-RPC API.
 No direct database access, respects user permissions.
 """
 
 import xmlrpc.client
 import json
+import hashlib
+import hmac
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from .odoo_transports import RPC_FAULT_CODE_ACCESS_ERROR, RPC_FAULT_CODE_WARNING, TRANSPORTS
+
+
+# Max IDs sent in a single ('id', 'in', ids) domain or read() call
+DEFAULT_BATCH_SIZE = 1000
+
+# Seconds an idle pooled client keeps its connection open
+POOL_IDLE_TIMEOUT = 300
+
+# Max idle clients kept per (url, db, username)
+POOL_MAX_IDLE_PER_KEY = 4
+
+# Max concurrent RPCs issued by an RPCBatch
+MAX_PARALLEL_RPC = 4
+
+# Wire protocol used when none is given: 'xmlrpc' or 'jsonrpc'
+DEFAULT_PROTOCOL = os.environ.get('ODOO_AI_RPC_PROTOCOL', 'xmlrpc')
+
+
+def chunked(ids: List[int], size: int = DEFAULT_BATCH_SIZE):
+    """
+    Split a list of IDs into fixed-size chunks.
+
+    Args:
+        ids (list[int]): Record IDs
+        size (int): Max IDs per chunk
+
+    Yields:
+        list[int]: Consecutive slices of ``ids``
+    """
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+class OdooRPCError(Exception):
+    """Error raised by Odoo while executing a call, with its fault code."""
+
+    def __init__(self, fault: xmlrpc.client.Fault):
+        """
+        Initialize error.
+
+        Args:
+            fault (xmlrpc.client.Fault): Fault reported by the transport
+        """
+        super().__init__(f"Odoo API error: {str(fault)}")
+        self.fault_code = fault.faultCode
+        self.fault_string = fault.faultString
+
+    @property
+    def is_user_error(self) -> bool:
+        """Odoo refused the call with a UserError (or a subclass of it)."""
+        return self.fault_code == RPC_FAULT_CODE_WARNING
 
 
 class OdooAPIClient:
-    """Client for Odoo JSON-RPC Web API with authentication."""
+    """Client for Odoo Web API (XML-RPC or JSON-RPC) with authentication."""
 
-    def __init__(self, url: str, db: str, username: str, password: str):
+    def __init__(
+        self,
+        url: str,
+        db: str,
+        username: str,
+        password: str,
+        protocol: Optional[str] = None
+    ):
         """
         Initialize Odoo API client.
 
@@ -24,14 +90,19 @@ class OdooAPIClient:
             db (str): Database name
             username (str): User login
             password (str): User password
+            protocol (str, optional): 'xmlrpc' or 'jsonrpc' (default: DEFAULT_PROTOCOL)
         """
+        protocol = protocol or DEFAULT_PROTOCOL
+        if protocol not in TRANSPORTS:
+            raise ValueError(f"Unknown Odoo API protocol: {protocol}")
+
         self.url = url
         self.db = db
         self.username = username
         self.password = password
+        self.protocol = protocol
         self.uid = None
-        self._common = None
-        self._models = None
+        self._transport = None
 
     def authenticate(self) -> bool:
         """
@@ -44,23 +115,37 @@ class OdooAPIClient:
             Exception: If authentication fails
         """
         try:
-            self._common = xmlrpc.client.ServerProxy(f'{self.url}/xmlrpc/2/common')
-            self.uid = self._common.authenticate(
+            self._connect()
+            self.uid = self._transport.authenticate(
                 self.db,
                 self.username,
-                self.password,
-                {}
+                self.password
             )
 
             if not self.uid:
                 raise Exception(f"Authentication failed for user: {self.username}")
 
-            self._models = xmlrpc.client.ServerProxy(f'{self.url}/xmlrpc/2/object')
             return True
 
         except Exception as e:
             raise Exception(f"Odoo API authentication error: {str(e)}")
 
+    def _connect(self):
+        """
+        Create the RPC transport if needed.
+
+        Transports keep their HTTP connection open between calls
+        (HTTP/1.1 keep-alive), so reusing a client reuses the socket.
+        """
+        if self._transport is None:
+            self._transport = TRANSPORTS[self.protocol](self.url)
+
+    def close(self):
+        """Close the underlying HTTP connections."""
+        if self._transport is not None:
+            self._transport.close()
+        self._transport = None
+
     def execute_kw(self, model: str, method: str, args: List = None, kwargs: Dict = None) -> Any:
         """
         Execute Odoo model method via API.
@@ -75,10 +160,13 @@ class OdooAPIClient:
             Any: Method result
 
         Raises:
-            Exception: If execution fails or user lacks permissions
+            PermissionError: If the user lacks permissions
+            OdooRPCError: If Odoo raised an error
         """
         if not self.uid:
             self.authenticate()
+        else:
+            self._connect()
 
         if args is None:
             args = []
@@ -86,7 +174,7 @@ class OdooAPIClient:
             kwargs = {}
 
         try:
-            result = self._models.execute_kw(
+            result = self._transport.execute_kw(
                 self.db,
                 self.uid,
                 self.password,
@@ -99,11 +187,11 @@ class OdooAPIClient:
 
         except xmlrpc.client.Fault as e:
             # Permission error handling
-            if 'AccessError' in str(e):
+            if e.faultCode == RPC_FAULT_CODE_ACCESS_ERROR:
                 raise PermissionError(
                     f"User '{self.username}' lacks permission to {method} on {model}"
                 )
-            raise Exception(f"Odoo API error: {str(e)}")
+            raise OdooRPCError(e) from e
 
     def search(self, model: str, domain: List, limit: Optional[int] = None) -> List[int]:
         """
@@ -166,6 +254,77 @@ class OdooAPIClient:
 
         return self.execute_kw(model, 'search_read', [domain], kwargs)
 
+    def search_read_paged(
+        self,
+        model: str,
+        domain: List,
+        fields: List[str],
+        page_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """
+        Iterate over all matching records page by page.
+
+        Uses an ID cursor (``id > last_id``, ordered by id) rather than an
+        offset, so each page is an index range scan and records created
+        during the scan cannot shift pages.
+
+        Args:
+            model (str): Model name
+            domain (list): Search domain
+            fields (list[str]): Fields to read
+            page_size (int): Records per page
+
+        Yields:
+            list[dict]: One page of record data (never empty)
+        """
+        last_id = 0
+
+        while True:
+            page = self.search_read(
+                model,
+                list(domain) + [('id', '>', last_id)],
+                fields,
+                limit=page_size,
+                order='id asc'
+            )
+
+            if not page:
+                return
+
+            yield page
+
+            if len(page) < page_size:
+                return
+            last_id = page[-1]['id']
+
+    def read_group(
+        self,
+        model: str,
+        domain: List,
+        fields: List[str],
+        groupby: List[str],
+        lazy: bool = False
+    ) -> List[Dict]:
+        """
+        Aggregate records server-side.
+
+        Args:
+            model (str): Model name
+            domain (list): Search domain
+            fields (list[str]): Aggregates (e.g., 'quantity:sum')
+            groupby (list[str]): Fields to group by
+            lazy (bool): Only group by the first field (default: False)
+
+        Returns:
+            list[dict]: One dict per group with aggregated values
+        """
+        return self.execute_kw(
+            model,
+            'read_group',
+            [domain, fields, groupby],
+            {'lazy': lazy}
+        )
+
     def create(self, model: str, values: Dict) -> int:
         """
         Create a new record.
@@ -177,7 +336,23 @@ class OdooAPIClient:
         Returns:
             int: New record ID
         """
-        return self.execute_kw(model, 'create', [[values]])
+        return self.execute_kw(model, 'create', [values])
+
+    def create_many(self, model: str, values_list: List[Dict]) -> List[int]:
+        """
+        Create several records in one call.
+
+        The records are created in a single transaction: if one fails,
+        none is created.
+
+        Args:
+            model (str): Model name
+            values_list (list[dict]): Field values of each record
+
+        Returns:
+            list[int]: New record IDs, in the order of ``values_list``
+        """
+        return self.execute_kw(model, 'create', [values_list])
 
     def write(self, model: str, ids: List[int], values: Dict) -> bool:
         """
@@ -223,6 +398,24 @@ class OdooAPIClient:
 
         return self.execute_kw(model, 'fields_get', args)
 
+    def batch(self, max_workers: int = MAX_PARALLEL_RPC) -> 'RPCBatch':
+        """
+        Start a batch of independent calls executed concurrently.
+
+        Args:
+            max_workers (int): Max calls in flight at once
+
+        Returns:
+            RPCBatch: Batch bound to this client's credentials
+
+        Example:
+            with client.batch() as batch:
+                partners = batch.search_read('res.partner', [], ['name'])
+                users = batch.search_read('res.users', [], ['login'])
+            partners.result(), users.result()
+        """
+        return RPCBatch(self, max_workers=max_workers)
+
     def check_access_rights(self, model: str, operation: str) -> bool:
         """
         Check if user has access rights for operation.
@@ -243,3 +436,324 @@ class OdooAPIClient:
             )
         except:
             return False
+
+
+
+class RPCBatch:
+    """
+    Queue of independent execute_kw calls flushed concurrently.
+
+    Each queued call returns a ``concurrent.futures.Future``. On flush the
+    calls run on a bounded thread pool, each worker using its own pooled
+    client (XML-RPC proxies are not thread-safe), so N independent reads
+    cost roughly one round trip of wall time instead of N.
+    """
+
+    def __init__(self, client: OdooAPIClient, max_workers: int = MAX_PARALLEL_RPC):
+        """
+        Initialize batch.
+
+        Args:
+            client (OdooAPIClient): Client whose credentials the calls use
+            max_workers (int): Max calls in flight at once
+        """
+        self.client = client
+        self.max_workers = max(1, max_workers)
+        self._calls = []
+
+    def __enter__(self) -> 'RPCBatch':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush(raise_errors=False)
+        else:
+            for future, _call in self._calls:
+                future.cancel()
+            self._calls = []
+
+    def execute_kw(self, model: str, method: str, args: List = None, kwargs: Dict = None) -> Future:
+        """
+        Queue a call.
+
+        Args:
+            model (str): Odoo model name
+            method (str): Method name
+            args (list): Positional arguments
+            kwargs (dict): Keyword arguments
+
+        Returns:
+            Future: Resolved with the call result on flush
+        """
+        future = Future()
+        self._calls.append((future, (model, method, args, kwargs)))
+        return future
+
+    def read(self, model: str, ids: List[int], fields: List[str]) -> Future:
+        """Queue a read(). See OdooAPIClient.read."""
+        return self.execute_kw(model, 'read', [ids], {'fields': fields})
+
+    def search_read(
+        self,
+        model: str,
+        domain: List,
+        fields: List[str],
+        limit: Optional[int] = None,
+        order: Optional[str] = None
+    ) -> Future:
+        """Queue a search_read(). See OdooAPIClient.search_read."""
+        kwargs = {'fields': fields}
+        if limit:
+            kwargs['limit'] = limit
+        if order:
+            kwargs['order'] = order
+
+        return self.execute_kw(model, 'search_read', [domain], kwargs)
+
+    def flush(self, raise_errors: bool = True) -> List[Any]:
+        """
+        Run all queued calls and resolve their futures.
+
+        Args:
+            raise_errors (bool): Re-raise the first failed call's exception
+
+        Returns:
+            list: Results in the order the calls were queued
+                  (the exception instance for failed calls)
+        """
+        calls, self._calls = self._calls, []
+
+        if len(calls) <= 1 or self.max_workers == 1:
+            # Nothing to overlap: run on the caller's own client
+            for future, call in calls:
+                self._run(future, self.client, call)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(calls))) as executor:
+                for future, call in calls:
+                    executor.submit(self._run_pooled, future, call)
+
+        results = []
+        for future, _call in calls:
+            error = future.exception()
+            if error is not None and raise_errors:
+                raise error
+            results.append(error if error is not None else future.result())
+
+        return results
+
+    @staticmethod
+    def _run(future: Future, client: OdooAPIClient, call: tuple):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(client.execute_kw(*call))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _run_pooled(self, future: Future, call: tuple):
+        try:
+            client = CLIENT_POOL.acquire(
+                self.client.url,
+                self.client.db,
+                self.client.username,
+                self.client.password,
+                self.client.protocol
+            )
+        except Exception as e:
+            future.set_exception(e)
+            return
+
+        try:
+            self._run(future, client, call)
+        finally:
+            CLIENT_POOL.release(client)
+
+
+class OdooClientPool:
+    """
+    Process-wide pool of authenticated OdooAPIClient instances.
+
+    Clients are pooled per (url, db, username, protocol). A client is owned by a
+    single caller between acquire() and release(), so the underlying
+    (non thread-safe) XML-RPC proxies are never shared between threads.
+    The resolved uid is cached per key so warm acquisitions skip the
+    authenticate round trip, and idle clients are closed after
+    ``idle_timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = POOL_IDLE_TIMEOUT,
+        max_idle_per_key: int = POOL_MAX_IDLE_PER_KEY
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            idle_timeout (float): Seconds before an idle client is closed
+            max_idle_per_key (int): Idle clients kept per (url, db, username)
+        """
+        self.idle_timeout = idle_timeout
+        self.max_idle_per_key = max_idle_per_key
+        self._lock = threading.Lock()
+        self._idle = {}  # key -> list of (client, released_at)
+        self._uids = {}  # key -> (password digest, uid)
+
+    @staticmethod
+    def _key(url: str, db: str, username: str, protocol: Optional[str]) -> tuple:
+        return (url.rstrip('/'), db, username, protocol or DEFAULT_PROTOCOL)
+
+    @staticmethod
+    def _digest(password: str) -> bytes:
+        return hashlib.sha256(password.encode('utf-8')).digest()
+
+    def acquire(
+        self,
+        url: str,
+        db: str,
+        username: str,
+        password: str,
+        protocol: Optional[str] = None
+    ) -> OdooAPIClient:
+        """
+        Get an authenticated client, reusing an idle one when possible.
+
+        Args:
+            url (str): Odoo server URL
+            db (str): Database name
+            username (str): User login
+            password (str): User password
+            protocol (str, optional): 'xmlrpc' or 'jsonrpc' (default: DEFAULT_PROTOCOL)
+
+        Returns:
+            OdooAPIClient: Client owned by the caller until release()
+
+        Raises:
+            Exception: If authentication fails
+        """
+        key = self._key(url, db, username, protocol)
+        digest = self._digest(password)
+        client = None
+        cached_uid = None
+
+        with self._lock:
+            stale = self._pop_expired()
+
+            idle = self._idle.get(key, [])
+            while idle:
+                candidate, _released_at = idle.pop()
+                if hmac.compare_digest(self._digest(candidate.password), digest):
+                    client = candidate
+                    break
+                stale.append(candidate)
+
+            cached = self._uids.get(key)
+            if cached and hmac.compare_digest(cached[0], digest):
+                cached_uid = cached[1]
+
+        self._close_all(stale)
+
+        if client is not None:
+            return client
+
+        client = OdooAPIClient(url, db, username, password, protocol=protocol)
+        if cached_uid:
+            client.uid = cached_uid
+            client._connect()
+        else:
+            client.authenticate()
+            with self._lock:
+                self._uids[key] = (digest, client.uid)
+
+        return client
+
+    def release(self, client: Optional[OdooAPIClient]):
+        """
+        Return a client to the pool.
+
+        Args:
+            client (OdooAPIClient, optional): Client from acquire(); None is ignored
+        """
+        if client is None:
+            return
+
+        key = self._key(client.url, client.db, client.username, client.protocol)
+        stale = []
+
+        with self._lock:
+            stale = self._pop_expired()
+            idle = self._idle.setdefault(key, [])
+
+            if client.uid and len(idle) < self.max_idle_per_key:
+                idle.append((client, time.monotonic()))
+            else:
+                stale.append(client)
+
+        self._close_all(stale)
+
+    @contextmanager
+    def client(
+        self,
+        url: str,
+        db: str,
+        username: str,
+        password: str,
+        protocol: Optional[str] = None
+    ):
+        """
+        Context manager around acquire() / release().
+
+        Example:
+            with CLIENT_POOL.client(url, db, username, password) as client:
+                client.search_read('res.partner', [], ['name'])
+        """
+        client = self.acquire(url, db, username, password, protocol)
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def evict_idle(self):
+        """Close clients that have been idle longer than idle_timeout."""
+        with self._lock:
+            stale = self._pop_expired()
+        self._close_all(stale)
+
+    def clear(self):
+        """Close all idle clients and forget cached uids."""
+        with self._lock:
+            stale = [client for idle in self._idle.values() for client, _ in idle]
+            self._idle.clear()
+            self._uids.clear()
+        self._close_all(stale)
+
+    def _pop_expired(self) -> List[OdooAPIClient]:
+        """Remove expired idle clients. Caller must hold the lock."""
+        deadline = time.monotonic() - self.idle_timeout
+        expired = []
+
+        for key in list(self._idle):
+            keep = []
+            for client, released_at in self._idle[key]:
+                if released_at < deadline:
+                    expired.append(client)
+                else:
+                    keep.append((client, released_at))
+            if keep:
+                self._idle[key] = keep
+            else:
+                del self._idle[key]
+
+        return expired
+
+    @staticmethod
+    def _close_all(clients: List[OdooAPIClient]):
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+
+# Shared pool used by all tools
+CLIENT_POOL = OdooClientPool()
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Odoo RPC Transports
+===================
+Wire protocols used by OdooAPIClient to reach the Odoo external API.
+
+Both transports expose the same two calls (``authenticate`` and
+``execute_kw``) and report server-side errors as ``xmlrpc.client.Fault``
+with the fault codes of Odoo's ``/xmlrpc/2`` endpoints, so the client maps
+errors (e.g., AccessError -> PermissionError) the same way whichever
+protocol is used.
+"""
+
+import http.client
+import itertools
+import json
+import xmlrpc.client
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Default HTTP timeout (seconds) for JSON-RPC requests
+JSONRPC_TIMEOUT = 120
+
+# Fault codes of Odoo's /xmlrpc/2 endpoints
+RPC_FAULT_CODE_APPLICATION_ERROR = 1
+RPC_FAULT_CODE_WARNING = 2  # UserError and its subclasses (ValidationError, MissingError, ...)
+RPC_FAULT_CODE_ACCESS_DENIED = 3
+RPC_FAULT_CODE_ACCESS_ERROR = 4
+
+# Fault code of each exception JSON-RPC reports by class name
+FAULT_CODES_BY_EXCEPTION = {
+    'odoo.exceptions.UserError': RPC_FAULT_CODE_WARNING,
+    'odoo.exceptions.ValidationError': RPC_FAULT_CODE_WARNING,
+    'odoo.exceptions.MissingError': RPC_FAULT_CODE_WARNING,
+    'odoo.exceptions.RedirectWarning': RPC_FAULT_CODE_WARNING,
+    'odoo.exceptions.AccessDenied': RPC_FAULT_CODE_ACCESS_DENIED,
+    'odoo.exceptions.AccessError': RPC_FAULT_CODE_ACCESS_ERROR,
+}
+
+
+def json_dumps(value: Any) -> bytes:
+    """Encode a JSON-RPC payload, using orjson when available."""
+    if orjson:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(data: bytes) -> Any:
+    """Decode a JSON-RPC payload, using orjson when available."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def jsonrpc_fault(error: Dict) -> xmlrpc.client.Fault:
+    """
+    Convert a JSON-RPC error to the Fault XML-RPC would have raised.
+
+    Args:
+        error (dict): ``error`` member of a JSON-RPC reply
+
+    Returns:
+        xmlrpc.client.Fault: Fault with the /xmlrpc/2 code of the exception
+            class, and the class name and message as fault string
+    """
+    data = error.get('data') or {}
+    name = data.get('name', '')
+    return xmlrpc.client.Fault(
+        FAULT_CODES_BY_EXCEPTION.get(name, RPC_FAULT_CODE_APPLICATION_ERROR),
+        f"{name}: {data.get('message') or error.get('message', '')}"
+    )
+
+
+class XMLRPCTransport:
+    """Transport over Odoo's ``/xmlrpc/2`` endpoints."""
+
+    name = 'xmlrpc'
+
+    def __init__(self, url: str):
+        """
+        Initialize XML-RPC transport.
+
+        The proxies' transports keep their HTTP connection open between
+        calls (HTTP/1.1 keep-alive), so reusing a transport reuses the socket.
+
+        Args:
+            url (str): Odoo server URL
+        """
+        self.url = url
+        self._common = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/common', allow_none=True)
+        self._models = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/object', allow_none=True)
+
+    def authenticate(self, db: str, username: str, password: str) -> Any:
+        """Return the uid for the credentials, or False."""
+        return self._common.authenticate(db, username, password, {})
+
+    def execute_kw(
+        self,
+        db: str,
+        uid: int,
+        password: str,
+        model: str,
+        method: str,
+        args: List,
+        kwargs: Dict
+    ) -> Any:
+        """Call ``method`` on ``model``."""
+        return self._models.execute_kw(db, uid, password, model, method, args, kwargs)
+
+    def close(self):
+        """Close the underlying HTTP connections."""
+        self._common('close')()
+        self._models('close')()
+
+
+class JSONRPCTransport:
+    """
+    Transport over Odoo's ``/jsonrpc`` endpoint.
+
+    JSON payloads are markedly smaller and faster to decode than XML-RPC
+    for large search_read results. A single persistent HTTP connection is
+    kept per transport and re-opened once if the server dropped it.
+    """
+
+    name = 'jsonrpc'
+
+    def __init__(self, url: str, timeout: float = JSONRPC_TIMEOUT):
+        """
+        Initialize JSON-RPC transport.
+
+        Args:
+            url (str): Odoo server URL
+            timeout (float): HTTP timeout in seconds
+        """
+        self.url = url
+        self.timeout = timeout
+        self._parts = urlsplit(url)
+        self._path = self._parts.path.rstrip('/') + '/jsonrpc'
+        self._connection = None
+        self._ids = itertools.count(1)
+
+    def authenticate(self, db: str, username: str, password: str) -> Any:
+        """Return the uid for the credentials, or False."""
+        return self._call('common', 'authenticate', [db, username, password, {}])
+
+    def execute_kw(
+        self,
+        db: str,
+        uid: int,
+        password: str,
+        model: str,
+        method: str,
+        args: List,
+        kwargs: Dict
+    ) -> Any:
+        """Call ``method`` on ``model``."""
+        return self._call('object', 'execute_kw', [db, uid, password, model, method, args, kwargs])
+
+    def close(self):
+        """Close the underlying HTTP connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._connection is None:
+            if self._parts.scheme == 'https':
+                self._connection = http.client.HTTPSConnection(self._parts.netloc, timeout=self.timeout)
+            else:
+                self._connection = http.client.HTTPConnection(self._parts.netloc, timeout=self.timeout)
+        return self._connection
+
+    def _post(self, body: bytes) -> bytes:
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+
+        for attempt in range(2):
+            connection = self._connect()
+            try:
+                connection.request('POST', self._path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                    ConnectionResetError, BrokenPipeError):
+                # Keep-alive connection closed by the server: reconnect once
+                self.close()
+                if attempt:
+                    raise
+                continue
+
+            if response.status != 200:
+                raise xmlrpc.client.ProtocolError(
+                    f'{self.url}{self._path}', response.status, response.reason, dict(response.getheaders())
+                )
+            return data
+
+    def _call(self, service: str, method: str, args: List) -> Any:
+        payload = {
+            'jsonrpc': '2.0',
+            'method': 'call',
+            'params': {'service': service, 'method': method, 'args': args},
+            'id': next(self._ids),
+        }
+
+        reply = json_loads(self._post(json_dumps(payload)))
+
+        error = reply.get('error')
+        if error:
+            raise jsonrpc_fault(error)
+
+        return reply.get('result')
+
+
+# Available transports, selectable per client
+TRANSPORTS = {
+    XMLRPCTransport.name: XMLRPCTransport,
+    JSONRPCTransport.name: JSONRPCTransport,
+}
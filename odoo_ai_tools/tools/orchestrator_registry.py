@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Orchestrator Registry
+=====================
+Process-wide reuse of Anthropic clients and Claude orchestrators.
+
+Creating an ``anthropic.Anthropic`` client opens a new connection pool, so
+every message paid for fresh TCP/TLS handshakes. Clients are kept per API
+key (by digest) and orchestrators per Odoo identity and conversation, so
+follow-up messages reuse warm connections and the conversation history.
+Entries unused for ``REGISTRY_IDLE_SECONDS`` or beyond ``REGISTRY_MAX_SIZE``
+(least recently used first) are dropped.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
+
+from .claude_orchestrator import ClaudeOrchestrator
+
+
+# Max instances kept per registry
+REGISTRY_MAX_SIZE = 64
+
+# Seconds an unused instance is kept
+REGISTRY_IDLE_SECONDS = 15 * 60
+
+
+class InstanceRegistry:
+    """Thread-safe LRU registry of shared instances with idle eviction."""
+
+    def __init__(
+        self,
+        max_size: int = REGISTRY_MAX_SIZE,
+        idle_seconds: float = REGISTRY_IDLE_SECONDS
+    ):
+        """
+        Initialize registry.
+
+        Args:
+            max_size (int): Max instances kept
+            idle_seconds (float): Seconds an unused instance is kept
+        """
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (last_used, instance)
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Get the instance registered under ``key``, creating it if needed.
+
+        Args:
+            key: Registry key (must not contain secrets in clear)
+            factory (callable): Builds the instance on a miss
+
+        Returns:
+            Registered instance
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_idle(now)
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (now, entry[1])
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry[1]
+
+            self._stats['misses'] += 1
+            instance = factory()
+            self._entries[key] = (now, instance)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+            return instance
+
+    def discard(self, key: Hashable):
+        """
+        Drop an instance.
+
+        Args:
+            key: Registry key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop all instances."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Registry statistics.
+
+        Returns:
+            dict: {'size', 'hits', 'misses', 'evictions'}
+        """
+        with self._lock:
+            return dict(self._stats, size=len(self._entries))
+
+    def _evict_idle(self, now: float):
+        # Entries are in least recently used order
+        while self._entries:
+            key, (last_used, _instance) = next(iter(self._entries.items()))
+            if now - last_used < self.idle_seconds:
+                break
+            del self._entries[key]
+            self._stats['evictions'] += 1
+
+
+# Anthropic clients, keyed by API key digest
+ANTHROPIC_CLIENTS = InstanceRegistry()
+
+# Orchestrators, keyed by API key digest, Odoo identity and conversation
+ORCHESTRATORS = InstanceRegistry()
+
+
+def get_anthropic_client(api_key: str):
+    """
+    Get the shared Anthropic client of an API key.
+
+    Args:
+        api_key (str): Anthropic API key
+
+    Returns:
+        anthropic.Anthropic: Client (thread-safe, shared by orchestrators)
+    """
+    if not anthropic:
+        raise ImportError(
+            "anthropic package not installed. "
+            "Install with: pip install anthropic"
+        )
+
+    return ANTHROPIC_CLIENTS.get_or_create(
+        _digest(api_key),
+        lambda: anthropic.Anthropic(api_key=api_key)
+    )
+
+
+def get_orchestrator(
+    api_key: str,
+    odoo_url: str,
+    odoo_db: str,
+    odoo_username: str,
+    odoo_password: str,
+    conversation_key: Optional[Hashable] = None,
+    **options
+) -> ClaudeOrchestrator:
+    """
+    Get the orchestrator of a conversation, on a shared Anthropic client.
+
+    Without ``conversation_key`` a new orchestrator is returned (still on
+    the shared client). Keys use digests of the API key and password, so a
+    changed password gets a new orchestrator.
+
+    Args:
+        api_key (str): Anthropic API key
+        odoo_url (str): Odoo server URL
+        odoo_db (str): Odoo database name
+        odoo_username (str): Odoo user login
+        odoo_password (str): Odoo user password
+        conversation_key (hashable, optional): Conversation identifier
+        **options: Other ClaudeOrchestrator arguments (used on creation only)
+
+    Returns:
+        ClaudeOrchestrator: Orchestrator
+    """
+    def create():
+        return ClaudeOrchestrator(
+            api_key=api_key,
+            odoo_url=odoo_url,
+            odoo_db=odoo_db,
+            odoo_username=odoo_username,
+            odoo_password=odoo_password,
+            client=get_anthropic_client(api_key),
+            **options
+        )
+
+    if conversation_key is None:
+        return create()
+
+    key = (
+        _digest(api_key),
+        odoo_url,
+        odoo_db,
+        odoo_username,
+        _digest(odoo_password),
+        conversation_key,
+    )
+    return ORCHESTRATORS.get_or_create(key, create)
+
+
+def _digest(secret: str) -> str:
+    return hashlib.sha256((secret or '').encode('utf-8')).hexdigest()
@@ -8,7 +8,7 @@ Intelligent summary of quotations requiring follow-up.
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from .odoo_api_client import OdooAPIClient
+from .odoo_api_client import OdooAPIClient, CLIENT_POOL, chunked
 
 
 # Activity urgency mapping
@@ -35,6 +35,14 @@ URGENCY_LEVELS = {
     }
 }
 
+# Fields read for each quotation and its activities
+QUOTATION_FIELDS = ['name', 'partner_id', 'user_id', 'date_order', 'validity_date',
+                    'amount_total', 'state']
+ACTIVITY_FIELDS = ['res_id', 'activity_type_id', 'summary', 'date_deadline', 'user_id']
+
+# Detailed quotations returned per urgency level in 'buckets' mode
+BUCKET_TOP_N = 10
+
 
 def summarize_quotations(
     url: str,
@@ -44,7 +52,9 @@ def summarize_quotations(
     days_ahead: Optional[int] = 7,
     min_amount: Optional[float] = None,
     salesperson_id: Optional[int] = None,
-    include_activities: bool = True
+    include_activities: bool = True,
+    mode: str = 'detailed',
+    top_n: int = BUCKET_TOP_N
 ) -> Dict:
     """
     Generate intelligent summary of quotations requiring follow-up.
@@ -60,6 +70,12 @@ def summarize_quotations(
         min_amount (float, optional): Minimum quotation amount
         salesperson_id (int, optional): Filter by salesperson
         include_activities (bool): Include scheduled activities
+        mode (str): 'detailed' to download and analyze every open quotation,
+            or 'buckets' to count and total each urgency level in Odoo
+            (one read_group per level) and return only the ``top_n``
+            largest quotations of each level. 'buckets' falls back to
+            'detailed' if the grouped query fails.
+        top_n (int): Detailed quotations per urgency level in 'buckets' mode
 
     Returns:
         dict: {
@@ -73,10 +89,11 @@ def summarize_quotations(
         "Which quotations need follow-up this week?"
         → days_ahead=7
     """
+    client = None
+
     try:
-        # Initialize API client
-        client = OdooAPIClient(url, db, username, password)
-        client.authenticate()
+        # Get a pooled, authenticated API client
+        client = CLIENT_POOL.acquire(url, db, username, password)
 
         # Check permissions
         if not client.check_access_rights('sale.order', 'read'):
@@ -87,22 +104,39 @@ def summarize_quotations(
                 'error': f"User '{username}' lacks permission to read quotations"
             }
 
-        # Build domain for quotations
-        domain = [
-            ('state', 'in', ['draft', 'sent']),  # Only quotations, not confirmed sales
-        ]
-
-        if min_amount:
-            domain.append(('amount_total', '>=', min_amount))
-        if salesperson_id:
-            domain.append(('user_id', '=', salesperson_id))
+        if mode == 'buckets':
+            try:
+                level_calls = _bucket_calls(min_amount, salesperson_id, top_n)
+                with client.batch() as batch:
+                    futures = [
+                        (level, batch.execute_kw(*group_call), batch.execute_kw(*rows_call))
+                        for level, group_call, rows_call in level_calls
+                    ]
+
+                groups_by_level = {level: groups.result() for level, groups, _rows in futures}
+                rows_by_level = {level: rows.result() for level, _groups, rows in futures}
+
+                activities_by_quote = {}
+                if include_activities:
+                    activities_by_quote = _load_activities(
+                        client,
+                        [quote['id'] for rows in rows_by_level.values() for quote in rows],
+                        days_ahead
+                    )
+
+                return _build_bucket_summary(groups_by_level, rows_by_level, activities_by_quote, days_ahead)
+
+            except PermissionError:
+                raise
+            except Exception:
+                # Grouped query not supported here: analyze every quotation
+                pass
 
         # Get quotations
         quotations = client.search_read(
             'sale.order',
-            domain,
-            ['name', 'partner_id', 'user_id', 'date_order', 'validity_date',
-             'amount_total', 'state', 'activity_ids'],
+            _build_quotation_domain(min_amount, salesperson_id),
+            QUOTATION_FIELDS,
             order='validity_date asc'
         )
 
@@ -114,41 +148,25 @@ def summarize_quotations(
                 'error': 'No quotations found'
             }
 
+        # Activities due within the window, for all quotations at once
+        activities_by_quote = {}
+        if include_activities:
+            activities_by_quote = _load_activities(client, [quote['id'] for quote in quotations], days_ahead)
+
         # Analyze each quotation
         analyzed_quotations = []
         total_amount = 0
 
         for quote in quotations:
             analysis = _analyze_quotation(
-                client,
                 quote,
-                days_ahead,
-                include_activities
+                activities_by_quote.get(quote['id'], []),
+                days_ahead
             )
             analyzed_quotations.append(analysis)
             total_amount += quote['amount_total']
 
-        # Sort by urgency
-        analyzed_quotations.sort(key=lambda x: x['urgency_priority'])
-
-        # Calculate summary
-        by_urgency = {}
-        for quote in analyzed_quotations:
-            urgency = quote['urgency_level']
-            if urgency not in by_urgency:
-                by_urgency[urgency] = {
-                    'count': 0,
-                    'total_amount': 0
-                }
-            by_urgency[urgency]['count'] += 1
-            by_urgency[urgency]['total_amount'] += quote['amount']
-
-        summary = {
-            'total_quotations': len(analyzed_quotations),
-            'total_amount': total_amount,
-            'by_urgency': by_urgency,
-            'days_ahead': days_ahead
-        }
+        summary = _summarize_quotations(analyzed_quotations, total_amount, days_ahead)
 
         return {
             'success': True,
@@ -171,22 +189,226 @@ def summarize_quotations(
             'summary': None,
             'error': f"Error analyzing quotations: {str(e)}"
         }
+    finally:
+        CLIENT_POOL.release(client)
+
+
+def _build_quotation_domain(min_amount: Optional[float], salesperson_id: Optional[int]) -> List:
+    """Build the sale.order domain for open quotations."""
+    domain = [
+        ('state', 'in', ['draft', 'sent']),  # Only quotations, not confirmed sales
+    ]
+
+    if min_amount:
+        domain.append(('amount_total', '>=', min_amount))
+    if salesperson_id:
+        domain.append(('user_id', '=', salesperson_id))
+
+    return domain
+
+
+def _bucket_domains(min_amount: Optional[float], salesperson_id: Optional[int]) -> Dict[str, List]:
+    """
+    Build one sale.order domain per urgency level.
+
+    The validity_date bounds match the levels _analyze_quotation assigns.
+
+    Returns:
+        dict: urgency level -> domain
+    """
+    base = _build_quotation_domain(min_amount, salesperson_id)
+    today = datetime.now().date()
+    in_7_days = (today + timedelta(days=7)).strftime('%Y-%m-%d')
+    in_14_days = (today + timedelta(days=14)).strftime('%Y-%m-%d')
+    today = today.strftime('%Y-%m-%d')
+
+    return {
+        'overdue': base + [('validity_date', '<', today)],
+        'today': base + [('validity_date', '=', today)],
+        'this_week': base + [('validity_date', '>', today), ('validity_date', '<=', in_7_days)],
+        'next_week': base + [('validity_date', '>', in_7_days), ('validity_date', '<=', in_14_days)],
+        'later': base + ['|', ('validity_date', '>', in_14_days), ('validity_date', '=', False)],
+    }
+
+
+def _bucket_calls(min_amount: Optional[float], salesperson_id: Optional[int], top_n: int) -> List[tuple]:
+    """
+    Build the independent execute_kw calls of a 'buckets' summary.
+
+    Returns:
+        list[tuple]: (level, group_call, rows_call) per urgency level, where
+                     group_call totals the level by state and rows_call
+                     reads its ``top_n`` largest quotations
+    """
+    return [
+        (
+            level,
+            ('sale.order', 'read_group', [domain, ['amount_total:sum'], ['state']], {'lazy': False}),
+            ('sale.order', 'search_read', [domain],
+             {'fields': QUOTATION_FIELDS, 'limit': top_n, 'order': 'amount_total desc, id asc'}),
+        )
+        for level, domain in _bucket_domains(min_amount, salesperson_id).items()
+    ]
+
+
+def _build_bucket_summary(
+    groups_by_level: Dict[str, List[Dict]],
+    rows_by_level: Dict[str, List[Dict]],
+    activities_by_quote: Dict[int, List[Dict]],
+    days_ahead: int
+) -> Dict:
+    """
+    Build the tool result of a 'buckets' summary.
+
+    Args:
+        groups_by_level (dict): urgency level -> read_group totals by state
+        rows_by_level (dict): urgency level -> its top quotations
+        activities_by_quote (dict): quotation ID -> its mail.activity records
+        days_ahead (int): Days to look ahead
+
+    Returns:
+        dict: Tool result
+    """
+    by_urgency = {}
+    analyzed_quotations = []
+
+    for level, groups in groups_by_level.items():
+        count = sum(group.get('__count', 0) for group in groups)
+        if not count:
+            continue
+
+        by_urgency[level] = {
+            'count': count,
+            'total_amount': sum(group.get('amount_total') or 0 for group in groups),
+            'by_state': {group['state']: group.get('__count', 0) for group in groups},
+            'returned': len(rows_by_level.get(level, []))
+        }
+        analyzed_quotations.extend(
+            _analyze_quotation(quote, activities_by_quote.get(quote['id'], []), days_ahead)
+            for quote in rows_by_level.get(level, [])
+        )
+
+    if not by_urgency:
+        return {
+            'success': True,
+            'quotations': [],
+            'summary': {'total_quotations': 0, 'total_amount': 0},
+            'error': 'No quotations found'
+        }
+
+    # Sort by urgency, largest first within a level
+    analyzed_quotations.sort(key=lambda x: (x['urgency_priority'], -x['amount']))
+
+    summary = {
+        'total_quotations': sum(level['count'] for level in by_urgency.values()),
+        'total_amount': sum(level['total_amount'] for level in by_urgency.values()),
+        'by_urgency': by_urgency,
+        'days_ahead': days_ahead,
+        'mode': 'buckets'
+    }
+
+    return {
+        'success': True,
+        'quotations': analyzed_quotations,
+        'summary': summary,
+        'error': None
+    }
+
+
+def _build_activity_domain(quotation_ids: List[int], days_ahead: int) -> List:
+    """Build the mail.activity domain for quotation activities due within ``days_ahead`` days."""
+    deadline = (datetime.now().date() + timedelta(days=days_ahead)).strftime('%Y-%m-%d')
+
+    return [
+        ('res_model', '=', 'sale.order'),
+        ('res_id', 'in', quotation_ids),
+        ('date_deadline', '<=', deadline),
+    ]
+
+
+def _load_activities(client: OdooAPIClient, quotation_ids: List[int], days_ahead: int) -> Dict[int, List[Dict]]:
+    """
+    Read the activities due within the window for all quotations.
+
+    One search_read per chunk of quotations (chunks run concurrently)
+    instead of one read per quotation, and activities outside the window
+    are not transferred.
+
+    Args:
+        client (OdooAPIClient): Authenticated API client
+        quotation_ids (list[int]): sale.order IDs
+        days_ahead (int): Days to look ahead
+
+    Returns:
+        dict: quotation ID -> its mail.activity records, by deadline
+    """
+    with client.batch() as batch:
+        futures = [batch.execute_kw(*call) for call in _activity_calls(quotation_ids, days_ahead)]
+
+    return _index_activities(activity for future in futures for activity in future.result())
+
+
+def _activity_calls(quotation_ids: List[int], days_ahead: int) -> List[tuple]:
+    """Build the execute_kw calls (model, method, args, kwargs) of _load_activities."""
+    return [
+        (
+            'mail.activity',
+            'search_read',
+            [_build_activity_domain(ids, days_ahead)],
+            {'fields': ACTIVITY_FIELDS, 'order': 'date_deadline asc, id asc'}
+        )
+        for ids in chunked(quotation_ids)
+    ]
+
+
+def _index_activities(activities) -> Dict[int, List[Dict]]:
+    """Group mail.activity records by the quotation they belong to."""
+    activities_by_quote = {}
+    for activity in activities:
+        activities_by_quote.setdefault(activity['res_id'], []).append(activity)
+
+    return activities_by_quote
+
+
+def _summarize_quotations(analyzed_quotations: List[Dict], total_amount: float, days_ahead: int) -> Dict:
+    """Sort analyses by urgency (in place) and build the summary."""
+    # Sort by urgency
+    analyzed_quotations.sort(key=lambda x: x['urgency_priority'])
+
+    # Calculate summary
+    by_urgency = {}
+    for quote in analyzed_quotations:
+        urgency = quote['urgency_level']
+        if urgency not in by_urgency:
+            by_urgency[urgency] = {
+                'count': 0,
+                'total_amount': 0
+            }
+        by_urgency[urgency]['count'] += 1
+        by_urgency[urgency]['total_amount'] += quote['amount']
+
+    summary = {
+        'total_quotations': len(analyzed_quotations),
+        'total_amount': total_amount,
+        'by_urgency': by_urgency,
+        'days_ahead': days_ahead
+    }
+
+    return summary
 
 
 def _analyze_quotation(
-    client: OdooAPIClient,
     quote: Dict,
-    days_ahead: int,
-    include_activities: bool
+    activity_data: List[Dict],
+    days_ahead: int
 ) -> Dict:
     """
     Analyze a quotation to determine urgency and actions needed.
 
     Args:
-        client (OdooAPIClient): Authenticated API client
         quote (dict): Quotation data
+        activity_data (list[dict]): The quotation's mail.activity records
         days_ahead (int): Days to look ahead
-        include_activities (bool): Include activities
 
     Returns:
         dict: Analysis result
@@ -215,27 +437,20 @@ def _analyze_quotation(
 
     urgency_info = URGENCY_LEVELS[urgency_level]
 
-    # Get activities if requested
+    # Pending activities within the look-ahead window
     activities = []
-    if include_activities and quote.get('activity_ids'):
-        activity_data = client.read(
-            'mail.activity',
-            quote['activity_ids'],
-            ['activity_type_id', 'summary', 'date_deadline', 'user_id']
-        )
-
-        for act in activity_data:
-            act_deadline = datetime.strptime(act['date_deadline'], '%Y-%m-%d').date()
-            days_until_act = (act_deadline - today).days
-
-            if days_until_act <= days_ahead:
-                activities.append({
-                    'type': act['activity_type_id'][1] if act.get('activity_type_id') else 'Activity',
-                    'summary': act.get('summary', ''),
-                    'deadline': act['date_deadline'],
-                    'days_until': days_until_act,
-                    'assigned_to': act['user_id'][1] if act.get('user_id') else 'Unassigned'
-                })
+    for act in activity_data:
+        act_deadline = datetime.strptime(act['date_deadline'], '%Y-%m-%d').date()
+        days_until_act = (act_deadline - today).days
+
+        if days_until_act <= days_ahead:
+            activities.append({
+                'type': act['activity_type_id'][1] if act.get('activity_type_id') else 'Activity',
+                'summary': act.get('summary', ''),
+                'deadline': act['date_deadline'],
+                'days_until': days_until_act,
+                'assigned_to': act['user_id'][1] if act.get('user_id') else 'Unassigned'
+            })
 
     # Build analysis
     analysis = {
@@ -334,6 +549,15 @@ QUOTATION_SUMMARY_TOOL = {
             "include_activities": {
                 "type": "boolean",
                 "description": "Include scheduled activities in analysis (default: true)"
+            },
+            "mode": {
+                "type": "string",
+                "enum": ["detailed", "buckets"],
+                "description": "'detailed' (default) analyzes every quotation; 'buckets' returns counts and totals per urgency level plus only the top_n largest quotations of each level (use for large pipelines)"
+            },
+            "top_n": {
+                "type": "integer",
+                "description": "With mode 'buckets': quotations detailed per urgency level (default: 10)"
             }
         },
         "required": ["url", "db", "username", "password"]
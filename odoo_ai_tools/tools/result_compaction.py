@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+Tool Result Compaction
+======================
+Keep tool results sent to Claude within a per-tool size budget.
+
+A result that fits its budget is sent as is. A larger one keeps its summary
+and as many leading rows as fit (tools return rows most relevant first),
+encoded column-wise so keys are not repeated on every row, plus a marker
+with the row counts and the totals of the rows left out. The full result is
+kept in a local ResultStore and Claude can page through it with the
+``fetch_tool_result`` tool.
+"""
+
+import csv
+import io
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+# Max serialized size (bytes, ~4 bytes per token) of a result sent to Claude
+RESULT_BUDGET_BYTES = 16000
+
+# Per-tool budgets (tools not listed use RESULT_BUDGET_BYTES)
+TOOL_RESULT_BUDGETS = {
+    'generate_sales_report': 12000,
+    'suggest_tax_deductions': 12000,
+    'detect_restock_needs': 12000,
+}
+
+# Where each tool's result rows are, as a key path
+TOOL_ROW_PATHS = {
+    'generate_sales_report': ('data',),
+    'create_invoice_from_sales': ('invoices_created',),
+    'suggest_tax_deductions': ('deductible_expenses',),
+    'summarize_quotations': ('quotations',),
+    'detect_restock_needs': ('data', 'products'),
+}
+
+# Full results kept per store (least recently used are dropped)
+RESULT_STORE_SIZE = 32
+
+# Row encodings
+RESULT_FORMATS = ('columnar', 'csv')
+
+FETCH_TOOL_NAME = 'fetch_tool_result'
+
+
+class ResultStore:
+    """Thread-safe LRU store of full tool results, addressed by reference."""
+
+    def __init__(self, max_results: int = RESULT_STORE_SIZE):
+        """
+        Initialize store.
+
+        Args:
+            max_results (int): Max results kept
+        """
+        self.max_results = max_results
+        self._lock = threading.Lock()
+        self._results = OrderedDict()  # ref -> (tool_name, result)
+
+    def put(self, tool_name: str, result: Dict) -> str:
+        """
+        Store a full result.
+
+        Args:
+            tool_name (str): Tool that produced it
+            result (dict): Full tool result
+
+        Returns:
+            str: Reference to fetch it back
+        """
+        ref = uuid.uuid4().hex[:12]
+
+        with self._lock:
+            self._results[ref] = (tool_name, result)
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+
+        return ref
+
+    def get(self, ref: str) -> Optional[tuple]:
+        """
+        Get a stored result.
+
+        Args:
+            ref (str): Reference returned by put
+
+        Returns:
+            tuple or None: (tool_name, result)
+        """
+        with self._lock:
+            entry = self._results.get(ref)
+            if entry is not None:
+                self._results.move_to_end(ref)
+            return entry
+
+    def clear(self):
+        """Drop all results."""
+        with self._lock:
+            self._results.clear()
+
+
+def compact_result(
+    tool_name: str,
+    result: Any,
+    store: Optional[ResultStore] = None,
+    budget: Optional[int] = None,
+    fmt: str = 'columnar'
+) -> str:
+    """
+    Serialize a tool result for Claude within the tool's budget.
+
+    Args:
+        tool_name (str): Tool that produced the result
+        result (dict): Tool result
+        store (ResultStore, optional): Where to keep the full result when
+            it is compacted (without a store it cannot be fetched back)
+        budget (int, optional): Max bytes (default: the tool's budget)
+        fmt (str): Row encoding when compacting, 'columnar' or 'csv'
+
+    Returns:
+        str: JSON content of the tool_result block
+    """
+    full = _dumps(result)
+    budget = budget or TOOL_RESULT_BUDGETS.get(tool_name, RESULT_BUDGET_BYTES)
+
+    path = TOOL_ROW_PATHS.get(tool_name)
+    rows = _get_path(result, path) if path and isinstance(result, dict) else None
+
+    if _size(full) <= budget or not isinstance(rows, list) or not rows:
+        return full
+
+    ref = store.put(tool_name, result) if store is not None else None
+
+    def build(count):
+        compacted = _set_path(result, path, _encode_rows(rows[:count], fmt))
+        marker = {
+            'rows_returned': count,
+            'rows_total': len(rows),
+            'omitted_totals': _numeric_totals(rows[count:]),
+        }
+        if ref:
+            marker['result_ref'] = ref
+            marker['hint'] = (
+                f"Only the first {count} rows are shown. Call {FETCH_TOOL_NAME} "
+                f"with result_ref='{ref}' and offset={count} for more."
+            )
+        compacted['_truncated'] = marker
+        return _dumps(compacted)
+
+    return _fit(build, len(rows), budget)
+
+
+def fetch_tool_result(
+    store: ResultStore,
+    result_ref: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    budget: int = RESULT_BUDGET_BYTES,
+    fmt: str = 'columnar'
+) -> Dict:
+    """
+    Read rows of a stored full result, within the budget.
+
+    Args:
+        store (ResultStore): Store holding the result
+        result_ref (str): Reference from a truncation marker
+        offset (int): First row to return
+        limit (int, optional): Max rows to return
+        fields (list[str], optional): Only these columns
+        budget (int): Max bytes of the response
+        fmt (str): Row encoding, 'columnar' or 'csv'
+
+    Returns:
+        dict: {
+            'success': bool,
+            'rows': dict or None,  # encoded rows
+            'rows_returned': int,
+            'rows_total': int,
+            'next_offset': int or None,
+            'error': str or None
+        }
+    """
+    entry = store.get(result_ref)
+    if entry is None:
+        return {
+            'success': False,
+            'rows': None,
+            'error': f"Unknown or expired result_ref: {result_ref}"
+        }
+
+    tool_name, result = entry
+    rows = _get_path(result, TOOL_ROW_PATHS.get(tool_name, ())) or []
+
+    offset = max(0, offset or 0)
+    page = rows[offset:offset + limit] if limit else rows[offset:]
+    if fields:
+        page = [{key: row.get(key) for key in fields} for row in page]
+
+    def build(count):
+        next_offset = offset + count if offset + count < len(rows) else None
+        return _dumps({
+            'success': True,
+            'tool': tool_name,
+            'result_ref': result_ref,
+            'offset': offset,
+            'rows': _encode_rows(page[:count], fmt),
+            'rows_returned': count,
+            'rows_total': len(rows),
+            'next_offset': next_offset,
+            'error': None
+        })
+
+    return json.loads(_fit(build, len(page), budget))
+
+
+def _fit(build, row_count: int, budget: int) -> str:
+    """Binary-search the largest row count whose serialization fits ``budget``."""
+    low, high = 0, row_count
+    best = build(0)
+
+    while low < high:
+        middle = (low + high + 1) // 2
+        content = build(middle)
+        if _size(content) <= budget:
+            low, best = middle, content
+        else:
+            high = middle - 1
+
+    return best
+
+
+def _size(content: str) -> int:
+    """Size in bytes of serialized content (UTF-8, as sent to the API)."""
+    return len(content.encode('utf-8'))
+
+
+def _encode_rows(rows: List[Dict], fmt: str) -> Dict:
+    """Encode rows column-wise (keys listed once) or as CSV text."""
+    columns = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+
+    values = [[row.get(key) for key in columns] for row in rows]
+
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(columns)
+        for row in values:
+            writer.writerow([
+                _dumps(value) if isinstance(value, (list, dict)) else value
+                for value in row
+            ])
+        return {'format': 'csv', 'csv': buffer.getvalue()}
+
+    return {'format': 'columnar', 'columns': columns, 'rows': values}
+
+
+def _numeric_totals(rows: List[Dict]) -> Dict[str, float]:
+    """Sum the numeric, non-ID columns of ``rows``."""
+    totals = {}
+    for row in rows:
+        for key, value in row.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if key == 'id' or key.endswith('_id') or key.endswith('_priority'):
+                continue
+            totals[key] = totals.get(key, 0) + value
+
+    return {key: round(value, 2) for key, value in totals.items()}
+
+
+def _get_path(data: Any, path: tuple) -> Any:
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _set_path(data: Dict, path: tuple, value: Any) -> Dict:
+    """Copy ``data`` with the value at ``path`` replaced (only the path is copied)."""
+    copy = dict(data)
+    if len(path) == 1:
+        copy[path[0]] = value
+    else:
+        copy[path[0]] = _set_path(data[path[0]], path[1:], value)
+    return copy
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+# Tool definition for Claude API
+FETCH_TOOL_RESULT_TOOL = {
+    "name": FETCH_TOOL_NAME,
+    "description": "Fetch more rows of an earlier tool result that was truncated (its '_truncated' marker has a result_ref). Use it only when the rows shown and the summary are not enough to answer.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "result_ref": {
+                "type": "string",
+                "description": "result_ref from the '_truncated' marker"
+            },
+            "offset": {
+                "type": "integer",
+                "description": "First row to return (default: 0)"
+            },
+            "limit": {
+                "type": "integer",
+                "description": "Max rows to return (optional)"
+            },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only return these columns (optional)"
+            }
+        },
+        "required": ["result_ref"]
+    }
+}
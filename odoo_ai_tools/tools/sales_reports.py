@@ -8,7 +8,20 @@ Generate sales reports from natural language using Claude + Odoo API.
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from .odoo_api_client import OdooAPIClient
+from .odoo_api_client import OdooAPIClient, CLIENT_POOL
+from .sales_rollup import SalesRollup, rollup_path
+
+
+# Fields read for sales orders and their lines
+ORDER_FIELDS = ['name', 'partner_id', 'date_order', 'amount_total', 'user_id', 'order_line']
+LINE_FIELDS = ['order_id', 'product_id', 'product_uom_qty', 'price_subtotal']
+
+# Field each group_by option groups on, and the model it is read from
+GROUP_BY_FIELDS = {
+    'product': ('sale.order.line', 'product_id'),
+    'customer': ('sale.order', 'partner_id'),
+    'salesperson': ('sale.order', 'user_id'),
+}
 
 
 def generate_sales_report(
@@ -20,7 +33,8 @@ def generate_sales_report(
     date_to: Optional[str] = None,
     group_by: str = 'product',
     product_ids: Optional[List[int]] = None,
-    partner_ids: Optional[List[int]] = None
+    partner_ids: Optional[List[int]] = None,
+    aggregation: str = 'server'
 ) -> Dict:
     """
     Generate sales report from natural language parameters.
@@ -37,6 +51,12 @@ def generate_sales_report(
         group_by (str): Group by 'product', 'customer', or 'salesperson'
         product_ids (list[int], optional): Filter by products
         partner_ids (list[int], optional): Filter by customers
+        aggregation (str): 'server' to group and sum in Odoo with read_group
+            (only totals are transferred), or 'client' to download orders and
+            lines and group them here, or 'rollup' to refresh a local store
+            with the orders changed since the last call and answer from its
+            per-day totals. 'rollup' falls back to 'server', and 'server' to
+            'client', if they fail.
 
     Returns:
         dict: {
@@ -51,10 +71,11 @@ def generate_sales_report(
         →
  date_from='2025-03-01', date_to='2025-07-31', group_by='product'
     """
+    client = None
+
     try:
-        # Initialize API client
-        client = OdooAPIClient(url, db, username, password)
-        client.authenticate()
+        # Get a pooled, authenticated API client
+        client = CLIENT_POOL.acquire(url, db, username, password)
 
         # Check permissions
         if not client.check_access_rights('sale.order', 'read'):
@@ -65,21 +86,56 @@ def generate_sales_report(
                 'error': f"User '{username}' lacks permission to read sales orders"
             }
 
-        # Build domain
-        domain = [('state', 'in', ['sale', 'done'])]  # Only confirmed sales
-
-        if date_from:
-            domain.append(('date_order', '>=', date_from))
-        if date_to:
-            domain.append(('date_order', '<=', date_to))
-        if partner_ids:
-            domain.append(('partner_id', 'in', partner_ids))
+        if aggregation == 'rollup':
+            try:
+                with SalesRollup(rollup_path(url, db, username)) as rollup:
+                    refreshed = rollup.refresh(client)
+                    report_data, order_count, line_count = rollup.report(
+                        group_by, date_from, date_to, product_ids, partner_ids
+                    )
+
+                return _build_rollup_report(
+                    report_data,
+                    order_count,
+                    line_count,
+                    refreshed,
+                    group_by=group_by,
+                    date_from=date_from,
+                    date_to=date_to
+                )
+
+            except PermissionError:
+                raise
+            except Exception:
+                # Store unavailable: aggregate in Odoo instead
+                aggregation = 'server'
+
+        if aggregation == 'server':
+            try:
+                with client.batch() as batch:
+                    futures = [
+                        batch.execute_kw(*call)
+                        for call in _server_report_calls(group_by, date_from, date_to, product_ids, partner_ids)
+                    ]
+
+                return _build_server_report(
+                    *[future.result() for future in futures],
+                    group_by=group_by,
+                    date_from=date_from,
+                    date_to=date_to
+                )
+
+            except PermissionError:
+                raise
+            except Exception:
+                # Grouped query not supported here: aggregate client-side
+                pass
 
         # Get sales orders
         orders = client.search_read(
             'sale.order',
-            domain,
-            ['name', 'partner_id', 'date_order', 'amount_total', 'user_id', 'order_line']
+            _build_order_domain(date_from, date_to, partner_ids),
+            ORDER_FIELDS
         )
 
         if not orders:
@@ -91,39 +147,13 @@ def generate_sales_report(
             }
 
         # Get order lines
-        all_line_ids = []
-        for order in orders:
-            all_line_ids.extend(order.get('order_line', []))
-
-        line_domain = [('id', 'in', all_line_ids)]
-        if product_ids:
-            line_domain.append(('product_id', 'in', product_ids))
-
         lines = client.search_read(
             'sale.order.line',
-            line_domain,
-            ['order_id', 'product_id', 'product_uom_qty', 'price_subtotal']
+            _build_line_domain(orders, product_ids),
+            LINE_FIELDS
         )
 
-        # Group data
-        if group_by == 'product':
-            report_data = _group_by_product(lines, client)
-        elif group_by == 'customer':
-            report_data = _group_by_customer(orders, lines, client)
-        elif group_by == 'salesperson':
-            report_data = _group_by_salesperson(orders, client)
-        else:
-            report_data = _group_by_product(lines, client)  # Default
-
-        # Calculate summary
-        summary = {
-            'total_sales': sum(item['total_amount'] for item in report_data),
-            'order_count': len(orders),
-            'line_count': len(lines),
-            'date_from': date_from or 'N/A',
-            'date_to': date_to or 'N/A',
-            'group_by': group_by
-        }
+        report_data, summary = _build_report(orders, lines, group_by, date_from, date_to)
 
         return {
             'success': True,
@@ -146,6 +176,251 @@ def generate_sales_report(
             'summary': None,
             'error': f"Error generating report: {str(e)}"
         }
+    finally:
+        CLIENT_POOL.release(client)
+
+
+def _build_order_domain(
+    date_from: Optional[str],
+    date_to: Optional[str],
+    partner_ids: Optional[List[int]]
+) -> List:
+    """Build the sale.order domain for confirmed sales in the period."""
+    domain = [('state', 'in', ['sale', 'done'])]  # Only confirmed sales
+
+    if date_from:
+        domain.append(('date_order', '>=', date_from))
+    if date_to:
+        domain.append(('date_order', '<=', date_to))
+    if partner_ids:
+        domain.append(('partner_id', 'in', partner_ids))
+
+    return domain
+
+
+def _build_line_domain(orders: List[Dict], product_ids: Optional[List[int]]) -> List:
+    """Build the sale.order.line domain for the lines of ``orders``."""
+    all_line_ids = []
+    for order in orders:
+        all_line_ids.extend(order.get('order_line', []))
+
+    line_domain = [('id', 'in', all_line_ids)]
+    if product_ids:
+        line_domain.append(('product_id', 'in', product_ids))
+
+    return line_domain
+
+
+def _build_report(
+    orders: List[Dict],
+    lines: List[Dict],
+    group_by: str,
+    date_from: Optional[str],
+    date_to: Optional[str]
+) -> tuple:
+    """
+    Group orders/lines and compute the report summary.
+
+    Returns:
+        tuple: (report_data, summary)
+    """
+    # Group data
+    if group_by == 'product':
+        report_data = _group_by_product(lines, None)
+    elif group_by == 'customer':
+        report_data = _group_by_customer(orders, lines, None)
+    elif group_by == 'salesperson':
+        report_data = _group_by_salesperson(orders, None)
+    else:
+        report_data = _group_by_product(lines, None)  # Default
+
+    # Calculate summary
+    summary = {
+        'total_sales': sum(item['total_amount'] for item in report_data),
+        'order_count': len(orders),
+        'line_count': len(lines),
+        'date_from': date_from or 'N/A',
+        'date_to': date_to or 'N/A',
+        'group_by': group_by,
+        'aggregation': 'client'
+    }
+
+    return report_data, summary
+
+
+def _build_period_line_domain(
+    date_from: Optional[str],
+    date_to: Optional[str],
+    product_ids: Optional[List[int]],
+    partner_ids: Optional[List[int]]
+) -> List:
+    """Build the sale.order.line domain for confirmed sales in the period."""
+    domain = [('order_id.state', 'in', ['sale', 'done'])]  # Only confirmed sales
+
+    if date_from:
+        domain.append(('order_id.date_order', '>=', date_from))
+    if date_to:
+        domain.append(('order_id.date_order', '<=', date_to))
+    if partner_ids:
+        domain.append(('order_id.partner_id', 'in', partner_ids))
+    if product_ids:
+        domain.append(('product_id', 'in', product_ids))
+
+    return domain
+
+
+def _server_report_calls(
+    group_by: str,
+    date_from: Optional[str],
+    date_to: Optional[str],
+    product_ids: Optional[List[int]],
+    partner_ids: Optional[List[int]]
+) -> List[tuple]:
+    """
+    Build the independent execute_kw calls of a server-side report.
+
+    Returns:
+        list[tuple]: (model, method, args, kwargs) for the grouped totals,
+                     the order count and the line count, in that order
+    """
+    order_domain = _build_order_domain(date_from, date_to, partner_ids)
+    line_domain = _build_period_line_domain(date_from, date_to, product_ids, partner_ids)
+
+    model, field = GROUP_BY_FIELDS.get(group_by, GROUP_BY_FIELDS['product'])
+    if model == 'sale.order':
+        group_call = (model, 'read_group', [order_domain, ['amount_total:sum'], [field]], {'lazy': False})
+    else:
+        group_call = (
+            model,
+            'read_group',
+            [line_domain, ['product_uom_qty:sum', 'price_subtotal:sum'], [field]],
+            {'lazy': False}
+        )
+
+    return [
+        group_call,
+        ('sale.order', 'search_count', [order_domain], {}),
+        ('sale.order.line', 'search_count', [line_domain], {}),
+    ]
+
+
+def _build_server_report(
+    groups: List[Dict],
+    order_count: int,
+    line_count: int,
+    group_by: str,
+    date_from: Optional[str],
+    date_to: Optional[str]
+) -> Dict:
+    """
+    Build the tool result from read_group totals.
+
+    Rows have the same shape as the client-side _group_by_* helpers.
+
+    Returns:
+        dict: Tool result
+    """
+    if not order_count:
+        return {
+            'success': True,
+            'data': [],
+            'summary': {'total_sales': 0, 'order_count': 0},
+            'error': None
+        }
+
+    _model, field = GROUP_BY_FIELDS.get(group_by, GROUP_BY_FIELDS['product'])
+    report_data = []
+
+    for group in groups:
+        if not group.get(field):
+            continue
+
+        group_id, group_name = group[field]
+
+        if field == 'product_id':
+            report_data.append({
+                'product_id': group_id,
+                'product_name': group_name,
+                'quantity_sold': group.get('product_uom_qty') or 0,
+                'total_amount': group.get('price_subtotal') or 0,
+                'line_count': group.get('__count', 0)
+            })
+        elif field == 'partner_id':
+            report_data.append({
+                'customer_id': group_id,
+                'customer_name': group_name,
+                'order_count': group.get('__count', 0),
+                'total_amount': group.get('amount_total') or 0
+            })
+        else:
+            report_data.append({
+                'salesperson_id': group_id,
+                'salesperson_name': group_name,
+                'order_count': group.get('__count', 0),
+                'total_amount': group.get('amount_total') or 0
+            })
+
+    # Sort by total amount descending
+    report_data.sort(key=lambda x: x['total_amount'], reverse=True)
+
+    summary = {
+        'total_sales': sum(item['total_amount'] for item in report_data),
+        'order_count': order_count,
+        'line_count': line_count,
+        'date_from': date_from or 'N/A',
+        'date_to': date_to or 'N/A',
+        'group_by': group_by,
+        'aggregation': 'server'
+    }
+
+    return {
+        'success': True,
+        'data': report_data,
+        'summary': summary,
+        'error': None
+    }
+
+
+def _build_rollup_report(
+    report_data: List[Dict],
+    order_count: int,
+    line_count: int,
+    refreshed: Dict,
+    group_by: str,
+    date_from: Optional[str],
+    date_to: Optional[str]
+) -> Dict:
+    """
+    Build the tool result from SalesRollup.report totals.
+
+    Returns:
+        dict: Tool result
+    """
+    if not order_count:
+        return {
+            'success': True,
+            'data': [],
+            'summary': {'total_sales': 0, 'order_count': 0},
+            'error': None
+        }
+
+    summary = {
+        'total_sales': sum(item['total_amount'] for item in report_data),
+        'order_count': order_count,
+        'line_count': line_count,
+        'date_from': date_from or 'N/A',
+        'date_to': date_to or 'N/A',
+        'group_by': group_by,
+        'aggregation': 'rollup',
+        'rollup_refreshed': refreshed
+    }
+
+    return {
+        'success': True,
+        'data': report_data,
+        'summary': summary,
+        'error': None
+    }
 
 
 def _group_by_product(lines: List[Dict], client: OdooAPIClient) -> List[Dict]:
@@ -289,6 +564,11 @@ SALES_REPORT_TOOL = {
                 "type": "array",
                 "items": {"type": "integer"},
                 "description": "Filter by specific customer IDs (optional)"
+            },
+            "aggregation": {
+                "type": "string",
+                "enum": ["server", "client", "rollup"],
+                "description": "Where to aggregate: 'server' (fast, default), 'client' (downloads every order line) or 'rollup' (incremental local totals, fastest for long or repeated date ranges)"
             }
         },
         "required": ["url", "db", "username", "password"]
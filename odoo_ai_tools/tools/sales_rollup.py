@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+"""
+Sales Rollup
+============
+Incremental, locally materialized sales totals for generate_sales_report.
+
+Confirmed orders and their lines are mirrored into a SQLite file together
+with per-day totals by product, customer and salesperson. Each refresh only
+downloads records whose ``write_date`` is newer than the last watermark, so
+a multi-year report costs O(changed rows) in RPC traffic instead of
+re-reading every historical line.
+
+Deletions are picked up through the order: cancelling an order drops it
+(and its lines), and lines removed from an order are dropped when the
+order is re-read. One store file is kept per url/db/user, since record
+rules make what a user can see user-specific.
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from .odoo_api_client import OdooAPIClient, chunked
+
+
+# Directory holding the rollup stores (created private to the Odoo user)
+ROLLUP_DIR = os.environ.get('ODOO_AI_ROLLUP_DIR') or os.path.join(tempfile.gettempdir(), 'odoo_ai_rollups')
+
+# Seconds re-read behind each watermark, to catch transactions that
+# committed after a later write_date was already seen
+WATERMARK_OVERLAP = 600
+
+CONFIRMED_STATES = ['sale', 'done']
+
+ROLLUP_ORDER_FIELDS = ['partner_id', 'user_id', 'date_order', 'amount_total', 'state', 'order_line', 'write_date']
+ROLLUP_LINE_FIELDS = ['order_id', 'product_id', 'product_uom_qty', 'price_subtotal', 'write_date']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY,
+    day TEXT NOT NULL,
+    partner_id INTEGER,
+    partner_name TEXT,
+    user_id INTEGER,
+    user_name TEXT,
+    amount REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_day ON orders (day);
+
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY,
+    order_id INTEGER NOT NULL,
+    product_id INTEGER,
+    product_name TEXT,
+    qty REAL NOT NULL,
+    amount REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lines_order ON lines (order_id);
+
+CREATE TABLE IF NOT EXISTS daily_products (
+    day TEXT NOT NULL,
+    product_id INTEGER NOT NULL,
+    product_name TEXT,
+    qty REAL NOT NULL,
+    amount REAL NOT NULL,
+    line_count INTEGER NOT NULL,
+    PRIMARY KEY (day, product_id)
+);
+
+CREATE TABLE IF NOT EXISTS daily_orders (
+    day TEXT NOT NULL,
+    group_by TEXT NOT NULL,
+    group_id INTEGER NOT NULL,
+    group_name TEXT,
+    order_count INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    PRIMARY KEY (day, group_by, group_id)
+);
+
+CREATE TABLE IF NOT EXISTS watermarks (
+    model TEXT PRIMARY KEY,
+    write_date TEXT NOT NULL
+);
+"""
+
+# Serializes refreshes of the same store within the process
+_STORE_LOCKS = defaultdict(threading.Lock)
+
+
+def rollup_path(url: str, db: str, username: str) -> str:
+    """
+    Get the store file for an Odoo identity.
+
+    Args:
+        url (str): Odoo server URL
+        db (str): Database name
+        username (str): User login
+
+    Returns:
+        str: Path of the SQLite file
+    """
+    digest = hashlib.sha256(f'{url}|{db}|{username}'.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(ROLLUP_DIR, f'sales_{digest}.sqlite')
+
+
+class SalesRollup:
+    """SQLite mirror of confirmed sales with per-day totals."""
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) a rollup store.
+
+        Args:
+            path (str): SQLite file path
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            _make_private_dir(directory)
+
+        # Stores hold sales data: readable by the owner only (SQLite
+        # journals get the same permissions)
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        os.chmod(path, 0o600)
+
+        self.path = path
+        self._lock = _STORE_LOCKS[os.path.abspath(path)]
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.executescript(SCHEMA)
+
+    def __enter__(self) -> 'SalesRollup':
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.close()
+        finally:
+            self._lock.release()
+
+    def close(self):
+        """Close the SQLite connection."""
+        self._db.close()
+
+    def refresh(self, client: OdooAPIClient) -> Dict:
+        """
+        Pull orders and lines changed since the last watermarks.
+
+        The first refresh loads every confirmed order. All changes are
+        applied in one transaction, so a failed refresh leaves the store
+        (and its watermarks) as they were.
+
+        Args:
+            client (OdooAPIClient): Authenticated client
+
+        Returns:
+            dict: {'orders': int, 'lines': int, 'days': int} rows re-read
+                  and days recomputed
+        """
+        order_mark = self._watermark('sale.order')
+        line_mark = self._watermark('sale.order.line')
+        new_marks = {'sale.order': order_mark, 'sale.order.line': line_mark}
+        touched_days = set()
+        touched_orders = set()
+        relink_orders = []
+        order_rows = line_rows = 0
+
+        with self._db:
+            # Orders: upsert confirmed ones, drop the rest with their lines
+            if order_mark:
+                order_domain = [('write_date', '>=', _overlap(order_mark))]
+            else:
+                order_domain = [('state', 'in', CONFIRMED_STATES)]
+
+            for page in client.search_read_paged('sale.order', order_domain, ROLLUP_ORDER_FIELDS):
+                for order in page:
+                    order_rows += 1
+                    new_marks['sale.order'] = max(new_marks['sale.order'] or '', order['write_date'])
+                    touched_days.update(self._order_days([order['id']]))
+
+                    if order['state'] not in CONFIRMED_STATES:
+                        self._db.execute('DELETE FROM orders WHERE id = ?', (order['id'],))
+                        self._db.execute('DELETE FROM lines WHERE order_id = ?', (order['id'],))
+                        continue
+
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (
+                            order['id'],
+                            order['date_order'][:10],
+                            *_many2one(order['partner_id']),
+                            *_many2one(order['user_id']),
+                            order.get('amount_total') or 0,
+                        )
+                    )
+                    touched_days.add(order['date_order'][:10])
+
+                    # Lines removed from the order
+                    line_ids = order.get('order_line') or []
+                    self._db.execute(
+                        f"DELETE FROM lines WHERE order_id = ? AND id NOT IN ({','.join('?' * len(line_ids))})",
+                        [order['id']] + line_ids
+                    )
+                    if order_mark:
+                        relink_orders.append(order['id'])
+
+            # Lines: changed lines, plus every line of re-read orders (a
+            # newly confirmed order's lines may predate the line watermark)
+            line_domain = [('order_id.state', 'in', CONFIRMED_STATES)]
+            if line_mark:
+                line_domain.append(('write_date', '>=', _overlap(line_mark)))
+
+            line_domains = [line_domain] + [
+                [('order_id', 'in', order_ids)] for order_ids in chunked(relink_orders)
+            ]
+
+            for domain in line_domains:
+                for page in client.search_read_paged('sale.order.line', domain, ROLLUP_LINE_FIELDS):
+                    for line in page:
+                        line_rows += 1
+                        new_marks['sale.order.line'] = max(new_marks['sale.order.line'] or '', line['write_date'])
+                        order_id = line['order_id'][0]
+                        touched_orders.add(order_id)
+
+                        self._db.execute(
+                            'INSERT OR REPLACE INTO lines VALUES (?, ?, ?, ?, ?, ?)',
+                            (
+                                line['id'],
+                                order_id,
+                                *_many2one(line['product_id']),
+                                line.get('product_uom_qty') or 0,
+                                line.get('price_subtotal') or 0,
+                            )
+                        )
+
+            touched_days.update(self._order_days(touched_orders))
+            self._recompute_days(touched_days)
+
+            for model, mark in new_marks.items():
+                if mark:
+                    self._db.execute('INSERT OR REPLACE INTO watermarks VALUES (?, ?)', (model, mark))
+
+        return {'orders': order_rows, 'lines': line_rows, 'days': len(touched_days)}
+
+    def report(
+        self,
+        group_by: str,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        product_ids: Optional[List[int]] = None,
+        partner_ids: Optional[List[int]] = None
+    ) -> tuple:
+        """
+        Answer a sales report from the store.
+
+        Rows have the same shape as sales_reports._build_server_report.
+        The period matches the server and client modes' domain
+        (date_from <= date_order <= date_to): a bare date_to is midnight,
+        so that day itself is not counted.
+
+        Args:
+            group_by (str): 'product', 'customer' or 'salesperson'
+            date_from (str, optional): Start date (YYYY-MM-DD)
+            date_to (str, optional): End date (YYYY-MM-DD)
+            product_ids (list[int], optional): Filter lines by products
+            partner_ids (list[int], optional): Filter by customers
+
+        Returns:
+            tuple: (report_data, order_count, line_count)
+        """
+        day_where, day_params = _day_filter('day', date_from, date_to)
+        order_where, order_params = _day_filter('o.day', date_from, date_to)
+        if partner_ids:
+            order_where += f" AND o.partner_id IN ({','.join('?' * len(partner_ids))})"
+            order_params += list(partner_ids)
+
+        line_where, line_params = order_where, list(order_params)
+        if product_ids:
+            line_where += f" AND l.product_id IN ({','.join('?' * len(product_ids))})"
+            line_params += list(product_ids)
+
+        if group_by not in ('customer', 'salesperson'):
+            if partner_ids:
+                rows = self._db.execute(
+                    'SELECT l.product_id, MAX(l.product_name), SUM(l.qty), SUM(l.amount), COUNT(*) '
+                    'FROM lines l JOIN orders o ON o.id = l.order_id '
+                    f'WHERE l.product_id IS NOT NULL AND {line_where} GROUP BY l.product_id',
+                    line_params
+                )
+            else:
+                where, params = day_where, list(day_params)
+                if product_ids:
+                    where += f" AND product_id IN ({','.join('?' * len(product_ids))})"
+                    params += list(product_ids)
+                rows = self._db.execute(
+                    'SELECT product_id, MAX(product_name), SUM(qty), SUM(amount), SUM(line_count) '
+                    f'FROM daily_products WHERE {where} GROUP BY product_id',
+                    params
+                )
+
+            report_data = [
+                {
+                    'product_id': product_id,
+                    'product_name': name,
+                    'quantity_sold': qty,
+                    'total_amount': amount,
+                    'line_count': count
+                }
+                for product_id, name, qty, amount, count in rows
+            ]
+        else:
+            prefix = 'customer' if group_by == 'customer' else 'salesperson'
+            column = 'partner' if group_by == 'customer' else 'user'
+
+            if partner_ids:
+                rows = self._db.execute(
+                    f'SELECT o.{column}_id, MAX(o.{column}_name), COUNT(*), SUM(o.amount) '
+                    f'FROM orders o WHERE o.{column}_id IS NOT NULL AND {order_where} GROUP BY o.{column}_id',
+                    order_params
+                )
+            else:
+                rows = self._db.execute(
+                    'SELECT group_id, MAX(group_name), SUM(order_count), SUM(amount) '
+                    f'FROM daily_orders WHERE group_by = ? AND {day_where} GROUP BY group_id',
+                    [group_by] + day_params
+                )
+
+            report_data = [
+                {
+                    f'{prefix}_id': group_id,
+                    f'{prefix}_name': name,
+                    'order_count': count,
+                    'total_amount': amount
+                }
+                for group_id, name, count, amount in rows
+            ]
+
+        # Sort by total amount descending
+        report_data.sort(key=lambda x: x['total_amount'], reverse=True)
+
+        order_count = self._db.execute(
+            f'SELECT COUNT(*) FROM orders o WHERE {order_where}', order_params
+        ).fetchone()[0]
+        line_count = self._db.execute(
+            f'SELECT COUNT(*) FROM lines l JOIN orders o ON o.id = l.order_id WHERE {line_where}', line_params
+        ).fetchone()[0]
+
+        return report_data, order_count, line_count
+
+    def _watermark(self, model: str) -> Optional[str]:
+        row = self._db.execute('SELECT write_date FROM watermarks WHERE model = ?', (model,)).fetchone()
+        return row[0] if row else None
+
+    def _order_days(self, order_ids) -> set:
+        """Get the days currently stored for ``order_ids``."""
+        days = set()
+        for ids in chunked(list(order_ids), 500):
+            days.update(
+                day for (day,) in self._db.execute(
+                    f"SELECT DISTINCT day FROM orders WHERE id IN ({','.join('?' * len(ids))})", ids
+                )
+            )
+        return days
+
+    def _recompute_days(self, days: set):
+        """Rebuild the per-day totals of ``days`` from the stored orders and lines."""
+        if not days:
+            return
+
+        self._db.execute('CREATE TEMP TABLE IF NOT EXISTS touched_days (day TEXT PRIMARY KEY)')
+        self._db.execute('DELETE FROM touched_days')
+        self._db.executemany('INSERT INTO touched_days VALUES (?)', [(day,) for day in days])
+
+        self._db.execute('DELETE FROM daily_products WHERE day IN (SELECT day FROM touched_days)')
+        self._db.execute(
+            'INSERT INTO daily_products '
+            'SELECT o.day, l.product_id, MAX(l.product_name), SUM(l.qty), SUM(l.amount), COUNT(*) '
+            'FROM lines l JOIN orders o ON o.id = l.order_id '
+            'WHERE o.day IN (SELECT day FROM touched_days) AND l.product_id IS NOT NULL '
+            'GROUP BY o.day, l.product_id'
+        )
+
+        self._db.execute('DELETE FROM daily_orders WHERE day IN (SELECT day FROM touched_days)')
+        for group_by, column in (('customer', 'partner'), ('salesperson', 'user')):
+            self._db.execute(
+                'INSERT INTO daily_orders '
+                f'SELECT day, ?, {column}_id, MAX({column}_name), COUNT(*), SUM(amount) '
+                f'FROM orders WHERE day IN (SELECT day FROM touched_days) AND {column}_id IS NOT NULL '
+                f'GROUP BY day, {column}_id',
+                (group_by,)
+            )
+
+
+def _many2one(value) -> tuple:
+    """Split an Odoo many2one value into (id, name)."""
+    if value:
+        return value[0], value[1]
+    return None, None
+
+
+def _overlap(write_date: str) -> str:
+    """Move a watermark back by WATERMARK_OVERLAP seconds."""
+    moment = datetime.strptime(write_date[:19], '%Y-%m-%d %H:%M:%S')
+    return (moment - timedelta(seconds=WATERMARK_OVERLAP)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _day_filter(column: str, date_from: Optional[str], date_to: Optional[str]) -> tuple:
+    """Build a SQL condition on a day column for the report period."""
+    where, params = ['1 = 1'], []
+    if date_from:
+        where.append(f'{column} >= ?')
+        params.append(date_from[:10])
+    if date_to:
+        # Days are whole: a time after midnight counts the day of date_to
+        until_midnight = date_to[10:].strip() in ('', '00:00', '00:00:00')
+        where.append(f"{column} {'<' if until_midnight else '<='} ?")
+        params.append(date_to[:10])
+    return ' AND '.join(where), params
+
+
+def _make_private_dir(directory: str):
+    """Create ``directory`` (mode 0o700) and make sure no other user can read it."""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    # The default directory lives in the shared temp dir, where another
+    # user may have created it first
+    if hasattr(os, 'getuid') and os.stat(directory).st_uid != os.getuid():
+        raise PermissionError(
+            f"Rollup directory {directory} belongs to another user; set ODOO_AI_ROLLUP_DIR"
+        )
+    os.chmod(directory, 0o700)
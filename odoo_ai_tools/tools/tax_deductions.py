@@ -6,12 +6,35 @@ Suggest tax-deductible expenses from accounting entries.
 Focused on Mexican tax regulations (SAT).
 """
 
+import hashlib
+import heapq
+import itertools
 import json
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from .odoo_api_client import OdooAPIClient
+from typing import Dict, FrozenSet, Iterable, List, Optional
+from .odoo_api_client import OdooAPIClient, CLIENT_POOL
 
 
+# Fields read for each expense journal item
+MOVE_LINE_FIELDS = ['move_id', 'name', 'date', 'debit', 'partner_id', 'account_id']
+
+# Journal items read per page while scanning the period
+MOVE_LINE_PAGE_SIZE = 1000
+
+# Default cap on detailed expenses returned (totals always cover every line)
+MAX_DETAILED_ROWS = 500
+
+# Max partners + descriptions remembered by the category cache
+CATEGORY_CACHE_SIZE = 50000
+
+# Optional JSON file the category cache is loaded from and saved to
+CATEGORY_CACHE_PATH = os.environ.get('ODOO_AI_CATEGORY_CACHE')
+
 # Deductible expense categories (Mexico SAT)
 DEDUCTIBLE_CATEGORIES = {
     'office_supplies': {
@@ -67,6 +90,61 @@ DEDUCTIBLE_CATEGORIES = {
 }
 
 
+# Accents left as separate marks by NFKD decomposition ('í' -> 'i' + U+0301)
+COMBINING_MARKS = re.compile('[\u0300-\u036f]+')
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Endings a keyword may take ('seguro' matches 'seguros')
+PLURAL_SUFFIXES = ('', 's', 'es')
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents, so 'Papelería' and 'papeleria' compare equal."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    return COMBINING_MARKS.sub('', unicodedata.normalize('NFKD', text))
+
+
+def _compile_category_words(categories: Dict) -> Dict[str, int]:
+    """
+    Build the keyword table of the category matcher.
+
+    Every accent-folded keyword, and its plural forms, maps to the priority
+    of its category (its position in ``categories``; lower wins). Keywords
+    are matched as whole words, so 'gas' no longer matches 'gastos'.
+    A line is matched with one dict lookup per word instead of one
+    substring scan per keyword.
+
+    Args:
+        categories (dict): DEDUCTIBLE_CATEGORIES-shaped definitions
+
+    Returns:
+        dict: word -> category priority
+    """
+    words = {}
+    for priority, cat_data in enumerate(categories.values()):
+        for keyword in cat_data['keywords']:
+            for suffix in PLURAL_SUFFIXES:
+                words.setdefault(_fold(keyword) + suffix, priority)
+    return words
+
+
+# Built once at import: keyword table, and categories by priority
+CATEGORY_WORDS = _compile_category_words(DEDUCTIBLE_CATEGORIES)
+CATEGORIES_BY_PRIORITY = list(DEDUCTIBLE_CATEGORIES)
+
+# Shared match results for lines with no or one category (most lines)
+NO_PRIORITIES = frozenset()
+SINGLE_PRIORITIES = [frozenset([priority]) for priority in range(len(CATEGORIES_BY_PRIORITY))]
+
+# Identifies the keyword table, so a persisted cache built from other keywords is ignored
+CATEGORY_WORDS_SIGNATURE = hashlib.sha256(
+    json.dumps(sorted(CATEGORY_WORDS.items())).encode('utf-8')
+).hexdigest()[:16]
+
+
 def suggest_tax_deductions(
     url: str,
     db: str,
@@ -75,7 +153,8 @@ def suggest_tax_deductions(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     min_amount: Optional[float] = None,
-    include_categories: Optional[List[str]] = None
+    include_categories: Optional[List[str]] = None,
+    max_detailed_rows: Optional[int] = MAX_DETAILED_ROWS
 ) -> Dict:
     """
     Suggest tax-deductible expenses from accounting entries (Mexico).
@@ -91,6 +170,9 @@ def suggest_tax_deductions(
         date_to (str, optional): End date (YYYY-MM-DD)
         min_amount (float, optional): Minimum amount to consider
         include_categories (list[str], optional): Specific categories to check
+        max_detailed_rows (int, optional): Return only the most recent N
+            deductible expenses (None for all). The summary totals always
+            cover every expense of the period.
 
     Returns:
         dict: {
@@ -104,10 +186,11 @@ def suggest_tax_deductions(
         "What recent expenses can be tax deductible?"
         → date_from=last_month, date_to=today
     """
+    client = None
+
     try:
-        # Initialize API client
-        client = OdooAPIClient(url, db, username, password)
-        client.authenticate()
+        # Get a pooled, authenticated API client
+        client = CLIENT_POOL.acquire(url, db, username, password)
 
         # Check permissions
         if not client.check_access_rights('account.move.line', 'read'):
@@ -119,33 +202,159 @@ def suggest_tax_deductions(
             }
 
         # Default dates (last 3 months if not specified)
-        if not date_from:
-            date_from = (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d')
-        if not date_to:
-            date_to = datetime.now().strftime('%Y-%m-%d')
-
-        # Build domain for expense entries
-        domain = [
-            ('move_id.move_type', 'in', ['in_invoice', 'in_refund']),  # Vendor bills
-            ('move_id.state', '=', 'posted'),  # Posted only
-            ('date', '>=', date_from),
-            ('date', '<=', date_to),
-            ('debit', '>', 0)  # Expense entries (debit > 0)
-        ]
-
-        if min_amount:
-            domain.append(('debit', '>=', min_amount))
-
-        # Get account move lines
-        move_lines = client.search_read(
-            'account.move.line',
-            domain,
-            ['move_id', 'name', 'date', 'debit', 'partner_id', 'account_id'],
-            limit=500,
-            order='date desc'
-        )
-
-        if not move_lines:
+        date_from, date_to = _default_period(date_from, date_to)
+
+        # Stream all move lines of the period through the categorizer
+        totals = DeductionTotals(include_categories, max_detailed_rows)
+        for page in iter_expense_lines(client, date_from, date_to, min_amount):
+            totals.add(page)
+
+        CATEGORY_CACHE.save()
+
+        return totals.result(date_from, date_to)
+
+    except PermissionError as e:
+        return {
+            'success': False,
+            'deductible_expenses': None,
+            'summary': None,
+            'error': str(e)
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'deductible_expenses': None,
+            'summary': None,
+            'error': f"Error analyzing deductions: {str(e)}"
+        }
+    finally:
+        CLIENT_POOL.release(client)
+
+
+def _default_period(date_from: Optional[str], date_to: Optional[str]) -> tuple:
+    """Default to the last 3 months when dates are not specified."""
+    if not date_from:
+        date_from = (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d')
+    if not date_to:
+        date_to = datetime.now().strftime('%Y-%m-%d')
+
+    return date_from, date_to
+
+
+def _build_expense_domain(date_from: str, date_to: str, min_amount: Optional[float]) -> List:
+    """Build the account.move.line domain for posted vendor-bill expenses."""
+    domain = [
+        ('move_id.move_type', 'in', ['in_invoice', 'in_refund']),  # Vendor bills
+        ('move_id.state', '=', 'posted'),  # Posted only
+        ('date', '>=', date_from),
+        ('date', '<=', date_to),
+        ('debit', '>', 0)  # Expense entries (debit > 0)
+    ]
+
+    if min_amount:
+        domain.append(('debit', '>=', min_amount))
+
+    return domain
+
+
+def iter_expense_lines(
+    client: OdooAPIClient,
+    date_from: str,
+    date_to: str,
+    min_amount: Optional[float] = None,
+    page_size: int = MOVE_LINE_PAGE_SIZE
+) -> Iterable[List[Dict]]:
+    """
+    Iterate over every expense journal item of the period, page by page.
+
+    Args:
+        client (OdooAPIClient): Authenticated API client
+        date_from (str): Start date (YYYY-MM-DD)
+        date_to (str): End date (YYYY-MM-DD)
+        min_amount (float, optional): Minimum amount to consider
+        page_size (int): Journal items per page
+
+    Yields:
+        list[dict]: account.move.line data
+    """
+    return client.search_read_paged(
+        'account.move.line',
+        _build_expense_domain(date_from, date_to, min_amount),
+        MOVE_LINE_FIELDS,
+        page_size=page_size
+    )
+
+
+class DeductionTotals:
+    """
+    Running deduction totals over pages of journal items.
+
+    Memory stays constant whatever the number of lines: only the per-category
+    totals and the ``max_detailed_rows`` most recent expenses are kept.
+    """
+
+    def __init__(
+        self,
+        include_categories: Optional[List[str]] = None,
+        max_detailed_rows: Optional[int] = MAX_DETAILED_ROWS,
+        cache: Optional['CategoryCache'] = None
+    ):
+        """
+        Initialize totals.
+
+        Args:
+            include_categories (list[str], optional): Filter by categories
+            max_detailed_rows (int, optional): Detailed expenses to keep (None for all)
+            cache (CategoryCache, optional): Match cache (default: the shared CATEGORY_CACHE)
+        """
+        self.include_categories = include_categories
+        self.max_detailed_rows = max_detailed_rows
+        self.cache = CATEGORY_CACHE if cache is None else cache
+        self.lines_scanned = 0
+        self.entry_count = 0
+        self.total_deductible = 0
+        self.by_category = {}
+        self._rows = []  # min-heap of (date, scan order, expense)
+        self._order = itertools.count()
+
+    def add(self, move_lines: List[Dict]):
+        """
+        Categorize a page of journal items and add it to the totals.
+
+        Args:
+            move_lines (list[dict]): account.move.line data
+        """
+        self.lines_scanned += len(move_lines)
+
+        for expense in _categorize_expenses(move_lines, self.include_categories, self.cache):
+            self.entry_count += 1
+            self.total_deductible += expense['amount']
+
+            category = self.by_category.setdefault(expense['category'], {'count': 0, 'total_amount': 0})
+            category['count'] += 1
+            category['total_amount'] += expense['amount']
+
+            # Keep the most recent expenses (lines are scanned in id order)
+            item = (expense['date'], next(self._order), expense)
+            if self.max_detailed_rows is None:
+                self._rows.append(item)
+            elif len(self._rows) < self.max_detailed_rows:
+                heapq.heappush(self._rows, item)
+            elif self.max_detailed_rows and item[:2] > self._rows[0][:2]:
+                heapq.heapreplace(self._rows, item)
+
+    def result(self, date_from: str, date_to: str) -> Dict:
+        """
+        Build the tool result.
+
+        Args:
+            date_from (str): Start date of the period
+            date_to (str): End date of the period
+
+        Returns:
+            dict: Tool result, detailed expenses most recent first
+        """
+        if not self.lines_scanned:
             return {
                 'success': True,
                 'deductible_expenses': [],
@@ -153,59 +362,193 @@ def suggest_tax_deductions(
                 'error': 'No expenses found in the specified period'
             }
 
-        # Categorize expenses
-        categorized_expenses = _categorize_expenses(
-            move_lines,
-            include_categories
-        )
-
-        # Calculate summary
-        total_deductible = sum(exp['amount'] for exp in categorized_expenses)
-        by_category = {}
-        for exp in categorized_expenses:
-            cat = exp['category']
-            if cat not in by_category:
-                by_category[cat] = {
-                    'count': 0,
-                    'total_amount': 0
-                }
-            by_category[cat]['count'] += 1
-            by_category[cat]['total_amount'] += exp['amount']
+        rows = sorted(self._rows, key=lambda item: item[:2], reverse=True)
+        deductible_expenses = [expense for _date, _order, expense in rows]
 
         summary = {
-            'total_deductible': total_deductible,
-            'entry_count': len(categorized_expenses),
+            'total_deductible': self.total_deductible,
+            'entry_count': self.entry_count,
             'date_from': date_from,
             'date_to': date_to,
-            'by_category': by_category
+            'by_category': self.by_category,
+            'lines_scanned': self.lines_scanned,
+            'detailed_rows': len(deductible_expenses)
         }
 
         return {
             'success': True,
-            'deductible_expenses': categorized_expenses,
+            'deductible_expenses': deductible_expenses,
             'summary': summary,
             'error': None
         }
 
-    except PermissionError as e:
-        return {
-            'success': False,
-            'deductible_expenses': None,
-            'summary': None,
-            'error': str(e)
-        }
-    except Exception as e:
-        return {
-            'success': False,
-            'deductible_expenses': None,
-            'summary': None,
-            'error': f"Error analyzing deductions: {str(e)}"
-        }
+
+class CategoryCache:
+    """
+    LRU memo of keyword matches per partner and per line description.
+
+    Bills from the same vendor, and recurring descriptions, are matched
+    once and then resolved with a dict lookup. Matches are stored as the
+    set of categories found (not just the best one), so results stay
+    exact under any include_categories filter. Partners are re-matched
+    when their name changes. Descriptions are persisted by digest only,
+    so the cache file holds no line text.
+    """
+
+    def __init__(self, max_entries: int = CATEGORY_CACHE_SIZE, path: Optional[str] = None):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries (int): Max partners + descriptions remembered
+            path (str, optional): JSON file to warm the cache from and save it to
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # ('partner', id) -> (name, priorities) / description -> priorities
+        self._persisted = {}  # description digest -> priorities, loaded from ``path``
+        self._loaded = False
+        self._dirty = False
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def partner_priorities(self, partner_id: int, partner_name: str) -> FrozenSet[int]:
+        """Get the category priorities matched by a partner's name."""
+        key = ('partner', partner_id)
+        entry = self._get(key)
+        if entry is not None and entry[0] == partner_name:
+            return entry[1]
+
+        priorities = _match_priorities(partner_name)
+        self._put(key, (partner_name, priorities))
+        return priorities
+
+    def description_priorities(self, description: str) -> FrozenSet[int]:
+        """Get the category priorities matched by a line description."""
+        priorities = self._get(description)
+        if priorities is not None:
+            return priorities
+
+        priorities = self._persisted.get(_digest(description)) if self._persisted else None
+        if priorities is None:
+            priorities = _match_priorities(description)
+        self._put(description, priorities)
+        return priorities
+
+    def load(self):
+        """Warm the cache from ``path``, if it exists and matches the current keywords."""
+        with self._lock:
+            self._loaded = True
+            if not self.path or not os.path.exists(self.path):
+                return
+
+            try:
+                with open(self.path, encoding='utf-8') as cache_file:
+                    data = json.load(cache_file)
+            except (OSError, ValueError):
+                return
+
+            if data.get('signature') != CATEGORY_WORDS_SIGNATURE:
+                return
+
+            for partner_id, (name, categories) in data.get('partners', {}).items():
+                self._entries[('partner', int(partner_id))] = (name, _priorities_of(categories))
+            for digest, categories in data.get('descriptions', {}).items():
+                self._persisted[digest] = _priorities_of(categories)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self):
+        """Write the cache to ``path`` (no-op without a path or new entries)."""
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+
+            # Persisted descriptions not used this run come first (least
+            # recently used), then this run's entries in LRU order
+            partners = {}
+            descriptions = dict(self._persisted)
+            for key, value in self._entries.items():
+                if isinstance(key, tuple):
+                    partners[str(key[1])] = [value[0], _categories_of(value[1])]
+                else:
+                    digest = _digest(key)
+                    descriptions.pop(digest, None)
+                    descriptions[digest] = value
+
+            excess = len(partners) + len(descriptions) - self.max_entries
+            for digest in list(itertools.islice(descriptions, max(0, excess))):
+                del descriptions[digest]
+
+            data = {
+                'signature': CATEGORY_WORDS_SIGNATURE,
+                'partners': partners,
+                'descriptions': {
+                    digest: _categories_of(priorities) for digest, priorities in descriptions.items()
+                },
+            }
+            self._dirty = False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write then rename, so a concurrent reader never sees a partial file
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(data, cache_file)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._persisted.clear()
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters.
+
+        Returns:
+            dict: hits, misses, entries
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+    def _get(self, key):
+        if not self._loaded:
+            self.load()
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def _put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._dirty = True
+
+            # Evict least recently used entries
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# Shared cache used by suggest_tax_deductions (persisted if CATEGORY_CACHE_PATH is set)
+CATEGORY_CACHE = CategoryCache(path=CATEGORY_CACHE_PATH)
 
 
 def _categorize_expenses(
     move_lines: List[Dict],
-    include_categories: Optional[List[str]] = None
+    include_categories: Optional[List[str]] = None,
+    cache: Optional[CategoryCache] = None
 ) -> List[Dict]:
     """
     Categorize expenses based on description keywords.
@@ -213,31 +556,23 @@ def _categorize_expenses(
     Args:
         move_lines (list[dict]): Account move lines
         include_categories (list[str], optional): Filter by categories
+        cache (CategoryCache, optional): Match cache (default: one for this call only)
 
     Returns:
         list[dict]: Categorized expenses
     """
     categorized = []
+    allowed = set(include_categories) if include_categories else None
+    if cache is None:
+        cache = CategoryCache()
 
     for line in move_lines:
-        description = (line.get('name') or '').lower()
-        partner_name = ''
+        # Try to match category (description and partner name)
+        priorities = cache.description_priorities(line.get('name') or '')
         if line.get('partner_id'):
-            partner_name = line['partner_id'][1].lower()
-
-        # Try to match category
-        matched_category = None
-        for cat_key, cat_data in DEDUCTIBLE_CATEGORIES.items():
-            if include_categories and cat_key not in include_categories:
-                continue
+            priorities = priorities | cache.partner_priorities(*line['partner_id'][:2])
 
-            for keyword in cat_data['keywords']:
-                if keyword in description or keyword in partner_name:
-                    matched_category = cat_key
-                    break
-
-            if matched_category:
-                break
+        matched_category = _best_category(priorities, allowed)
 
         # If matched, add to results
         if matched_category:
@@ -258,6 +593,57 @@ def _categorize_expenses(
     return categorized
 
 
+def _match_category(text: str, allowed: Optional[set] = None) -> Optional[str]:
+    """
+    Find the deductible category of an expense text.
+
+    Args:
+        text (str): Line description and partner name
+        allowed (set, optional): Only consider these categories
+
+    Returns:
+        str or None: Highest-priority matching category
+    """
+    return _best_category(_match_priorities(text), allowed)
+
+
+def _match_priorities(text: str) -> FrozenSet[int]:
+    """Get the priorities of all categories whose keywords appear in ``text``."""
+    hits = [CATEGORY_WORDS[word] for word in WORD_PATTERN.findall(_fold(text)) if word in CATEGORY_WORDS]
+    if not hits:
+        return NO_PRIORITIES
+    if len(hits) == 1:
+        return SINGLE_PRIORITIES[hits[0]]
+    return frozenset(hits)
+
+
+def _best_category(priorities: FrozenSet[int], allowed: Optional[set] = None) -> Optional[str]:
+    """Pick the highest-priority (lowest number) allowed category."""
+    if allowed is None:
+        return CATEGORIES_BY_PRIORITY[min(priorities)] if priorities else None
+
+    for priority in sorted(priorities):
+        category = CATEGORIES_BY_PRIORITY[priority]
+        if category in allowed:
+            return category
+    return None
+
+
+def _digest(description: str) -> str:
+    """Short digest of a line description, used as its persisted cache key."""
+    return hashlib.blake2b(description.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _priorities_of(categories: List[str]) -> FrozenSet[int]:
+    """Convert persisted category keys to priorities."""
+    return frozenset(CATEGORIES_BY_PRIORITY.index(category) for category in categories)
+
+
+def _categories_of(priorities: FrozenSet[int]) -> List[str]:
+    """Convert priorities to category keys for persisting."""
+    return [CATEGORIES_BY_PRIORITY[priority] for priority in sorted(priorities)]
+
+
 # Tool definition for Claude API
 TAX_DEDUCTIONS_TOOL = {
     "name": "suggest_tax_deductions",
@@ -300,6 +686,10 @@ TAX_DEDUCTIONS_TOOL = {
                     "enum": list(DEDUCTIBLE_CATEGORIES.keys())
                 },
                 "description": "Specific expense categories to analyze (optional, analyzes all if not specified)"
+            },
+            "max_detailed_rows": {
+                "type": "integer",
+                "description": "Max number of detailed expenses to return, most recent first (optional, default 500); totals always cover the whole period"
             }
         },
         "required": ["url", "db", "username", "password"]
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Tool Result Cache
+=================
+TTL + LRU cache of tool results, shared by all orchestrators in the process.
+
+Results are keyed by tool name, the Odoo identity (url, db, username and a
+digest of the password) and the normalized tool arguments; the password
+itself never appears in the key.
+Entries are stored as JSON so the cache's memory use is measured exactly
+and cached results cannot be mutated by callers.
+
+Invalidations bump a generation counter per url/db. A result computed by a
+call that started before an invalidation is not stored, so a report that
+ran concurrently with an invoice creation cannot re-cache pre-invoice data.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+# Seconds a successful result stays valid, per tool (0 = never cached)
+TOOL_CACHE_TTLS = {
+    'generate_sales_report': 300,
+    'summarize_quotations': 120,
+    'suggest_tax_deductions': 600,
+    'detect_restock_needs': 300,
+    'create_invoice_from_sales': 0,  # Writes data
+}
+
+# Tools whose execution makes cached results of other tools stale
+TOOL_CACHE_INVALIDATES = {
+    'create_invoice_from_sales': ['generate_sales_report', 'summarize_quotations'],
+}
+
+# Upper bound on the cache's total size (bytes of serialized results)
+TOOL_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Tool arguments that identify the caller rather than the query
+CREDENTIAL_KEYS = ('url', 'db', 'username', 'password')
+
+
+class ToolResultCache:
+    """Thread-safe TTL + LRU cache of tool results with hit/miss counters."""
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        invalidates: Optional[Dict[str, List[str]]] = None,
+        max_bytes: int = TOOL_CACHE_MAX_BYTES
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            ttls (dict, optional): Seconds to keep results per tool name
+            invalidates (dict, optional): Tool name -> tool names it makes stale
+            max_bytes (int): Max total size of cached results
+        """
+        self.ttls = dict(TOOL_CACHE_TTLS if ttls is None else ttls)
+        self.invalidates = dict(TOOL_CACHE_INVALIDATES if invalidates is None else invalidates)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, payload)
+        self._generations = {}  # (url, db) -> invalidation count
+        self._global_generation = 0  # invalidations of all servers/databases
+        self._size = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    @staticmethod
+    def make_key(tool_name: str, tool_input: Dict) -> tuple:
+        """
+        Build the cache key for a tool call.
+
+        Credentials are dropped from the arguments and kept as an identity
+        of url/db/username plus a password digest, so a wrong password never
+        hits another session's entry. Lists of scalars are sorted so that
+        e.g. product_ids=[2, 1] and [1, 2] share an entry.
+
+        Args:
+            tool_name (str): Tool name
+            tool_input (dict): Tool arguments, including Odoo credentials
+
+        Returns:
+            tuple: (tool_name, (url, db, username, password digest), normalized arguments)
+        """
+        password = str(tool_input.get('password') or '')
+        identity = (
+            tool_input.get('url'),
+            tool_input.get('db'),
+            tool_input.get('username'),
+            hashlib.sha256(password.encode('utf-8')).hexdigest()
+        )
+
+        args = {}
+        for key, value in tool_input.items():
+            if key in CREDENTIAL_KEYS:
+                continue
+            if isinstance(value, list) and all(isinstance(v, (int, float, str)) for v in value):
+                try:
+                    value = sorted(value)
+                except TypeError:
+                    pass
+            args[key] = value
+
+        return (tool_name, identity, json.dumps(args, sort_keys=True, default=str))
+
+    def get(self, tool_name: str, tool_input: Dict) -> Optional[Dict]:
+        """
+        Return a cached result, or None on a miss.
+
+        Args:
+            tool_name (str): Tool name
+            tool_input (dict): Tool arguments
+
+        Returns:
+            dict or None: A fresh copy of the cached result
+        """
+        if not self.ttls.get(tool_name):
+            return None
+
+        key = self.make_key(tool_name, tool_input)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+
+        return json.loads(payload)
+
+    def generation(self, tool_input: Dict) -> tuple:
+        """
+        Get the invalidation generation of a call's url/db.
+
+        Take it before running the tool and pass it to put(), so a result
+        invalidated while it was computed is not stored.
+
+        Args:
+            tool_input (dict): Tool arguments
+
+        Returns:
+            tuple: Opaque generation token
+        """
+        with self._lock:
+            return self._generation_of(tool_input.get('url'), tool_input.get('db'))
+
+    def put(self, tool_name: str, tool_input: Dict, result: Any, generation: Optional[tuple] = None):
+        """
+        Store a successful result.
+
+        Args:
+            tool_name (str): Tool name
+            tool_input (dict): Tool arguments
+            result (dict): Tool result (failed results are not cached)
+            generation (tuple, optional): generation() taken when the call
+                started; the result is dropped if its url/db was
+                invalidated since
+        """
+        ttl = self.ttls.get(tool_name)
+        if not ttl or not isinstance(result, dict) or not result.get('success'):
+            return
+
+        payload = json.dumps(result, default=str)
+        if len(payload) > self.max_bytes:
+            return
+
+        key = self.make_key(tool_name, tool_input)
+
+        with self._lock:
+            if generation is not None and generation != self._generation_of(
+                tool_input.get('url'), tool_input.get('db')
+            ):
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + ttl, payload)
+            self._size += len(payload)
+
+            # Evict least recently used entries
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, tool_names: List[str], url: Optional[str] = None, db: Optional[str] = None):
+        """
+        Drop cached results of the given tools.
+
+        Args:
+            tool_names (list[str]): Tools whose results to drop
+            url (str, optional): Only for this Odoo server
+            db (str, optional): Only for this database
+        """
+        with self._lock:
+            if url is None or db is None:
+                self._global_generation += 1
+            else:
+                self._generations[(url, db)] = self._generations.get((url, db), 0) + 1
+
+            for key in list(self._entries):
+                tool_name, (key_url, key_db, _username, _digest), _args = key
+                if tool_name not in tool_names:
+                    continue
+                if url is not None and key_url != url:
+                    continue
+                if db is not None and key_db != db:
+                    continue
+                self._remove(key)
+                self._stats['invalidations'] += 1
+
+    def invalidate_after(self, tool_name: str, tool_input: Dict):
+        """
+        Run the invalidation hooks of a tool that just executed.
+
+        Data changes are visible to every user of the database, so
+        dependent results are dropped for all users of that url/db.
+
+        Args:
+            tool_name (str): Tool that was executed
+            tool_input (dict): Its arguments
+        """
+        stale = self.invalidates.get(tool_name)
+        if stale:
+            self.invalidate(stale, url=tool_input.get('url'), db=tool_input.get('db'))
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, invalidations, entries, size_bytes
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), size_bytes=self._size)
+
+    def _generation_of(self, url: Optional[str], db: Optional[str]) -> tuple:
+        """Generation token of a url/db. Caller must hold the lock."""
+        return (self._global_generation, self._generations.get((url, db), 0))
+
+    def _remove(self, key: tuple):
+        """Remove an entry. Caller must hold the lock."""
+        _expires_at, payload = self._entries.pop(key)
+        self._size -= len(payload)
+
+
+# Shared cache used by all orchestrators
+TOOL_RESULT_CACHE = ToolResultCache()